@@ -6,15 +6,31 @@ if __name__ == "__main__":
     parser.add_argument('--server', action='store_true', help='Run in server mode')
     parser.add_argument('--host', default='0.0.0.0', help='Server host (default: 0.0.0.0)')
     parser.add_argument('--port', type=int, default=8000, help='Server port (default: 8000)')
+    parser.add_argument('--supervisor', action='store_true', help='Run agents sharded across worker processes')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes in supervisor mode (default: CPU count)')
+    parser.add_argument('--agents', nargs='*', default=None, help='Agents to supervise (default: every file in agents/)')
     args = parser.parse_args()
 
+    supervisor = None
+    if args.supervisor:
+        from src.supervisor import AgentSupervisor
+        supervisor = AgentSupervisor(agent_names=args.agents, workers=args.workers)
+
     if args.server:
         try:
             from src.server import start_server
-            start_server(host=args.host, port=args.port)
         except ImportError:
             print("Server dependencies not installed. Run: poetry install --extras server")
             exit(1)
+        if supervisor:
+            supervisor.start()
+        try:
+            start_server(host=args.host, port=args.port, supervisor=supervisor)
+        finally:
+            if supervisor:
+                supervisor.stop()
+    elif supervisor:
+        supervisor.run_forever()
     else:
         cli = ZerePyCLI()
-        cli.main_loop()
\ No newline at end of file
+        cli.main_loop()
@@ -1,8 +1,28 @@
+import asyncio
+import importlib
+import inspect
 import logging
+from contextvars import ContextVar
+from typing import Iterable, Optional
 
 logger = logging.getLogger("action_handler")
 
 action_registry = {}    
+# Action name -> fn(agent) returning the earliest time.time() at which the action can do work
+eligibility_registry = {}
+# Name of the action being executed on this thread/task, so lower layers
+# (e.g. the LLM response cache) can behave per action
+current_action: ContextVar[Optional[str]] = ContextVar("current_action", default=None)
+
+# Connection name -> module whose @register_action handlers drive that connection.
+# Imported on demand so an agent only pays for the actions it can actually run.
+ACTION_MODULES = {
+    "twitter": "src.actions.twitter_actions",
+    "echochambers": "src.actions.echochamber_actions",
+    "solana": "src.actions.solana_actions",
+    "sonic": "src.actions.sonic_actions",
+    "ethereum": "src.actions.ethereum_actions",
+}
 
 def register_action(action_name):
     def decorator(func):
@@ -10,11 +30,52 @@ def register_action(action_name):
         return func
     return decorator
 
+def register_eligibility(action_name):
+    def decorator(func):
+        eligibility_registry[action_name] = func
+        return func
+    return decorator
+
+def eligible_at(agent, action_name) -> float:
+    """Earliest timestamp at which the action is worth running (0 if it is always eligible)"""
+    check = eligibility_registry.get(action_name)
+    return check(agent) if check else 0.0
+
 def execute_action(agent, action_name, **kwargs):
     if action_name in action_registry:
-       return action_registry[action_name](agent, **kwargs)
+        token = current_action.set(action_name)
+        try:
+            return action_registry[action_name](agent, **kwargs)
+        finally:
+            current_action.reset(token)
     else:
         logger.error(f"Action {action_name} not found")
         return None
-    
 
+async def aexecute_action(agent, action_name, **kwargs):
+    """
+    Async counterpart of execute_action: handlers defined with `async def` are
+    awaited on the caller's loop, plain ones run in a worker thread
+    """
+    handler = action_registry.get(action_name)
+    if handler is None:
+        logger.error(f"Action {action_name} not found")
+        return None
+    if not inspect.iscoroutinefunction(handler):
+        return await asyncio.to_thread(execute_action, agent, action_name, **kwargs)
+
+    token = current_action.set(action_name)
+    try:
+        return await handler(agent, **kwargs)
+    finally:
+        current_action.reset(token)
+
+def is_async_action(action_name) -> bool:
+    return inspect.iscoroutinefunction(action_registry.get(action_name))
+
+def load_action_modules(connection_names: Iterable[str]) -> None:
+    """Import the action modules for the given connections (no-op if already loaded)"""
+    for connection_name in connection_names:
+        module_path = ACTION_MODULES.get(connection_name)
+        if module_path:
+            importlib.import_module(module_path)
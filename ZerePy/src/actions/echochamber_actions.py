@@ -1,5 +1,6 @@
 import time,random
-from src.action_handler import register_action
+from src.action_handler import register_action, register_eligibility
+from src.helpers.batch import generate_replies
 from src.prompts import REPLY_ECHOCHAMBER_PROMPT, POST_ECHOCHAMBER_PROMPT
 
 @register_action("post-echochambers")
@@ -17,7 +18,8 @@ def post_echochambers(agent, **kwargs):
         
         # Generate message based on room topic and tags
         previous_messages = agent.connection_manager.connections["echochambers"].sent_messages
-        previous_content = "\n".join([f"- {msg['content']}" for msg in previous_messages])
+        # Only the most recent messages that fit the history token budget go into the prompt
+        previous_content = agent.context.history([f"- {msg['content']}" for msg in previous_messages])
         agent.logger.info(f"Found {len(previous_messages)} messages in post history")
         
         prompt  = POST_ECHOCHAMBER_PROMPT.format(
@@ -39,6 +41,10 @@ def post_echochambers(agent, **kwargs):
             return True
     return False
 
+@register_eligibility("post-echochambers")
+def post_echochambers_eligible_at(agent):
+    return agent.state.get("echochambers_last_message", 0) + agent.echochambers_message_interval
+
 @register_action("reply-echochambers")
 def reply_echochambers(agent, **kwargs):
     agent.logger.info("\n🔍 CHECKING FOR MESSAGES TO REPLY TO")
@@ -48,57 +54,80 @@ def reply_echochambers(agent, **kwargs):
         agent.state["echochambers_replied_messages"] = set()
         
 
-    # Get recent messages
-    history = agent.connection_manager.perform_action(
-        connection_name="echochambers",
-        action_name="get-room-history",
-        params={}
-    )
+    # Consume messages prefetched from the room history
+    history = agent.state.get("echochambers_history")
+    if history is None or len(history) == 0:
+        agent.logger.info("No messages in history")
+        return False
 
-    if history:
-        agent.logger.info(f"Found {len(history)} messages in history")
-        for message in history:
-            message_id = message.get('id')
-            sender = message.get('sender', {})
-            sender_username = sender.get('username')
-            content = message.get('content', '')
-            
-            if not message_id or not sender_username or not content:
-                agent.logger.warning(f"Skipping message with missing fields: {message}")
-                continue
-            
+    agent.logger.info(f"Found {len(history)} messages in history")
+    own_username = agent.connection_manager.connections["echochambers"].config["sender_username"]
+    batch_size = max(1, agent.echochambers_reply_batch_size)
 
-            # Skip if:
-            # 1. It's our message
-            # 2. We've already replied to it
-            if (sender_username == agent.connection_manager.connections["echochambers"].config["sender_username"] or 
-                message_id in agent.state.get("echochambers_replied_messages", set())):
-                agent.logger.info(f"Skipping message from {sender_username} (already replied or own message)")
-                continue
-                
-            agent.logger.info(f"\n💬 GENERATING REPLY to: @{sender_username} - {content[:69]}...")
-            
-            refer_username = random.random() < 0.7
-            username_prompt = f"Refer the sender by their @{sender_username}" if refer_username else "Respond without directly referring to the sender"
-            prompt = REPLY_ECHOCHAMBER_PROMPT.format(
-                content=content,
-                sender_username=sender_username,
-                room_topic=agent.state['room_info']['topic'],
-                tags=", ".join(agent.state['room_info']['tags']),
-                username_prompt=username_prompt
-            )
-            reply = agent.prompt_llm(prompt)
-            
-            if reply:
-                agent.logger.info(f"\n🚀 Posting reply: '{reply[:69]}...'")
-                agent.connection_manager.perform_action(
-                    connection_name="echochambers",
-                    action_name="send-message",
-                    params=[reply]
-                )
-                agent.state["echochambers_replied_messages"].add(message_id)
-                agent.logger.info("✅ Reply posted successfully!")
-                return True
-    else:
-        agent.logger.info("No messages in history")
-    return False
\ No newline at end of file
+    # Pick the next batch_size messages we still owe a reply
+    pending = []
+    while len(pending) < batch_size:
+        message = history.take()
+        if message is None:
+            break
+        message_id = message.get('id')
+        sender = message.get('sender', {})
+        sender_username = sender.get('username')
+        content = message.get('content', '')
+
+        if not message_id or not sender_username or not content:
+            agent.logger.warning(f"Skipping message with missing fields: {message}")
+            continue
+
+        # Skip if:
+        # 1. It's our message
+        # 2. We've already replied to it
+        if sender_username == own_username or message_id in agent.state.get("echochambers_replied_messages", set()):
+            agent.logger.info(f"Skipping message from {sender_username} (already replied or own message)")
+            history.done(message)
+            continue
+
+        agent.logger.info(f"\n💬 GENERATING REPLY to: @{sender_username} - {content[:69]}...")
+        refer_username = random.random() < 0.7
+        username_prompt = f"Refer the sender by their @{sender_username}" if refer_username else "Respond without directly referring to the sender"
+        prompt = REPLY_ECHOCHAMBER_PROMPT.format(
+            content=content,
+            sender_username=sender_username,
+            room_topic=agent.state['room_info']['topic'],
+            tags=", ".join(agent.state['room_info']['tags']),
+            username_prompt=username_prompt
+        )
+        pending.append((message, prompt))
+
+    if not pending:
+        return False
+
+    # Replies are generated concurrently, then posted one by one at the room's pace
+    replies = generate_replies(
+        agent.prompt_llm,
+        [prompt for _, prompt in pending],
+        agent.echochambers_reply_concurrency
+    )
+    posted = 0
+    failed = []
+    for (message, _), reply in zip(pending, replies):
+        if not reply:
+            failed.append(message)
+            continue
+        agent.echochambers_reply_limiter.wait()
+        agent.logger.info(f"\n🚀 Posting reply: '{reply[:69]}...'")
+        agent.connection_manager.perform_action(
+            connection_name="echochambers",
+            action_name="send-message",
+            params=[reply]
+        )
+        agent.state["echochambers_replied_messages"].add(message['id'])
+        history.done(message)
+        posted += 1
+    if failed:
+        # Retried on a later run, as when the room history was re-read every time
+        agent.logger.warning(f"No reply generated for {len(failed)} messages, requeueing them")
+        history.requeue(failed)
+    if posted:
+        agent.logger.info(f"✅ Posted {posted} of {len(pending)} replies")
+    return posted > 0
@@ -1,7 +1,6 @@
 import logging
-import os
-from dotenv import load_dotenv
 from src.action_handler import register_action
+from src.helpers.credentials import credential_store
 
 logger = logging.getLogger("actions.ethereum_actions")
 
@@ -33,10 +32,7 @@ def get_eth_balance(agent, **kwargs):
     try:
         token_address = kwargs.get("token_address")
         
-        load_dotenv()
-        private_key = os.getenv('ETH_PRIVATE_KEY')
-        web3 = agent.connection_manager.connections["ethereum"]._web3
-        account = web3.eth.account.from_key(private_key)
+        account = credential_store.evm_account('ETH_PRIVATE_KEY')
         address = account.address
 
         balance = agent.connection_manager.connections["ethereum"].get_balance(
@@ -55,6 +51,21 @@ def get_eth_balance(agent, **kwargs):
         logger.error(f"Failed to get balance: {str(e)}")
         return None
 
+@register_action("get-eth-portfolio")
+def get_eth_portfolio(agent, **kwargs):
+    """Get ETH and token balances for one or more addresses in one batched read"""
+    try:
+        portfolio = agent.connection_manager.connections["ethereum"].get_portfolio(
+            addresses=kwargs.get("addresses"),
+            tokens=kwargs.get("tokens")
+        )
+        logger.info(f"Portfolio: {portfolio}")
+        return portfolio
+
+    except Exception as e:
+        logger.error(f"Failed to get portfolio: {str(e)}")
+        return None
+
 @register_action("send-eth")
 def send_eth(agent, **kwargs):
     """Send native tokens to an address"""
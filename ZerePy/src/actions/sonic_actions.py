@@ -1,7 +1,6 @@
 import logging
-import os
-from dotenv import load_dotenv
 from src.action_handler import register_action
+from src.helpers.credentials import credential_store
 
 logger = logging.getLogger("actions.sonic_actions")
 
@@ -38,10 +37,7 @@ def get_sonic_balance(agent, **kwargs):
         token_address = kwargs.get("token_address")
         
         if not address:
-            load_dotenv()
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            web3 = agent.connection_manager.connections["sonic"]._web3
-            account = web3.eth.account.from_key(private_key)
+            account = credential_store.evm_account('SONIC_PRIVATE_KEY')
             address = account.address
 
         # Direct passthrough to connection method - add your logic before/after this call!
@@ -55,6 +51,23 @@ def get_sonic_balance(agent, **kwargs):
         logger.error(f"Failed to get balance: {str(e)}")
         return None
 
+@register_action("get-sonic-portfolio")
+def get_sonic_portfolio(agent, **kwargs):
+    """Get $S and token balances for one or more addresses in one batched read.
+    """
+    try:
+        # Direct passthrough to connection method - add your logic before/after this call!
+        portfolio = agent.connection_manager.connections["sonic"].get_portfolio(
+            addresses=kwargs.get("addresses"),
+            tokens=kwargs.get("tokens")
+        )
+        logger.info(f"Portfolio: {portfolio}")
+        return portfolio
+
+    except Exception as e:
+        logger.error(f"Failed to get portfolio: {str(e)}")
+        return None
+
 @register_action("send-sonic")
 def send_sonic(agent, **kwargs):
     """Send $S tokens to an address.
@@ -1,6 +1,7 @@
 import time 
-from src.action_handler import register_action
+from src.action_handler import register_action, register_eligibility
 from src.helpers import print_h_bar
+from src.helpers.batch import generate_replies
 from src.prompts import POST_TWEET_PROMPT, REPLY_TWEET_PROMPT
 
 
@@ -36,37 +37,75 @@ def post_tweet(agent, **kwargs):
         return False
 
 
-@register_action("reply-to-tweet")
-def reply_to_tweet(agent, **kwargs):
-    if "timeline_tweets" in agent.state and agent.state["timeline_tweets"] is not None and len(agent.state["timeline_tweets"]) > 0:
-        tweet = agent.state["timeline_tweets"].pop(0)
-        tweet_id = tweet.get('id')
-        if not tweet_id:
-            return
+@register_eligibility("post-tweet")
+def post_tweet_eligible_at(agent):
+    return agent.state.get("last_tweet_time", 0) + agent.tweet_interval
 
-        agent.logger.info(f"\n💬 GENERATING REPLY to: {tweet.get('text', '')[:50]}...")
 
-        base_prompt = REPLY_TWEET_PROMPT.format(tweet_text =tweet.get('text') )
-        system_prompt = agent._construct_system_prompt()
-        reply_text = agent.prompt_llm(prompt=base_prompt, system_prompt=system_prompt)
+def _next_timeline_tweet(agent):
+    """Take the next prefetched timeline tweet, or None if the buffer is empty"""
+    timeline = agent.state.get("timeline_tweets")
+    return timeline.take() if timeline is not None else None
 
-        if reply_text:
-            agent.logger.info(f"\n🚀 Posting reply: '{reply_text}'")
-            agent.connection_manager.perform_action(
-                connection_name="twitter",
-                action_name="reply-to-tweet",
-                params=[tweet_id, reply_text]
-            )
-            agent.logger.info("✅ Reply posted successfully!")
-            return True
-    else:
+
+def _timeline_tweet_done(agent, tweet):
+    """Mark a timeline tweet as handled so it isn't queued again after a restart"""
+    timeline = agent.state.get("timeline_tweets")
+    if timeline is not None:
+        timeline.done(tweet)
+
+
+@register_action("reply-to-tweet")
+def reply_to_tweet(agent, **kwargs):
+    # Take up to reply_batch_size prefetched tweets; replies are generated concurrently
+    tweets = []
+    while len(tweets) < max(1, agent.tweet_reply_batch_size):
+        tweet = _next_timeline_tweet(agent)
+        if tweet is None:
+            break
+        if tweet.get('id'):
+            tweets.append(tweet)
+
+    if not tweets:
         agent.logger.info("\n👀 No tweets found to reply to...")
         return False
 
+    system_prompt = agent._construct_system_prompt()
+    for tweet in tweets:
+        agent.logger.info(f"\n💬 GENERATING REPLY to: {tweet.get('text', '')[:50]}...")
+    replies = generate_replies(
+        lambda prompt: agent.prompt_llm(prompt=prompt, system_prompt=system_prompt),
+        [REPLY_TWEET_PROMPT.format(tweet_text=tweet.get('text')) for tweet in tweets],
+        agent.tweet_reply_concurrency
+    )
+
+    posted = 0
+    failed = []
+    for tweet, reply_text in zip(tweets, replies):
+        if not reply_text:
+            failed.append(tweet)
+            continue
+        # Posting is paced so a batch doesn't trip Twitter's rate limits
+        agent.tweet_reply_limiter.wait()
+        agent.logger.info(f"\n🚀 Posting reply: '{reply_text}'")
+        agent.connection_manager.perform_action(
+            connection_name="twitter",
+            action_name="reply-to-tweet",
+            params=[tweet['id'], reply_text]
+        )
+        _timeline_tweet_done(agent, tweet)
+        posted += 1
+    if failed:
+        agent.logger.warning(f"No reply generated for {len(failed)} tweets, requeueing them")
+        agent.state["timeline_tweets"].requeue(failed)
+    if posted:
+        agent.logger.info(f"✅ Posted {posted} of {len(tweets)} replies")
+    return posted > 0
+
 @register_action("like-tweet")
 def like_tweet(agent, **kwargs):
-    if "timeline_tweets" in agent.state and agent.state["timeline_tweets"] is not None and len(agent.state["timeline_tweets"]) > 0:
-        tweet = agent.state["timeline_tweets"].pop(0)
+    tweet = _next_timeline_tweet(agent)
+    if tweet:
         tweet_id = tweet.get('id')
         if not tweet_id:
             return False
@@ -80,6 +119,7 @@ def like_tweet(agent, **kwargs):
             )
             if replies:
                 agent.state["timeline_tweets"].extend(replies[:agent.own_tweet_replies_count])
+            _timeline_tweet_done(agent, tweet)
             return True 
 
         agent.logger.info(f"\n👍 LIKING TWEET: {tweet.get('text', '')[:50]}...")
@@ -89,6 +129,7 @@ def like_tweet(agent, **kwargs):
             action_name="like-tweet",
             params=[tweet_id]
         )
+        _timeline_tweet_done(agent, tweet)
         agent.logger.info("✅ Tweet liked successfully!")
         return True
     else:
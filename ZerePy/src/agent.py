@@ -1,16 +1,30 @@
+import asyncio
 import json
 import random
+import threading
 import time
 import logging
-import os
 from pathlib import Path
-from dotenv import load_dotenv
-from src.connection_manager import ConnectionManager
+from typing import Dict, Iterator, List, Optional
+from src.connection_manager import ConnectionManager, DEFAULT_STARTUP_WORKERS, DEFAULT_STARTUP_TIMEOUT
 from src.helpers import print_h_bar
-from src.action_handler import execute_action
-import src.actions.twitter_actions  
-import src.actions.echochamber_actions
-import src.actions.solana_actions
+from src.action_handler import current_action, eligible_at, load_action_modules
+from src.helpers.batch import DEFAULT_BATCH_SIZE, DEFAULT_CONCURRENCY, DEFAULT_POST_INTERVAL, RateLimiter
+from src.helpers.context import ContextBuilder
+from src.helpers.credentials import credential_store
+from src.helpers.llm_cache import LLMResponseCache
+from src.helpers.prompt_cache import DEFAULT_PROMPT_TTL, PromptCache, file_hash
+from src.llm_router import ProviderRouter
+from src.runtime import AgentRuntime
+from src.state_store import create_agent_state
+from src.prefetch import (
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_LOW_WATER,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_REFRESH_INTERVAL,
+    InputBuffer,
+    InputProducer,
+)
 from datetime import datetime
 
 REQUIRED_FIELDS = ["name", "bio", "traits", "examples", "loop_delay", "config", "tasks"]
@@ -25,6 +39,8 @@ class ZerePyAgent:
         try:
             agent_path = Path("agents") / f"{agent_name}.json"
             agent_dict = json.load(open(agent_path, "r"))
+            self.agent_file = agent_name
+            self.agent_file_hash = file_hash(agent_path)
 
             missing_fields = [field for field in REQUIRED_FIELDS if field not in agent_dict]
             if missing_fields:
@@ -36,7 +52,14 @@ class ZerePyAgent:
             self.examples = agent_dict["examples"]
             self.example_accounts = agent_dict["example_accounts"]
             self.loop_delay = agent_dict["loop_delay"]
-            self.connection_manager = ConnectionManager(agent_dict["config"])
+            startup_config = agent_dict.get("connection_startup", {})
+            self.connection_manager = ConnectionManager(
+                agent_dict["config"],
+                max_workers=startup_config.get("max_workers", DEFAULT_STARTUP_WORKERS),
+                startup_timeout=startup_config.get("timeout", DEFAULT_STARTUP_TIMEOUT)
+            )
+            load_action_modules(config["name"] for config in agent_dict["config"])
+            self.runtime_config = agent_dict.get("runtime", {})
             self.use_time_based_weights = agent_dict["use_time_based_weights"]
             self.time_based_multipliers = agent_dict["time_based_multipliers"]
 
@@ -47,72 +70,156 @@ class ZerePyAgent:
             if has_twitter_tasks and twitter_config:
                 self.tweet_interval = twitter_config.get("tweet_interval", 900)
                 self.own_tweet_replies_count = twitter_config.get("own_tweet_replies_count", 2)
+                # Batch replies: generate up to reply_batch_size concurrently, post them paced
+                self.tweet_reply_batch_size = twitter_config.get("reply_batch_size", DEFAULT_BATCH_SIZE)
+                self.tweet_reply_concurrency = twitter_config.get("reply_concurrency", DEFAULT_CONCURRENCY)
+                self.tweet_reply_limiter = RateLimiter(twitter_config.get("reply_post_interval", DEFAULT_POST_INTERVAL))
 
             # Extract Echochambers config
             echochambers_config = next((config for config in agent_dict["config"] if config["name"] == "echochambers"), None)
             if echochambers_config:
                 self.echochambers_message_interval = echochambers_config.get("message_interval", 60)
                 self.echochambers_history_count = echochambers_config.get("history_read_count", 50)
+                self.echochambers_reply_batch_size = echochambers_config.get("reply_batch_size", DEFAULT_BATCH_SIZE)
+                self.echochambers_reply_concurrency = echochambers_config.get("reply_concurrency", DEFAULT_CONCURRENCY)
+                self.echochambers_reply_limiter = RateLimiter(
+                    echochambers_config.get("reply_post_interval", DEFAULT_POST_INTERVAL)
+                )
 
             self.is_llm_set = False
 
-            # Cache for system prompt
+            # Token budgets for prompts; sizes of every LLM call are logged (see src/helpers/context.py)
+            self.context = ContextBuilder.from_config(agent_dict.get("context"))
+
+            # System prompt, cached on disk per agent file (see src/helpers/prompt_cache.py)
             self._system_prompt = None
+            self._prompt_refresh: Optional[threading.Thread] = None
+            prompt_cache_config = agent_dict.get("prompt_cache", {})
+            self.prompt_cache = PromptCache(ttl=prompt_cache_config.get("ttl", DEFAULT_PROMPT_TTL))
+
+            # Repeated generate-text prompts are served from cache (see src/helpers/llm_cache.py)
+            self.connection_manager.llm_cache = LLMResponseCache.from_config(agent_dict.get("llm_cache"))
+            self.llm_routing_config = agent_dict.get("llm_routing", {})
+            self.llm_router: Optional[ProviderRouter] = None
 
             # Extract loop tasks
             self.tasks = agent_dict.get("tasks", [])
             self.task_weights = [task.get("weight", 0) for task in self.tasks]
             self.logger = logging.getLogger("agent")
 
-            # Set up empty agent state
-            self.state = {}
+            # Agent state persists across restarts (see src/state_store.py)
+            self.state = create_agent_state(agent_name, agent_dict.get("state"))
+            self.state.dedup_set("echochambers_replied_messages")
+
+            # Background producers that keep timeline/room inputs ready for actions
+            self.prefetch_config = agent_dict.get("prefetch", {})
+            self.input_producers = self._build_input_producers()
+
+            # Warm the system prompt from disk; example tweets are fetched off the request path
+            self._load_cached_system_prompt()
 
         except Exception as e:
             logger.error("Could not load ZerePy agent")
             raise e
 
     def _setup_llm_provider(self):
-        # Get first available LLM provider and its model
         llm_providers = self.connection_manager.get_model_providers()
         if not llm_providers:
             raise ValueError("No configured LLM provider found")
-        self.model_provider = llm_providers[0]
+        # Every configured provider stays reachable; the router picks one per request
+        self.llm_router = ProviderRouter.from_config(self.connection_manager, llm_providers, self.llm_routing_config)
+        self.model_provider = self.llm_router.providers[0]
+        self.is_llm_set = True
+        if self.context.model is None:
+            self.context.model = self.connection_manager.connections[self.model_provider].config.get("model")
 
         # Load Twitter username for self-reply detection if Twitter tasks exist
         if any("tweet" in task["name"] for task in self.tasks):
-            load_dotenv()
-            self.username = os.getenv('TWITTER_USERNAME', '').lower()
+            self.username = credential_store.get('TWITTER_USERNAME', '').lower()
             if not self.username:
                 logger.warning("Twitter username not found, some Twitter functionalities may be limited")
 
     def _construct_system_prompt(self) -> str:
-        """Construct the system prompt from agent configuration"""
-        if self._system_prompt is None:
-            prompt_parts = []
-            prompt_parts.extend(self.bio)
-
-            if self.traits:
-                prompt_parts.append("\nYour key traits are:")
-                prompt_parts.extend(f"- {trait}" for trait in self.traits)
-
-            if self.examples or self.example_accounts:
-                prompt_parts.append("\nHere are some examples of your style (Please avoid repeating any of these):")
-                if self.examples:
-                    prompt_parts.extend(f"- {example}" for example in self.examples)
-
-                if self.example_accounts:
-                    for example_account in self.example_accounts:
-                        tweets = self.connection_manager.perform_action(
-                            connection_name="twitter",
-                            action_name="get-latest-tweets",
-                            params=[example_account]
-                        )
-                        if tweets:
-                            prompt_parts.extend(f"- {tweet['text']}" for tweet in tweets)
-
-            self._system_prompt = "\n".join(prompt_parts)
+        """
+        Get the system prompt without ever fetching on the caller's path.
 
+        Uses the cached prompt when there is one; until the background refresh
+        finishes for a never-seen agent file, the prompt is built without the
+        example-account tweets.
+        """
+        if self._system_prompt is None:
+            if self.example_accounts and self._prompt_refresh and self._prompt_refresh.is_alive():
+                return self._build_system_prompt({})
+            self._system_prompt = self._build_system_prompt({})
         return self._system_prompt
+
+    def _build_system_prompt(self, example_tweets: Dict[str, List[str]]) -> str:
+        """
+        Construct the system prompt from agent configuration and fetched example tweets
+
+        Bio and traits are always included; style examples are added in order
+        (configured ones first) until the context's system_prompt_tokens budget is spent.
+        """
+        prompt_parts = [self.context.static("persona", self._render_persona)]
+
+        if self.examples or self.example_accounts:
+            header = "\nHere are some examples of your style (Please avoid repeating any of these):"
+            examples = [f"- {example}" for example in self.examples or []]
+            for example_account in self.example_accounts or []:
+                examples.extend(f"- {text}" for text in example_tweets.get(example_account, []))
+
+            budget = self.context.system_prompt_tokens - self.context.count(prompt_parts[0]) - self.context.count(header)
+            prompt_parts.append(header)
+            prompt_parts.extend(self.context.fit(examples, max(budget, 0)))
+
+        return "\n".join(prompt_parts)
+
+    def _render_persona(self) -> str:
+        """Bio and traits, the part of the system prompt fixed by the agent file"""
+        prompt_parts = list(self.bio)
+        if self.traits:
+            prompt_parts.append("\nYour key traits are:")
+            prompt_parts.extend(f"- {trait}" for trait in self.traits)
+        return "\n".join(prompt_parts)
+
+    def _fetch_example_tweets(self) -> Dict[str, List[str]]:
+        example_tweets = {}
+        for example_account in self.example_accounts:
+            tweets = self.connection_manager.perform_action(
+                connection_name="twitter",
+                action_name="get-latest-tweets",
+                params=[example_account]
+            )
+            if tweets:
+                example_tweets[example_account] = [tweet['text'] for tweet in tweets]
+        return example_tweets
+
+    def _load_cached_system_prompt(self) -> None:
+        """Use the on-disk prompt for this agent file, refreshing it in the background when stale"""
+        entry = self.prompt_cache.load(self.agent_file, self.agent_file_hash)
+        if entry:
+            self._system_prompt = entry["system_prompt"]
+        if not self.example_accounts or "twitter" not in self.connection_manager.connections:
+            return
+        if not self.prompt_cache.is_fresh(entry):
+            self._prompt_refresh = threading.Thread(
+                target=self.refresh_system_prompt,
+                name=f"prompt-refresh:{self.agent_file}",
+                daemon=True
+            )
+            self._prompt_refresh.start()
+
+    def refresh_system_prompt(self) -> str:
+        """Fetch example tweets, rebuild the system prompt and store it on disk (blocking)"""
+        try:
+            example_tweets = self._fetch_example_tweets()
+            system_prompt = self._build_system_prompt(example_tweets)
+            self._system_prompt = system_prompt
+            self.prompt_cache.save(self.agent_file, self.agent_file_hash, system_prompt, example_tweets)
+            logger.info(f"Refreshed cached system prompt for {self.name}")
+        except Exception as e:
+            logger.error(f"Failed to refresh system prompt for {self.name}: {e}")
+        return self._system_prompt or self._build_system_prompt({})
     
     def _adjust_weights_for_time(self, current_hour: int, task_weights: list) -> list:
         weights = task_weights.copy()
@@ -136,26 +243,124 @@ class ZerePyAgent:
         return weights
 
     def prompt_llm(self, prompt: str, system_prompt: str = None) -> str:
-        """Generate text using the configured LLM provider"""
+        """Generate text using the best available LLM provider"""
         system_prompt = system_prompt or self._construct_system_prompt()
+        self.context.record(system_prompt, prompt, current_action.get() or "prompt")
+        return self.llm_router.generate(prompt, system_prompt)
 
-        return self.connection_manager.perform_action(
-            connection_name=self.model_provider,
-            action_name="generate-text",
-            params=[prompt, system_prompt]
-        )
+    async def aprompt_llm(self, prompt: str, system_prompt: str = None) -> str:
+        """prompt_llm for async callers; OpenAI-compatible providers are awaited without a thread"""
+        system_prompt = system_prompt or self._construct_system_prompt()
+        self.context.record(system_prompt, prompt, current_action.get() or "prompt")
+        return await self.llm_router.agenerate(prompt, system_prompt)
+
+    def stream_llm(self, prompt: str, system_prompt: str = None) -> Iterator[str]:
+        """
+        Stream text from the best available LLM provider as it is generated
+
+        Providers without a stream-text action yield their whole completion as one chunk.
+        """
+        system_prompt = system_prompt or self._construct_system_prompt()
+        self.context.record(system_prompt, prompt, current_action.get() or "stream")
+        # The router reads and fills the response cache per provider, so failover can't mix them up
+        yield from self.llm_router.stream(prompt, system_prompt)
 
     def perform_action(self, connection: str, action: str, **kwargs) -> None:
         return self.connection_manager.perform_action(connection, action, **kwargs)
+
+    async def aperform_action(self, connection: str, action: str, **kwargs) -> None:
+        return await self.connection_manager.aperform_action(connection, action, **kwargs)
     
-    def select_action(self, use_time_based_weights: bool = False) -> dict:
+    def select_action(self, use_time_based_weights: bool = False) -> Optional[dict]:
+        """Pick a weighted task among those whose action is eligible right now"""
         task_weights = [weight for weight in self.task_weights.copy()]
         
         if use_time_based_weights:
             current_hour = datetime.now().hour
             task_weights = self._adjust_weights_for_time(current_hour, task_weights)
-        
-        return random.choices(self.tasks, weights=task_weights, k=1)[0]
+
+        now = time.time()
+        candidates = [
+            (task, weight) for task, weight in zip(self.tasks, task_weights)
+            if weight > 0 and eligible_at(self, task["name"]) <= now
+        ]
+        if not candidates:
+            return None
+
+        tasks, weights = zip(*candidates)
+        return random.choices(tasks, weights=weights, k=1)[0]
+
+    def _build_input_producers(self) -> List[InputProducer]:
+        """Create the input buffers in state and the producers that keep them topped up"""
+        config = self.prefetch_config
+        buffer_options = {
+            "maxlen": config.get("buffer_size", DEFAULT_BUFFER_SIZE),
+            "low_water": config.get("low_water", DEFAULT_LOW_WATER),
+        }
+        producer_options = {
+            "refresh_interval": config.get("refresh_interval", DEFAULT_REFRESH_INTERVAL),
+            "min_interval": config.get("min_interval", DEFAULT_MIN_INTERVAL),
+        }
+        task_names = [task["name"] for task in self.tasks]
+        producers = []
+
+        if any("tweet" in name for name in task_names):
+            self.state["timeline_tweets"] = InputBuffer(
+                "timeline_tweets",
+                key=lambda tweet: tweet.get("id"),
+                seen=self.state.dedup_set("timeline_tweets_seen"),
+                **buffer_options
+            )
+            producers.append(InputProducer(
+                "timeline_tweets",
+                fetch=lambda: self.connection_manager.perform_action(
+                    connection_name="twitter",
+                    action_name="read-timeline",
+                    params=[]
+                ),
+                state=self.state,
+                buffer=self.state["timeline_tweets"],
+                **producer_options
+            ))
+
+        if any("echochambers" in name for name in task_names):
+            producers.append(InputProducer(
+                "room_info",
+                fetch=lambda: self.connection_manager.perform_action(
+                    connection_name="echochambers",
+                    action_name="get-room-info",
+                    params={}
+                ),
+                state=self.state,
+                **producer_options
+            ))
+
+        if "reply-echochambers" in task_names:
+            self.state["echochambers_history"] = InputBuffer(
+                "echochambers_history",
+                key=lambda message: message.get("id"),
+                seen=self.state.dedup_set("echochambers_history_seen"),
+                **buffer_options
+            )
+            producers.append(InputProducer(
+                "echochambers_history",
+                fetch=lambda: self.connection_manager.perform_action(
+                    connection_name="echochambers",
+                    action_name="get-room-history",
+                    params={}
+                ),
+                state=self.state,
+                buffer=self.state["echochambers_history"],
+                **producer_options
+            ))
+
+        return producers
+
+    def replenish_inputs(self) -> None:
+        """Synchronously refresh the inputs that are missing or running low"""
+        for producer in self.input_producers:
+            if producer.needs_refresh():
+                producer.refresh()
 
     def loop(self):
         """Main agent loop for autonomous behavior"""
@@ -172,48 +377,10 @@ class ZerePyAgent:
             logger.info(f"{i}...")
             time.sleep(1)
 
+        runtime = AgentRuntime(self)
         try:
-            while True:
-                success = False
-                try:
-                    # REPLENISH INPUTS
-                    # TODO: Add more inputs to complexify agent behavior
-                    if "timeline_tweets" not in self.state or self.state["timeline_tweets"] is None or len(self.state["timeline_tweets"]) == 0:
-                        if any("tweet" in task["name"] for task in self.tasks):
-                            logger.info("\n👀 READING TIMELINE")
-                            self.state["timeline_tweets"] = self.connection_manager.perform_action(
-                                connection_name="twitter",
-                                action_name="read-timeline",
-                                params=[]
-                            )
-
-                    if "room_info" not in self.state or self.state["room_info"] is None:
-                        if any("echochambers" in task["name"] for task in self.tasks):
-                            logger.info("\n👀 READING ECHOCHAMBERS ROOM INFO")
-                            self.state["room_info"] = self.connection_manager.perform_action(
-                                connection_name="echochambers",
-                                action_name="get-room-info",
-                                params={}
-                            )
-
-                    # CHOOSE AN ACTION
-                    # TODO: Add agentic action selection
-                    
-                    action = self.select_action(use_time_based_weights=self.use_time_based_weights)
-                    action_name = action["name"]
-
-                    # PERFORM ACTION
-                    success = execute_action(self, action_name)
-
-                    logger.info(f"\n⏳ Waiting {self.loop_delay} seconds before next loop...")
-                    print_h_bar()
-                    time.sleep(self.loop_delay if success else 60)
-
-                except Exception as e:
-                    logger.error(f"\n❌ Error in agent loop iteration: {e}")
-                    logger.info(f"⏳ Waiting {self.loop_delay} seconds before retrying...")
-                    time.sleep(self.loop_delay)
-
+            asyncio.run(runtime.run())
         except KeyboardInterrupt:
+            runtime.stop()
             logger.info("\n🛑 Agent loop stopped by user.")
-            return
\ No newline at end of file
+            return
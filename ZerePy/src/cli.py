@@ -532,8 +532,16 @@ class ZerePyCLI:
                 if user_input.lower() == 'exit':
                     break
                 
-                response = self.agent.prompt_llm(user_input)
-                logger.info(f"\n{self.agent.name}: {response}")
+                # Print chunks as they arrive so the reply starts before generation ends
+                sys.stdout.write(f"\n{self.agent.name}: ")
+                sys.stdout.flush()
+                try:
+                    for chunk in self.agent.stream_llm(user_input):
+                        sys.stdout.write(chunk)
+                        sys.stdout.flush()
+                except Exception as e:
+                    logger.error(f"\nChat failed: {e}")
+                sys.stdout.write("\n")
                 print_h_bar()
                 
             except KeyboardInterrupt:
@@ -1,95 +1,175 @@
+import asyncio
+import importlib
 import logging
-from typing import Any, List, Optional, Type, Dict
-from src.connections.base_connection import BaseConnection
-from src.connections.anthropic_connection import AnthropicConnection
-from src.connections.eternalai_connection import EternalAIConnection
-from src.connections.goat_connection import GoatConnection
-from src.connections.groq_connection import GroqConnection
-from src.connections.openai_connection import OpenAIConnection
-from src.connections.twitter_connection import TwitterConnection
-from src.connections.farcaster_connection import FarcasterConnection
-from src.connections.ollama_connection import OllamaConnection
-from src.connections.echochambers_connection import EchochambersConnection
-from src.connections.solana_connection import SolanaConnection
-from src.connections.hyperbolic_connection import HyperbolicConnection
-from src.connections.galadriel_connection import GaladrielConnection
-from src.connections.sonic_connection import SonicConnection
-from src.connections.discord_connection import DiscordConnection
-from src.connections.allora_connection import AlloraConnection
-from src.connections.xai_connection import XAIConnection
-from src.connections.ethereum_connection import EthereumConnection
-from src.connections.together_connection import TogetherAIConnection
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, List, Optional, Type, Dict, Tuple
+from src.action_handler import current_action
+from src.connections.base_connection import BaseConnection, is_auth_error
+from src.helpers.llm_cache import LLMResponseCache, cache_key
 
 logger = logging.getLogger("connection_manager")
 
+# Connection name -> (module path, class name). Modules are only imported once an
+# agent config actually names the connection, so heavy SDKs stay unloaded otherwise.
+CONNECTION_REGISTRY: Dict[str, Tuple[str, str]] = {
+    "twitter": ("src.connections.twitter_connection", "TwitterConnection"),
+    "anthropic": ("src.connections.anthropic_connection", "AnthropicConnection"),
+    "openai": ("src.connections.openai_connection", "OpenAIConnection"),
+    "farcaster": ("src.connections.farcaster_connection", "FarcasterConnection"),
+    "groq": ("src.connections.groq_connection", "GroqConnection"),
+    "eternalai": ("src.connections.eternalai_connection", "EternalAIConnection"),
+    "ollama": ("src.connections.ollama_connection", "OllamaConnection"),
+    "echochambers": ("src.connections.echochambers_connection", "EchochambersConnection"),
+    "goat": ("src.connections.goat_connection", "GoatConnection"),
+    "solana": ("src.connections.solana_connection", "SolanaConnection"),
+    "hyperbolic": ("src.connections.hyperbolic_connection", "HyperbolicConnection"),
+    "galadriel": ("src.connections.galadriel_connection", "GaladrielConnection"),
+    "sonic": ("src.connections.sonic_connection", "SonicConnection"),
+    "discord": ("src.connections.discord_connection", "DiscordConnection"),
+    "allora": ("src.connections.allora_connection", "AlloraConnection"),
+    "xai": ("src.connections.xai_connection", "XAIConnection"),
+    "ethereum": ("src.connections.ethereum_connection", "EthereumConnection"),
+    "together": ("src.connections.together_connection", "TogetherAIConnection"),
+}
+
+# Connections are built concurrently; most of their startup time is RPC/API handshakes
+DEFAULT_STARTUP_WORKERS = 8
+DEFAULT_STARTUP_TIMEOUT = 30  # seconds allowed per connection
+
 
 class ConnectionManager:
-    def __init__(self, agent_config):
+    def __init__(
+        self,
+        agent_config,
+        max_workers: int = DEFAULT_STARTUP_WORKERS,
+        startup_timeout: float = DEFAULT_STARTUP_TIMEOUT
+    ):
         self.connections: Dict[str, BaseConnection] = {}
-        for config in agent_config:
-            self._register_connection(config)
+        # Connection name -> {"status", "seconds", "error"} for the last startup
+        self.startup_report: Dict[str, Dict[str, Any]] = {}
+        # Set by the agent from its "llm_cache" config; None disables caching
+        self.llm_cache: Optional[LLMResponseCache] = None
+        self._initialize_connections(agent_config, max_workers, startup_timeout)
 
     @staticmethod
-    def _class_name_to_type(class_name: str) -> Type[BaseConnection]:
-        if class_name == "twitter":
-            return TwitterConnection
-        elif class_name == "anthropic":
-            return AnthropicConnection
-        elif class_name == "openai":
-            return OpenAIConnection
-        elif class_name == "farcaster":
-            return FarcasterConnection
-        elif class_name == "groq":
-            return GroqConnection
-        elif class_name == "eternalai":
-            return EternalAIConnection
-        elif class_name == "ollama":
-            return OllamaConnection
-        elif class_name == "echochambers":
-            return EchochambersConnection
-        elif class_name == "goat":
-            return GoatConnection
-        elif class_name == "solana":
-            return SolanaConnection
-        elif class_name == "hyperbolic":
-            return HyperbolicConnection
-        elif class_name == "galadriel":
-            return GaladrielConnection
-        elif class_name == "sonic":
-            return SonicConnection
-        elif class_name == "discord":
-            return DiscordConnection
-        elif class_name == "allora":
-            return AlloraConnection
-        elif class_name == "xai":
-            return XAIConnection
-        elif class_name == "ethereum":
-            return EthereumConnection
-        elif class_name == "together":
-            return TogetherAIConnection
-        return None
-
-    def _register_connection(self, config_dic: Dict[str, Any]) -> None:
+    def _class_name_to_type(class_name: str) -> Optional[Type[BaseConnection]]:
+        """Resolve a connection name to its class, importing the module on first use"""
+        entry = CONNECTION_REGISTRY.get(class_name)
+        if entry is None:
+            return None
+        module_path, attr = entry
+        module = importlib.import_module(module_path)
+        return getattr(module, attr)
+
+    def _initialize_connections(
+        self,
+        agent_config: List[Dict[str, Any]],
+        max_workers: int,
+        startup_timeout: float
+    ) -> None:
         """
-        Create and register a new connection with configuration
+        Build all configured connections on a bounded thread pool.
 
-        Args:
-            name: Identifier for the connection
-            connection_class: The connection class to instantiate
-            config: Configuration dictionary for the connection
+        Each connection gets `startup_timeout` seconds from the moment its build
+        starts; a connection that overruns is left out and reported as timed out.
+        Connections are registered in config order so provider selection stays stable.
         """
+        configs = list(agent_config)
+        if not configs:
+            return
+
+        started_at: Dict[str, float] = {}
+        built: Dict[str, BaseConnection] = {}
+        wall_start = time.perf_counter()
+
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(configs))),
+            thread_name_prefix="connection-init"
+        )
+        futures: Dict[Future, str] = {
+            executor.submit(self._timed_create, config, started_at): config.get("name")
+            for config in configs
+        }
+        pending = set(futures)
         try:
-            name = config_dic["name"]
-            connection_class = self._class_name_to_type(name)
-            connection = connection_class(config_dic)
-            self.connections[name] = connection
-        except Exception as e:
-            logging.error(f"Failed to initialize connection {name}: {e}")
+            while pending:
+                now = time.perf_counter()
+                deadlines = [
+                    started_at[futures[future]] + startup_timeout
+                    for future in pending if futures[future] in started_at
+                ]
+                # Re-check at least twice a second so builds that start late still get a deadline
+                wait_for = min(max(0.0, min(deadlines) - now), 0.5) if deadlines else 0.5
+                done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = futures[future]
+                    elapsed = time.perf_counter() - started_at.get(name, wall_start)
+                    try:
+                        built[name] = future.result()
+                        self.startup_report[name] = {"status": "ok", "seconds": round(elapsed, 3), "error": None}
+                    except Exception as e:
+                        logging.error(f"Failed to initialize connection {name}: {e}")
+                        self.startup_report[name] = {"status": "failed", "seconds": round(elapsed, 3), "error": str(e)}
+
+                now = time.perf_counter()
+                for future in list(pending):
+                    name = futures[future]
+                    if name in started_at and now - started_at[name] > startup_timeout:
+                        pending.discard(future)
+                        future.cancel()
+                        logging.error(f"Timed out initializing connection {name} after {startup_timeout}s")
+                        self.startup_report[name] = {
+                            "status": "timeout",
+                            "seconds": round(now - started_at[name], 3),
+                            "error": f"Initialization exceeded {startup_timeout}s"
+                        }
+        finally:
+            # Timed-out builds keep running in their thread; their result is discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for config in configs:
+            name = config.get("name")
+            if name in built:
+                self.connections[name] = built[name]
+
+        self._log_startup_report(time.perf_counter() - wall_start)
+
+    def _timed_create(self, config_dic: Dict[str, Any], started_at: Dict[str, float]) -> BaseConnection:
+        started_at[config_dic.get("name")] = time.perf_counter()
+        return self._create_connection(config_dic)
+
+    def _create_connection(self, config_dic: Dict[str, Any]) -> BaseConnection:
+        """
+        Create a new connection from its configuration
+
+        Args:
+            config_dic: Configuration dictionary for the connection, including its name
+
+        Returns:
+            BaseConnection: The initialized connection
+
+        Raises:
+            ValueError: If the connection name is not in the registry
+        """
+        name = config_dic.get("name")
+        connection_class = self._class_name_to_type(name)
+        if connection_class is None:
+            raise ValueError(f"Unknown connection type '{name}'")
+        return connection_class(config_dic)
+
+    def _log_startup_report(self, wall_seconds: float) -> None:
+        """Log how long each connection took to initialize"""
+        icons = {"ok": "✅", "failed": "❌", "timeout": "⏱️"}
+        logger.info(f"\nConnection startup finished in {wall_seconds:.2f}s:")
+        for name, entry in sorted(self.startup_report.items(), key=lambda item: -item[1]["seconds"]):
+            logger.info(f"- {name}: {icons.get(entry['status'], '')} {entry['status']} ({entry['seconds']:.2f}s)")
 
     def _check_connection(self, connection_string: str) -> bool:
         try:
             connection = self.connections[connection_string]
-            return connection.is_configured(verbose=True)
+            return connection.is_configured_cached(verbose=True)
         except KeyError:
             logging.error(
                 "\nUnknown connection. Try 'list-connections' to see all supported connections."
@@ -104,6 +184,7 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
             success = connection.configure()
+            connection.invalidate_configuration_status()
 
             if success:
                 logging.info(
@@ -127,7 +208,7 @@ class ConnectionManager:
         logging.info("\nAVAILABLE CONNECTIONS:")
         for name, connection in self.connections.items():
             status = (
-                "✅ Configured" if connection.is_configured() else "❌ Not Configured"
+                "✅ Configured" if connection.is_configured_cached() else "❌ Not Configured"
             )
             logging.info(f"- {name}: {status}")
 
@@ -136,7 +217,7 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
 
-            if connection.is_configured():
+            if connection.is_configured_cached():
                 logging.info(
                     f"\n✅ {connection_name} is configured. You can use any of its actions."
                 )
@@ -160,6 +241,47 @@ class ConnectionManager:
         except Exception as e:
             logging.error(f"\nAn error occurred: {e}")
 
+    def _action_kwargs(self, connection: BaseConnection, connection_name: str, action_name: str, params: List[Any]) -> Optional[Dict[str, Any]]:
+        """Map positional params onto the action's parameters; None (after logging) if invalid"""
+        if action_name not in connection.actions:
+            logging.error(
+                f"\nError: Unknown action '{action_name}' for connection '{connection_name}'"
+            )
+            return None
+
+        action = connection.actions[action_name]
+
+        # Convert list of params to kwargs dictionary, handling both required and optional params
+        kwargs = {}
+        param_index = 0
+
+        # Add provided parameters up to the number provided
+        for i, param in enumerate(action.parameters):
+            if param_index < len(params):
+                kwargs[param.name] = params[param_index]
+                param_index += 1
+
+        # Validate all required parameters are present
+        missing_required = [
+            param.name
+            for param in action.parameters
+            if param.required and param.name not in kwargs
+        ]
+
+        if missing_required:
+            logging.error(
+                f"\nError: Missing required parameters: {', '.join(missing_required)}"
+            )
+            return None
+        return kwargs
+
+    def _action_failed(self, connection_name: str, action_name: str, error: Exception) -> None:
+        if is_auth_error(error) and connection_name in self.connections:
+            self.connections[connection_name].invalidate_configuration_status()
+        logging.error(
+            f"\nAn error occurred while trying action {action_name} for {connection_name} connection: {error}"
+        )
+
     def perform_action(
         self, connection_name: str, action_name: str, params: List[Any]
     ) -> Optional[Any]:
@@ -167,55 +289,96 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
 
-            if not connection.is_configured():
+            if not connection.is_configured_cached():
                 logging.error(
                     f"\nError: Connection '{connection_name}' is not configured"
                 )
                 return None
 
-            if action_name not in connection.actions:
-                logging.error(
-                    f"\nError: Unknown action '{action_name}' for connection '{connection_name}'"
-                )
+            kwargs = self._action_kwargs(connection, connection_name, action_name, params)
+            if kwargs is None:
                 return None
 
-            action = connection.actions[action_name]
+            if action_name == "generate-text" and self.llm_cache is not None:
+                return self._cached_generate(connection_name, connection, kwargs)
 
-            # Convert list of params to kwargs dictionary, handling both required and optional params
-            kwargs = {}
-            param_index = 0
+            return connection.perform_action(action_name, kwargs)
 
-            # Add provided parameters up to the number provided
-            for i, param in enumerate(action.parameters):
-                if param_index < len(params):
-                    kwargs[param.name] = params[param_index]
-                    param_index += 1
+        except Exception as e:
+            self._action_failed(connection_name, action_name, e)
+            return None
 
-            # Validate all required parameters are present
-            missing_required = [
-                param.name
-                for param in action.parameters
-                if param.required and param.name not in kwargs
-            ]
+    async def aperform_action(
+        self, connection_name: str, action_name: str, params: List[Any]
+    ) -> Optional[Any]:
+        """
+        Async counterpart of perform_action: native async actions are awaited on the
+        caller's event loop, sync ones run in a worker thread
+        """
+        try:
+            connection = self.connections[connection_name]
 
-            if missing_required:
+            if not await connection.ais_configured_cached():
                 logging.error(
-                    f"\nError: Missing required parameters: {', '.join(missing_required)}"
+                    f"\nError: Connection '{connection_name}' is not configured"
                 )
                 return None
 
-            return connection.perform_action(action_name, kwargs)
+            kwargs = self._action_kwargs(connection, connection_name, action_name, params)
+            if kwargs is None:
+                return None
+
+            if action_name == "generate-text" and self.llm_cache is not None:
+                return await self._acached_generate(connection_name, connection, kwargs)
+
+            return await connection.aperform_action(action_name, kwargs)
 
         except Exception as e:
-            logging.error(
-                f"\nAn error occurred while trying action {action_name} for {connection_name} connection: {e}"
-            )
+            self._action_failed(connection_name, action_name, e)
             return None
 
+    def llm_cache_key(self, connection_name: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Cache key for a generate-text/stream-text call, or None if it must not be cached"""
+        if self.llm_cache is None or self.llm_cache.bypasses(current_action.get()):
+            return None
+        connection = self.connections[connection_name]
+        model = kwargs.get("model") or connection.config.get("model")
+        return cache_key(connection_name, model, kwargs.get("system_prompt"), str(kwargs.get("prompt", "")))
+
+    def _cached_generate(self, connection_name: str, connection: BaseConnection, kwargs: Dict[str, Any]) -> Any:
+        key = self.llm_cache_key(connection_name, kwargs)
+        if key is not None:
+            cached = self.llm_cache.get(key)
+            if cached is not None:
+                return cached
+
+        result = connection.perform_action("generate-text", kwargs)
+        if key is not None and isinstance(result, str) and result:
+            self.llm_cache.put(key, result)
+        return result
+
+    async def _acached_generate(self, connection_name: str, connection: BaseConnection, kwargs: Dict[str, Any]) -> Any:
+        key = self.llm_cache_key(connection_name, kwargs)
+        if key is not None:
+            # The disk tier is SQLite, so keep it off the event loop
+            cached = await asyncio.to_thread(self.llm_cache.get, key)
+            if cached is not None:
+                return cached
+
+        result = await connection.aperform_action("generate-text", kwargs)
+        if key is not None and isinstance(result, str) and result:
+            await asyncio.to_thread(self.llm_cache.put, key, result)
+        return result
+
+    def invalidate_configuration_status(self) -> None:
+        """Force every connection to re-check its configuration on next use"""
+        for connection in self.connections.values():
+            connection.invalidate_configuration_status()
+
     def get_model_providers(self) -> List[str]:
         """Get a list of all LLM provider connections"""
         return [
             name
             for name, conn in self.connections.items()
-            if conn.is_configured() and getattr(conn, "is_llm_provider", lambda: False)
+            if conn.is_configured_cached() and getattr(conn, "is_llm_provider", lambda: False)
         ]
@@ -1,13 +1,21 @@
 import logging
-from typing import List, Dict, Any
+import time
+import weakref
+from typing import List, Dict, Any, Awaitable, Callable, Hashable, Optional, Tuple
 from dotenv import set_key
 from allora_sdk.v2.api_client import AlloraAPIClient, ChainSlug
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
-import os
+from src.helpers.credentials import credential_store
+from src.connections.client_pool import shared_client, shared_loop
 import asyncio
 
 logger = logging.getLogger("connections.allora_connection")
 
+DEFAULT_BLOCK_TIME = 5  # seconds per Allora block, turns a topic's epoch_length into a duration
+DEFAULT_INFERENCE_TTL = 60  # seconds an inference is cached when its topic's epoch is unknown
+DEFAULT_TOPICS_REFRESH_INTERVAL = 600  # seconds between background topic list refreshes
+REQUEST_TIMEOUT = 30
+
 class AlloraConnectionError(Exception):
     """Base exception for Allora connection errors"""
     pass
@@ -25,6 +33,14 @@ class AlloraConnection(BaseConnection):
         super().__init__(config)
         self._client = None
         self.chain_slug = config.get("chain_slug", ChainSlug.TESTNET)
+        self.block_time = config.get("block_time", DEFAULT_BLOCK_TIME)
+        self.inference_ttl = config.get("inference_ttl", DEFAULT_INFERENCE_TTL)
+        self.topics_refresh_interval = config.get("topics_refresh_interval", DEFAULT_TOPICS_REFRESH_INTERVAL)
+        # Touched only from the shared "allora" loop, so no locking
+        self._inferences: Dict[int, Tuple[Dict[str, Any], float]] = {}
+        self._topics: Optional[List[Any]] = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._topics_refresher: Optional[asyncio.Task] = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -33,12 +49,13 @@ class AlloraConnection(BaseConnection):
     def _get_client(self) -> AlloraAPIClient:
         """Get or create Allora client"""
         if not self._client:
-            api_key = os.getenv("ALLORA_API_KEY")
+            api_key = credential_store.get("ALLORA_API_KEY")
             if not api_key:
                 raise AlloraConfigurationError("Allora API key not found in environment")
-            self._client = AlloraAPIClient(
-                chain_slug=self.chain_slug,
-                api_key=api_key
+            self._client = shared_client(
+                "allora",
+                (api_key, self.chain_slug),
+                lambda: AlloraAPIClient(chain_slug=self.chain_slug, api_key=api_key)
             )
         return self._client
 
@@ -60,39 +77,125 @@ class AlloraConnection(BaseConnection):
         ]
         self.actions = {action.name: action for action in actions}
 
-    def _make_request(self, method_name: str, *args, **kwargs) -> Any:
-        """Make API request with error handling"""
+    def _run(self, coro: Awaitable) -> Any:
+        """Run a coroutine on the long-lived Allora loop and wait for the result"""
+        return asyncio.run_coroutine_threadsafe(coro, shared_loop("allora")).result(REQUEST_TIMEOUT)
+
+    async def _arun(self, coro: Awaitable) -> Any:
+        """_run for async callers; the client only ever runs on the Allora loop"""
+        future = asyncio.run_coroutine_threadsafe(coro, shared_loop("allora"))
+        return await asyncio.wait_for(asyncio.wrap_future(future), REQUEST_TIMEOUT)
+
+    async def _call(self, method_name: str, *args, **kwargs) -> Any:
+        client = self._get_client()
+        return await getattr(client, method_name)(*args, **kwargs)
+
+    async def _single_flight(self, key: Hashable, fetch: Callable[[], Awaitable]) -> Any:
+        """Concurrent callers for the same key share one request"""
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(fetch())
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _inference(self, topic_id: int) -> Dict[str, Any]:
+        """Cached inference for a topic; the network only publishes a new one each epoch"""
+        entry = self._inferences.get(topic_id)
+        if entry and entry[1] > time.time():
+            return entry[0]
+        return await self._single_flight(("inference", topic_id), lambda: self._fetch_inference(topic_id))
+
+    async def _fetch_inference(self, topic_id: int) -> Dict[str, Any]:
+        if self._topics is None:
+            # The topic list holds the epoch length the cache expiry is based on
+            response, _ = await asyncio.gather(
+                self._call('get_inference_by_topic_id', topic_id),
+                self._topics_or_none()
+            )
+        else:
+            response = await self._call('get_inference_by_topic_id', topic_id)
+        data = response.inference_data
+        result = {
+            "topic_id": topic_id,
+            "inference": data.network_inference_normalized
+        }
+        self._inferences[topic_id] = (result, self._inference_expiry(topic_id, getattr(data, "timestamp", None)))
+        return result
+
+    def _inference_expiry(self, topic_id: int, timestamp: Optional[float]) -> float:
+        """An inference is current until its topic's next epoch starts"""
+        now = time.time()
+        epoch = self._epoch_seconds(topic_id)
+        if epoch is None:
+            return now + self.inference_ttl
+        if timestamp:
+            timestamp = float(timestamp)
+            if timestamp > 1e12:  # milliseconds
+                timestamp /= 1000
+            next_epoch = timestamp + epoch
+            if next_epoch > now:
+                return min(next_epoch, now + epoch)
+        # No (or an already outdated) timestamp: the next epoch is due any moment
+        return now + min(epoch, self.inference_ttl)
+
+    def _epoch_seconds(self, topic_id: int) -> Optional[float]:
+        for topic in self._topics or []:
+            if _field(topic, "topic_id") == topic_id:
+                epoch_length = _field(topic, "epoch_length")
+                return epoch_length * self.block_time if epoch_length else None
+        return None
+
+    async def _list_topics(self) -> List[Any]:
+        """Cached topic list; fetched on first use, then refreshed in the background"""
+        if self._topics_refresher is None or self._topics_refresher.done():
+            self._topics_refresher = asyncio.ensure_future(_refresh_topics(weakref.ref(self)))
+        if self._topics is None:
+            await self._single_flight("topics", self._fetch_topics)
+        return self._topics
+
+    async def _fetch_topics(self) -> List[Any]:
+        self._topics = await self._call('get_all_topics')
+        return self._topics
+
+    async def _topics_or_none(self) -> Optional[List[Any]]:
         try:
-            client = self._get_client()
-            method = getattr(client, method_name)
-            
-            # Create event loop for async calls
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                response = loop.run_until_complete(method(*args, **kwargs))
-                return response
-            finally:
-                loop.close()
-                
+            return await self._list_topics()
         except Exception as e:
-            raise AlloraAPIError(f"API request failed: {str(e)}")
+            logger.debug(f"Topic list unavailable, inference expiry falls back to inference_ttl: {e}")
+            return None
 
     def get_inference(self, topic_id: int) -> Dict[str, Any]:
         """Get inference from Allora Network for a specific topic"""
+        entry = self._inferences.get(topic_id)
+        if entry and entry[1] > time.time():
+            return entry[0]
         try:
-            response = self._make_request('get_inference_by_topic_id', topic_id)
-            return {
-                "topic_id": topic_id,
-                "inference": response.inference_data.network_inference_normalized
-            }
+            return self._run(self._inference(topic_id))
         except Exception as e:
             raise AlloraAPIError(f"Failed to get inference: {str(e)}")
 
     def list_topics(self) -> List[Dict[str, Any]]:
         """List all available Allora Network topics"""
         try:
-            return self._make_request('get_all_topics')
+            return self._run(self._list_topics())
+        except Exception as e:
+            raise AlloraAPIError(f"Failed to list topics: {str(e)}")
+
+    async def aget_inference(self, topic_id: int) -> Dict[str, Any]:
+        """get_inference for async callers"""
+        entry = self._inferences.get(topic_id)
+        if entry and entry[1] > time.time():
+            return entry[0]
+        try:
+            return await self._arun(self._inference(topic_id))
+        except Exception as e:
+            raise AlloraAPIError(f"Failed to get inference: {str(e)}")
+
+    async def alist_topics(self) -> List[Dict[str, Any]]:
+        """list_topics for async callers"""
+        try:
+            return await self._arun(self._list_topics())
         except Exception as e:
             raise AlloraAPIError(f"Failed to list topics: {str(e)}")
 
@@ -127,7 +230,7 @@ class AlloraConnection(BaseConnection):
 
     def is_configured(self, verbose: bool = False) -> bool:
         """Check if Allora API is configured"""
-        api_key = os.getenv("ALLORA_API_KEY")
+        api_key = credential_store.get("ALLORA_API_KEY")
         if verbose:
             if not api_key:
                 logger.info("\n❌ Allora API key not found in environment")
@@ -147,4 +250,27 @@ class AlloraConnection(BaseConnection):
 
         method_name = action_name.replace('-', '_')
         method = getattr(self, method_name)
-        return method(**kwargs)
\ No newline at end of file
+        return method(**kwargs)
+
+def _field(item: Any, name: str) -> Any:
+    """Read a field from an SDK model or a plain dict"""
+    return item.get(name) if isinstance(item, dict) else getattr(item, name, None)
+
+
+async def _refresh_topics(connection_ref: "weakref.ref[AlloraConnection]") -> None:
+    """Keep a connection's topic list fresh; stops once the connection is gone"""
+    while True:
+        connection = connection_ref()
+        if connection is None:
+            return
+        interval = connection.topics_refresh_interval
+        del connection
+        await asyncio.sleep(interval)
+        connection = connection_ref()
+        if connection is None:
+            return
+        try:
+            await connection._single_flight("topics", connection._fetch_topics)
+        except Exception as e:
+            logger.warning(f"Allora topic list refresh failed: {e}")
+        del connection
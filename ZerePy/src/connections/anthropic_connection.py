@@ -1,9 +1,12 @@
 import logging
 import os
-from typing import Dict, Any
-from dotenv import load_dotenv, set_key
+import threading
+from typing import Dict, Any, Iterator
+from dotenv import set_key
 from anthropic import Anthropic, NotFoundError
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_store
+from src.connections.client_pool import shared_client
 
 logger = logging.getLogger("connections.anthropic_connection")
 
@@ -23,6 +26,21 @@ class AnthropicConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        # "prompt_caching": true marks the system prompt as a cacheable prefix. The API
+        # only caches prefixes above a model-specific minimum (~1024 tokens).
+        self.prompt_caching = bool(config.get("prompt_caching", False))
+        # Point at a local stub server (or proxy) instead of api.anthropic.com
+        self.base_url = config.get("base_url")
+        self._usage_lock = threading.Lock()
+        self.usage_stats = {
+            "calls": 0,
+            "cache_hits": 0,
+            "cache_writes": 0,
+            "input_tokens": 0,
+            "cache_read_input_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "output_tokens": 0,
+        }
 
     @property
     def is_llm_provider(self) -> bool:
@@ -38,6 +56,9 @@ class AnthropicConnection(BaseConnection):
             
         if not isinstance(config["model"], str):
             raise ValueError("model must be a string")
+
+        if "base_url" in config and not isinstance(config["base_url"], str):
+            raise ValueError("base_url must be a string")
             
         return config
 
@@ -53,6 +74,15 @@ class AnthropicConnection(BaseConnection):
                 ],
                 description="Generate text using Anthropic models"
             ),
+            "stream-text": Action(
+                name="stream-text",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream text from Anthropic models as it is generated"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -64,18 +94,57 @@ class AnthropicConnection(BaseConnection):
                 name="list-models",
                 parameters=[],
                 description="List all available Anthropic models"
+            ),
+            "get-usage-stats": Action(
+                name="get-usage-stats",
+                parameters=[],
+                description="Token counts and prompt cache hits/writes since startup"
             )
         }
 
     def _get_client(self) -> Anthropic:
         """Get or create Anthropic client"""
         if not self._client:
-            api_key = os.getenv("ANTHROPIC_API_KEY")
+            api_key = credential_store.get("ANTHROPIC_API_KEY")
             if not api_key:
                 raise AnthropicConfigurationError("Anthropic API key not found in environment")
-            self._client = Anthropic(api_key=api_key)
+            self._client = shared_client(
+                "anthropic",
+                (api_key, self.base_url),
+                lambda: Anthropic(api_key=api_key, base_url=self.base_url)
+            )
         return self._client
 
+    def _system(self, system_prompt: str) -> Any:
+        """System prompt as sent to the API: a cacheable text block when prompt caching is on"""
+        if not self.prompt_caching or not system_prompt:
+            return system_prompt
+        return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+    def _record_usage(self, usage: Any) -> None:
+        """Log one call's token counts and whether the system prompt came from the cache"""
+        if usage is None:
+            return
+        input_tokens = getattr(usage, "input_tokens", 0) or 0
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        cache_creation = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        output_tokens = getattr(usage, "output_tokens", 0) or 0
+        with self._usage_lock:
+            stats = self.usage_stats
+            stats["calls"] += 1
+            stats["cache_hits"] += 1 if cache_read else 0
+            stats["cache_writes"] += 1 if cache_creation else 0
+            stats["input_tokens"] += input_tokens
+            stats["cache_read_input_tokens"] += cache_read
+            stats["cache_creation_input_tokens"] += cache_creation
+            stats["output_tokens"] += output_tokens
+        if self.prompt_caching:
+            outcome = "hit" if cache_read else ("write" if cache_creation else "miss")
+            logger.info(
+                f"Anthropic prompt cache {outcome}: input={input_tokens} cache_read={cache_read} "
+                f"cache_write={cache_creation} output={output_tokens}"
+            )
+
     def configure(self) -> bool:
         """Sets up Anthropic API authentication"""
         logger.info("\n🤖 ANTHROPIC API SETUP")
@@ -100,7 +169,7 @@ class AnthropicConnection(BaseConnection):
             set_key('.env', 'ANTHROPIC_API_KEY', api_key)
             
             # Validate the API key
-            client = Anthropic(api_key=api_key)
+            client = Anthropic(api_key=api_key, base_url=self.base_url)
             client.models.list()
 
             logger.info("\n✅ Anthropic API configuration successfully saved!")
@@ -114,12 +183,11 @@ class AnthropicConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if Anthropic API key is configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('ANTHROPIC_API_KEY')
+            api_key = credential_store.get('ANTHROPIC_API_KEY')
             if not api_key:
                 return False
 
-            client = Anthropic(api_key=api_key)
+            client = Anthropic(api_key=api_key, base_url=self.base_url)
             client.models.list()
             return True
             
@@ -141,7 +209,7 @@ class AnthropicConnection(BaseConnection):
                 model=model,
                 max_tokens=1000,
                 temperature=0,
-                system=system_prompt,
+                system=self._system(system_prompt),
                 messages=[
                     {
                         "role": "user",
@@ -154,11 +222,39 @@ class AnthropicConnection(BaseConnection):
                     }
                 ]
             )
+            self._record_usage(message.usage)
             return message.content[0].text
             
         except Exception as e:
             raise AnthropicAPIError(f"Text generation failed: {e}")
 
+    def stream_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from Anthropic models, yielding chunks as they arrive"""
+        try:
+            client = self._get_client()
+            with client.messages.stream(
+                model=model or self.config["model"],
+                max_tokens=1000,
+                temperature=0,
+                system=self._system(system_prompt),
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": prompt
+                            }
+                        ]
+                    }
+                ]
+            ) as stream:
+                yield from stream.text_stream
+                self._record_usage(stream.get_final_message().usage)
+
+        except Exception as e:
+            raise AnthropicAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
@@ -189,6 +285,14 @@ class AnthropicConnection(BaseConnection):
         except Exception as e:
             raise AnthropicAPIError(f"Listing models failed: {e}")
 
+    def get_usage_stats(self, **kwargs) -> Dict[str, Any]:
+        """Token and prompt cache counters accumulated since startup"""
+        with self._usage_lock:
+            stats = dict(self.usage_stats)
+        stats["prompt_caching"] = self.prompt_caching
+        stats["cache_hit_rate"] = stats["cache_hits"] / stats["calls"] if stats["calls"] else 0.0
+        return stats
+
     def perform_action(self, action_name: str, kwargs) -> Any:
         """Execute a Twitter action with validation"""
         if action_name not in self.actions:
@@ -1,8 +1,20 @@
+import asyncio
+import inspect
 import logging
+import re
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Callable
+from typing import Any, Dict, Iterable, Iterator, List, Callable
 from dataclasses import dataclass
 
+# How long a cached is_configured() result is trusted before re-checking (seconds).
+# Override per connection with "config_status_ttl" in the agent JSON.
+DEFAULT_CONFIG_STATUS_TTL = 300
+DEFAULT_NEGATIVE_CONFIG_STATUS_TTL = 10  # seconds a failed check is trusted before retrying
+
+_AUTH_ERROR_CLASSES = {"AuthenticationError", "PermissionDeniedError", "Unauthorized"}
+_AUTH_STATUS_PATTERN = re.compile(r"\b(401|403)\b|unauthori[sz]ed", re.IGNORECASE)
+
 @dataclass
 class ActionParameter:
     name: str
@@ -28,6 +40,30 @@ class Action:
                     errors.append(f"Invalid type for {param.name}. Expected {param.type.__name__}")
         return errors
 
+def is_auth_error(error: BaseException) -> bool:
+    """Best-effort check whether an exception (or anything it wraps) is an auth failure"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        status = getattr(error, "status_code", None)
+        if status is None:
+            status = getattr(getattr(error, "response", None), "status_code", None)
+        if status in (401, 403) or type(error).__name__ in _AUTH_ERROR_CLASSES:
+            return True
+        if _AUTH_STATUS_PATTERN.search(str(error)):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+def text_deltas(stream: Iterable[Any]) -> Iterator[str]:
+    """Yield the non-empty text deltas of an OpenAI-style chat completion stream"""
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if content:
+            yield content
+
 class BaseConnection(ABC):
     def __init__(self, config):
         try:
@@ -84,6 +120,47 @@ class BaseConnection(ABC):
         """
         pass
 
+    def is_configured_cached(self, verbose: bool = False) -> bool:
+        """
+        Return the configuration status, re-running is_configured() only when the
+        cached result is older than the connection's TTL or has been invalidated.
+        A negative result is only kept for a few seconds, so one transient failure
+        doesn't take the connection out of service for the whole TTL.
+
+        Args:
+            verbose: Passed through to is_configured() when a fresh check is needed
+
+        Returns:
+            bool: True if the connection is configured, False otherwise
+        """
+        cached = getattr(self, "_config_status", None)
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < self._config_status_ttl(cached[0]):
+            if verbose and not cached[0]:
+                logging.info(f"{type(self).__name__} is not configured (cached status)")
+            return cached[0]
+
+        status = bool(self.is_configured(verbose=verbose))
+        self._config_status = (status, now)
+        return status
+
+    def invalidate_configuration_status(self) -> None:
+        """Drop the cached configuration status so the next check hits is_configured()"""
+        self._config_status = None
+
+    async def ais_configured_cached(self) -> bool:
+        """is_configured_cached() for async callers; only a stale status costs a worker thread"""
+        cached = getattr(self, "_config_status", None)
+        if cached is not None and time.monotonic() - cached[1] < self._config_status_ttl(cached[0]):
+            return cached[0]
+        return await asyncio.to_thread(self.is_configured_cached)
+
+    def _config_status_ttl(self, status: bool = True) -> float:
+        config = getattr(self, "config", None) or getattr(self, "_config", None) or {}
+        if not status:
+            return config.get("config_status_negative_ttl", DEFAULT_NEGATIVE_CONFIG_STATUS_TTL)
+        return config.get("config_status_ttl", DEFAULT_CONFIG_STATUS_TTL)
+
     @abstractmethod
     def register_actions(self) -> None:
         """
@@ -112,3 +189,47 @@ class BaseConnection(ABC):
             
         handler = self.actions[action_name]
         return handler(**kwargs)
+
+    def call_action(self, action_name: str, kwargs: Dict[str, Any]) -> Any:
+        """
+        Call perform_action with a kwargs dict, whichever calling convention the
+        subclass uses (perform_action(name, kwargs) or perform_action(name, **kwargs))
+        """
+        parameters = inspect.signature(self.perform_action).parameters.values()
+        if any(param.kind == param.VAR_KEYWORD for param in parameters):
+            return self.perform_action(action_name, **kwargs)
+        return self.perform_action(action_name, kwargs)
+
+    async def aperform_action(self, action_name: str, kwargs: Dict[str, Any]) -> Any:
+        """
+        Async counterpart of perform_action.
+
+        A connection with an async client implements an action natively by
+        defining a coroutine named "a" + the action's method name (get-balance ->
+        aget_balance). Every other action runs the sync perform_action in a
+        worker thread.
+
+        Args:
+            action_name: Name of the action to perform
+            kwargs: Parameters for the action
+
+        Returns:
+            Any: Result of the action
+
+        Raises:
+            KeyError: If the action is not registered
+            ValueError: If the action parameters are invalid
+        """
+        if action_name not in self.actions:
+            raise KeyError(f"Unknown action: {action_name}")
+
+        native = getattr(self, "a" + action_name.replace("-", "_"), None)
+        if native is None or not inspect.iscoroutinefunction(native):
+            return await asyncio.to_thread(self.call_action, action_name, kwargs)
+
+        action = self.actions[action_name]
+        if isinstance(action, Action):
+            errors = action.validate_params(kwargs)
+            if errors:
+                raise ValueError(f"Invalid parameters: {', '.join(errors)}")
+        return await native(**kwargs)
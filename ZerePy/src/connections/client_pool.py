@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger("connections.client_pool")
+
+T = TypeVar("T")
+
+# (kind, key) -> client. Shared by every connection in the process, so agents hosted
+# side by side reuse one SDK client / HTTP pool per provider credential or RPC URL.
+_clients: Dict[Tuple[str, Hashable], Any] = {}
+_locks: Dict[Tuple[str, Hashable], threading.Lock] = {}
+_registry_lock = threading.Lock()
+# Async clients hold connection pools tied to one event loop, so they are shared per loop
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, Hashable], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def shared_client(kind: str, key: Hashable, factory: Callable[[], T]) -> T:
+    """
+    Get the process-wide client for (kind, key), creating it with `factory` once
+
+    Args:
+        kind: Client family, e.g. "openai" or "web3"
+        key: Whatever distinguishes two clients of that kind (API key, base URL, RPC URL)
+        factory: Builds the client on first use
+
+    Returns:
+        The shared client
+    """
+    pool_key = (kind, key)
+    client = _clients.get(pool_key)
+    if client is not None:
+        return client
+
+    with _registry_lock:
+        lock = _locks.setdefault(pool_key, threading.Lock())
+
+    # Per-key lock so a slow handshake for one client doesn't block the others
+    with lock:
+        client = _clients.get(pool_key)
+        if client is None:
+            client = factory()
+            _clients[pool_key] = client
+            logger.debug(f"Created shared {kind} client")
+    return client
+
+
+def shared_async_client(kind: str, key: Hashable, factory: Callable[[], T]) -> T:
+    """
+    Like shared_client, but one client per running event loop (call from a coroutine)
+
+    Clients are dropped together with their loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _registry_lock:
+        clients = _loop_clients.setdefault(loop, {})
+        client = clients.get((kind, key))
+        if client is None:
+            client = factory()
+            clients[(kind, key)] = client
+            logger.debug(f"Created shared async {kind} client")
+    return client
+
+
+def shared_loop(name: str) -> asyncio.AbstractEventLoop:
+    """
+    Get a long-lived event loop running in its own daemon thread
+
+    For SDKs that are async-only: sync callers submit coroutines with
+    asyncio.run_coroutine_threadsafe instead of building a loop per call, and
+    clients bound to the loop stay usable across calls.
+    """
+    def build():
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name=f"loop:{name}", daemon=True).start()
+        return loop
+
+    return shared_client("loop", name, build)
+
+
+def shared_web3(rpc_url: str, poa: bool = False):
+    """Get the shared Web3 instance for an RPC URL (with the PoA middleware if requested)"""
+    def build():
+        from web3 import Web3
+        from src.helpers.http import http_session
+        # JSON-RPC goes over the shared keep-alive pool like every other REST call
+        web3 = Web3(Web3.HTTPProvider(rpc_url, session=http_session()))
+        if poa:
+            from web3.middleware import geth_poa_middleware
+            web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        return web3
+
+    return shared_client("web3", (rpc_url, poa), build)
+
+
+def discard_client(kind: str, key: Hashable) -> None:
+    """Drop a shared client, e.g. after its credentials were rotated"""
+    _clients.pop((kind, key), None)
+
+
+def client_pool_stats() -> Dict[str, int]:
+    """Number of live shared clients per kind"""
+    stats: Dict[str, int] = {}
+    for kind, _ in list(_clients):
+        stats[kind] = stats.get(kind, 0) + 1
+    return stats
@@ -1,10 +1,11 @@
 import os
 import logging
 from typing import Dict, Any
-from dotenv import set_key, load_dotenv
+from dotenv import set_key
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_store
 from src.helpers import print_h_bar
-import requests
+from src.helpers.http import http_session
 import json
 
 logger = logging.getLogger("connections.discord_connection")
@@ -208,8 +209,7 @@ class DiscordConnection(BaseConnection):
     def is_configured(self, verbose=False) -> bool:
         """Check if Discord API key is configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv("DISCORD_TOKEN")
+            api_key = credential_store.get("DISCORD_TOKEN")
             if not api_key:
                 return False
 
@@ -390,7 +390,7 @@ class DiscordConnection(BaseConnection):
             "Accept": "application/json",
             "Authorization": self._get_request_auth_token(),
         }
-        response = requests.request("PUT", url, headers=headers, data={})
+        response = http_session().request("PUT", url, headers=headers, data={})
         if response.status_code != 204:
             raise DiscordAPIError(
                 f"Failed to called PUT to Discord: {response.status_code} - {response.text}"
@@ -405,7 +405,7 @@ class DiscordConnection(BaseConnection):
             "Accept": "application/json",
             "Authorization": self._get_request_auth_token(),
         }
-        response = requests.request("POST", url, headers=headers, data=payload)
+        response = http_session().request("POST", url, headers=headers, data=payload)
         if response.status_code != 200:
             raise DiscordAPIError(
                 f"Failed to call POST to Discord: {response.status_code} - {response.text}"
@@ -420,7 +420,7 @@ class DiscordConnection(BaseConnection):
             "Authorization": self._get_request_auth_token(),
         }
         print(headers)
-        response = requests.request("GET", url, headers=headers, data={})
+        response = http_session().request("GET", url, headers=headers, data={})
         if response.status_code != 200:
             raise DiscordAPIError(
                 f"Failed to call GET to Discord: {response.status_code} - {response.text}"
@@ -428,14 +428,14 @@ class DiscordConnection(BaseConnection):
         return json.loads(response.text)
 
     def _get_request_auth_token(self) -> str:
-        return f"Bot {os.getenv('DISCORD_TOKEN')}"
+        return f"Bot {credential_store.get('DISCORD_TOKEN')}"
 
     def _test_connection(self, api_key: str) -> None:
         """Helper method to check if Discord is reachable"""
         try:
             url = f"{self.base_url}/users/@me"
             headers = {"Accept": "application/json", "Authorization": f"Bot {api_key}"}
-            response = requests.request("GET", url, headers=headers, data={})
+            response = http_session().request("GET", url, headers=headers, data={})
             if response.status_code != 200:
                 raise DiscordAPIError(
                     f"Failed to call GET to Discord: {response.status_code} - {response.text}"
@@ -4,8 +4,9 @@ from typing import Dict, Any, List
 from collections import deque
 
 import requests
-from dotenv import load_dotenv
+from src.helpers.http import http_session
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.dedup import DedupFilter
 
 logger = logging.getLogger("connections.echochambers_connection")
 
@@ -45,7 +46,13 @@ class EchochambersConnection(BaseConnection):
 
         # Initialize message queue and tracking
         self.message_queue: List[Dict[str, Any]] = []
-        self.processed_messages = set()
+        # Bounded: exact for recent ids, Bloom-filtered for the rest of the window
+        self.processed_messages = DedupFilter(
+            front_size=config.get("processed_front_size", 1000),
+            capacity=config.get("processed_capacity", 50_000),
+            error_rate=config.get("processed_error_rate", 0.001),
+            window=config.get("processed_window", 24 * 3600)
+        )
         self.max_queue_size = 100
         
         # Keep track of our last messages to ensure uniqueness
@@ -202,31 +209,24 @@ class EchochambersConnection(BaseConnection):
             raise
 
     def _make_request(self, method: str, url: str, **kwargs) -> Any:
-        """Make HTTP request with retries and error handling"""
+        """Make HTTP request; connection errors and 5xx are retried by the shared session"""
         headers = {
             "Content-Type": "application/json",
             "x-api-key": self.api_key
         }
         kwargs['headers'] = headers
 
-        for attempt in range(3):
-            try:
-                response = requests.request(method, url, timeout=10, **kwargs)
-                if response.status_code == 429:  # Rate limit
-                    retry_after = int(response.headers.get('Retry-After', 60))
-                    logger.warning(f"Rate limit hit, waiting {retry_after}s")
-                    time.sleep(retry_after)
-                    continue
-                response.raise_for_status()
-                return response.json()
-            except requests.Timeout:
-                logger.error(f"Timeout on attempt {attempt + 1}")
-                time.sleep(2 ** attempt)  # Exponential backoff
-            except requests.RequestException as e:
-                if attempt == 2:
-                    raise EchochambersAPIError(f"Failed after 3 attempts: {str(e)}")
-                logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
-                time.sleep(2 ** attempt)
+        try:
+            response = http_session().request(method, url, timeout=10, **kwargs)
+            if response.status_code == 429:  # Rate limit, which the session leaves to us
+                retry_after = int(response.headers.get('Retry-After', 60))
+                logger.warning(f"Rate limit hit, waiting {retry_after}s")
+                time.sleep(retry_after)
+                response = http_session().request(method, url, timeout=10, **kwargs)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            raise EchochambersAPIError(f"Request failed: {str(e)}")
 
     def _handle_error(self, message: str, error: Exception) -> None:
         """Handle and log errors"""
@@ -244,12 +244,15 @@ class EchochambersConnection(BaseConnection):
             avg_latency = (sum(self.metrics['api_latency']) / len(self.metrics['api_latency'])
                            if self.metrics['api_latency'] else 0)
 
+            dedup_stats = self.processed_messages.stats()
             logger.info(f"Echochambers Metrics:"
                         f"\n- Success Rate: {success_rate:.2f}%"
                         f"\n- Average Latency: {avg_latency:.2f} ms"
                         f"\n- Messages Sent: {self.metrics['messages_sent']}"
                         f"\n- Messages Failed: {self.metrics['messages_failed']}"
-                        f"\n- Last Error: {self.metrics['last_error']}")
+                        f"\n- Last Error: {self.metrics['last_error']}"
+                        f"\n- Processed IDs: {dedup_stats['adds']} seen, "
+                        f"{dedup_stats['hit_rate']:.0%} duplicate rate, {dedup_stats['filter_bytes']} filter bytes")
 
             self.metrics['last_metrics_log'] = current_time
 
@@ -1,19 +1,30 @@
 import logging
 import os
 import json
-from typing import Dict, Any
-from dotenv import load_dotenv, set_key
+import threading
+import time
+from typing import Dict, Any, Iterator, Optional, Tuple
+from dotenv import set_key
 from openai import OpenAI
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
-from web3 import Web3
-import requests
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, text_deltas
+from src.helpers.credentials import credential_store
+from src.connections.client_pool import shared_client, shared_web3
+from src.helpers.http import http_session
 
 logger = logging.getLogger("connections.eternalai_connection")
 IPFS = "ipfs://"
 LIGHTHOUSE_IPFS = "https://gateway.lighthouse.storage/ipfs/"
 GCS_ETERNAL_AI_BASE_URL = "https://cdn.eternalai.org/upload/"
+DEFAULT_SYSTEM_PROMPT_TTL = 600  # seconds an on-chain system prompt is used without touching the chain
 AGENT_CONTRACT_ABI = [{"inputs": [{"internalType": "uint256","name": "_agentId","type": "uint256"}],"name": "getAgentSystemPrompt","outputs": [{"internalType": "bytes[]","name": "","type": "bytes[]"}],"stateMutability": "view","type": "function"}]
 
+# (chain_id, contract, agent_id) -> (on-chain bytes, prompt content, block, monotonic time checked).
+# Shared by every EternalAI connection in the process.
+_onchain_prompts: Dict[Tuple[str, str, int], Tuple[bytes, str, Optional[int], float]] = {}
+_onchain_locks: Dict[Tuple[str, str, int], threading.Lock] = {}
+_onchain_registry_lock = threading.Lock()
+
+
 class EternalAIConnectionError(Exception):
     """Base exception for EternalAI connection errors"""
     pass
@@ -33,6 +44,9 @@ class EternalAIConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        self.system_prompt_ttl = config.get("system_prompt_ttl", DEFAULT_SYSTEM_PROMPT_TTL)
+        # When set, an expired prompt is kept until the chain has advanced this many blocks
+        self.system_prompt_refresh_blocks = config.get("system_prompt_refresh_blocks")
 
     @property
     def is_llm_provider(self) -> bool:
@@ -63,6 +77,15 @@ class EternalAIConnection(BaseConnection):
                 ],
                 description="Generate text using EternalAI models"
             ),
+            "stream-text": Action(
+                name="stream-text",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream text from EternalAI models as it is generated"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -80,11 +103,11 @@ class EternalAIConnection(BaseConnection):
     def _get_client(self) -> OpenAI:
         """Get or create EternalAI client"""
         if not self._client:
-            api_key = os.getenv("EternalAI_API_KEY")
-            api_url = os.getenv("EternalAI_API_URL")
+            api_key = credential_store.get("EternalAI_API_KEY")
+            api_url = credential_store.get("EternalAI_API_URL")
             if not api_key or not api_url:
                 raise EternalAIConfigurationError("EternalAI credentials not found in environment")
-            self._client = OpenAI(api_key=api_key, base_url=api_url)
+            self._client = shared_client("openai", (api_key, api_url), lambda: OpenAI(api_key=api_key, base_url=api_url))
         return self._client
 
     def configure(self) -> bool:
@@ -128,9 +151,8 @@ class EternalAIConnection(BaseConnection):
     def is_configured(self, verbose=False) -> bool:
         """Check if EternalAI API credentials are configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('EternalAI_API_KEY')
-            api_url = os.getenv('EternalAI_API_URL')
+            api_key = credential_store.get('EternalAI_API_KEY')
+            api_url = credential_store.get('EternalAI_API_URL')
             if not api_key or not api_url:
                 return False
 
@@ -147,12 +169,12 @@ class EternalAIConnection(BaseConnection):
     def get_on_chain_system_prompt_content(on_chain_data: str) -> str:
         if IPFS in on_chain_data:
             light_house = on_chain_data.replace(IPFS, LIGHTHOUSE_IPFS)
-            response = requests.get(light_house)
+            response = http_session().get(light_house)
             if response.status_code == 200:
                 return response.text
             else:
                 gcs = on_chain_data.replace(IPFS, GCS_ETERNAL_AI_BASE_URL)
-                response = requests.get(gcs)
+                response = http_session().get(gcs)
                 if response.status_code == 200:
                     return response.text
                 else:
@@ -163,6 +185,72 @@ class EternalAIConnection(BaseConnection):
             else:
                 raise Exception(f"invalid on-chain system prompt")
 
+    def _resolve_chain_id(self, chain_id: str = None) -> str:
+        chain_id = chain_id or self.config["chain_id"]
+        if not chain_id or chain_id == "":
+            chain_id = "45762"
+        logger.info(f"chain_id {chain_id}")
+        return chain_id
+
+    def _resolve_system_prompt(self, system_prompt: str) -> str:
+        """
+        Replace the system prompt with the agent's on-chain prompt when one is configured
+
+        The resolved prompt is cached per (chain_id, contract, agent_id) for
+        system_prompt_ttl seconds. After that the contract is read again, and the
+        prompt body is only re-downloaded if the on-chain pointer changed.
+        """
+        agent_id = self.config.get("agent_id") or None
+        contract_address = self.config.get("contract_address") or None
+        rpc = self.config.get("rpc_url") or None
+        if not (agent_id and contract_address and rpc):
+            return system_prompt
+
+        key = (str(self.config.get("chain_id") or "45762"), contract_address.lower(), int(agent_id))
+        with _onchain_registry_lock:
+            lock = _onchain_locks.setdefault(key, threading.Lock())
+
+        # One resolution per key at a time; concurrent callers wait for its result
+        with lock:
+            entry = _onchain_prompts.get(key)
+            now = time.monotonic()
+            if entry and now - entry[3] < self.system_prompt_ttl:
+                return entry[1]
+
+            web3 = shared_web3(rpc)
+            try:
+                block = None
+                if self.system_prompt_refresh_blocks:
+                    block = web3.eth.block_number
+                    if entry and entry[2] is not None and block - entry[2] < self.system_prompt_refresh_blocks:
+                        _onchain_prompts[key] = (entry[0], entry[1], entry[2], now)
+                        return entry[1]
+                logger.info(f"agent_id: {agent_id}, contract_address: {contract_address}")
+                contract = web3.eth.contract(address=contract_address, abi=AGENT_CONTRACT_ABI)
+                call = contract.functions.getAgentSystemPrompt(agent_id)
+                result = call.call(block_identifier=block) if block is not None else call.call()
+            except Exception as e:
+                if not entry:
+                    raise
+                logger.warning(f"On-chain system prompt check failed, using cached prompt: {e}")
+                return entry[1]
+
+            if len(result) == 0:
+                return system_prompt
+            pointer = result[0]
+            if entry and entry[0] == pointer:
+                # Unchanged on chain, no need to fetch the body again
+                _onchain_prompts[key] = (pointer, entry[1], block, now)
+                return entry[1]
+            try:
+                content = self.get_on_chain_system_prompt_content(pointer.decode("utf-8"))
+            except Exception as e:
+                logger.error(f"get on-chain system_prompt fail {e}")
+                return entry[1] if entry else system_prompt
+            logger.info(f"Resolved on-chain system prompt for agent {agent_id} ({len(content)} chars)")
+            _onchain_prompts[key] = (pointer, content, block, now)
+            return content
+
     def generate_text(self, prompt: str, system_prompt: str, model: str = None, chain_id: str = None, **kwargs) -> str:
         """Generate text using EternalAI models"""
         try:
@@ -170,29 +258,8 @@ class EternalAIConnection(BaseConnection):
             model = model or self.config["model"]
             logger.info(f"model {model}")
 
-            chain_id = chain_id or self.config["chain_id"]
-            if not chain_id or chain_id == "":
-                chain_id = "45762"
-            logger.info(f"chain_id {chain_id}")
-
-            agent_id = self.config["agent_id"] or None
-            contract_address = self.config["contract_address"] or None
-            rpc = self.config["rpc_url"] or None
-
-            if agent_id and contract_address and rpc:
-                logger.info(f"agent_id: {agent_id}, contract_address: {contract_address}")
-                # call on-chain system prompt
-                web3 = Web3(Web3.HTTPProvider(rpc))
-                logger.info(f"web3 connected to {rpc} {web3.is_connected()}")
-                contract = web3.eth.contract(address=contract_address, abi=AGENT_CONTRACT_ABI)
-                result = contract.functions.getAgentSystemPrompt(agent_id).call()
-                logger.info(f"on-chain system_prompt: {result}")
-                if len(result) > 0:
-                    try:
-                        system_prompt = self.get_on_chain_system_prompt_content(result[0].decode("utf-8"))
-                        logging.info(f"new system_prompt: {system_prompt}")
-                    except Exception as e:
-                        logger.error(f"get on-chain system_prompt fail {e}")
+            chain_id = self._resolve_chain_id(chain_id)
+            system_prompt = self._resolve_system_prompt(system_prompt)
 
             completion = client.chat.completions.create(
                 model=model,
@@ -215,6 +282,23 @@ class EternalAIConnection(BaseConnection):
         except Exception as e:
             raise EternalAIAPIError(f"Text generation failed: {e}")
 
+    def stream_text(self, prompt: str, system_prompt: str, model: str = None, chain_id: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from EternalAI models, yielding chunks as they arrive"""
+        try:
+            client = self._get_client()
+            stream = client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": self._resolve_system_prompt(system_prompt)},
+                    {"role": "user", "content": prompt},
+                ],
+                extra_body={"chain_id": self._resolve_chain_id(chain_id)},
+                stream=True,
+            )
+            yield from text_deltas(stream)
+        except Exception as e:
+            raise EternalAIAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
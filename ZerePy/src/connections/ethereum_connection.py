@@ -1,14 +1,17 @@
 import logging
 import os
 import time
-import requests
+from src.helpers.http import http_session
 from typing import Dict, Any, Optional, Union
-from dotenv import load_dotenv, set_key
+from dotenv import set_key
 from web3 import Web3
-from web3.middleware import geth_poa_middleware
-from src.constants.networks import EVM_NETWORKS
-from src.constants.abi import ERC20_ABI
+from src.constants.networks import EVM_NETWORKS, NATIVE_TOKEN
+from src.helpers.multicall import parse_addresses, read_portfolio
+from src.helpers.nonce import nonce_manager
+from src.helpers.token_registry import TokenRegistry, token_registry
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_store
+from src.connections.client_pool import shared_web3
 
 logger = logging.getLogger("connections.ethereum_connection")
 
@@ -20,7 +23,7 @@ class EthereumConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Ethereum connection...")
         self._web3 = None
-        self.NATIVE_TOKEN = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+        self.NATIVE_TOKEN = NATIVE_TOKEN
         
         # Get network configuration
         self.network = "ethereum"  # Default to ethereum mainnet
@@ -46,8 +49,7 @@ class EthereumConnection(BaseConnection):
         if not self._web3:
             for attempt in range(3):
                 try:
-                    self._web3 = Web3(Web3.HTTPProvider(self.rpc_url))
-                    self._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+                    self._web3 = shared_web3(self.rpc_url, poa=True)
                     
                     if not self._web3.is_connected():
                         raise EthereumConnectionError("Failed to connect to Ethereum network")
@@ -65,6 +67,11 @@ class EthereumConnection(BaseConnection):
                     logger.warning(f"Web3 initialization attempt {attempt + 1} failed: {str(e)}")
                     time.sleep(1)
 
+    @property
+    def tokens(self) -> TokenRegistry:
+        """Token metadata and contracts for this chain (see src/helpers/token_registry.py)"""
+        return token_registry(self._web3, self.chain_id)
+
     @property
     def is_llm_provider(self) -> bool:
         return False
@@ -93,6 +100,14 @@ class EthereumConnection(BaseConnection):
                 ],
                 description="Get ETH or token balance"
             ),
+            "get-portfolio": Action(
+                name="get-portfolio",
+                parameters=[
+                    ActionParameter("addresses", False, str, "Comma-separated addresses (optional, own wallet if not provided)"),
+                    ActionParameter("tokens", False, str, "Comma-separated token addresses (optional, all known tokens if not provided)")
+                ],
+                description="Get ETH and token balances for one or more addresses in a single batched read"
+            ),
             "transfer": Action(
                 name="transfer", 
                 parameters=[
@@ -165,10 +180,9 @@ class EthereumConnection(BaseConnection):
     def is_configured(self, verbose: bool = False) -> bool:
         """Check if Ethereum connection is properly configured"""
         try:
-            load_dotenv()
             
             # Check private key exists
-            private_key = os.getenv('ETH_PRIVATE_KEY')
+            private_key = credential_store.get('ETH_PRIVATE_KEY')
             if not private_key:
                 if verbose:
                     logger.error("Missing ETH_PRIVATE_KEY in .env")
@@ -181,7 +195,7 @@ class EthereumConnection(BaseConnection):
                 return False
                 
             # Test account access
-            account = self._web3.eth.account.from_key(private_key)
+            account = credential_store.evm_account('ETH_PRIVATE_KEY')
             balance = self._web3.eth.get_balance(account.address)
                 
             return True
@@ -191,10 +205,21 @@ class EthereumConnection(BaseConnection):
                 logger.error(f"Configuration check failed: {str(e)}")
             return False
 
+    def _get_account(self):
+        """Get the configured wallet account"""
+        account = credential_store.evm_account('ETH_PRIVATE_KEY')
+        if not account:
+            raise EthereumConnectionError("No wallet private key configured in .env")
+        return account
+
+    def _send_transaction(self, account, tx: Dict[str, Any]):
+        """Sign and broadcast a transaction with a locally allocated nonce (see src/helpers/nonce.py)"""
+        nonces = nonce_manager(self._web3, self.chain_id, account.address)
+        return nonces.send(lambda nonce: account.sign_transaction({**tx, 'nonce': nonce}))
+
     def get_address(self) -> str:
         try:
-            private_key = os.getenv('ETH_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             return f"Your Ethereum address: {account.address}"
         except Exception as e:
             return f"Failed to get address: {str(e)}"
@@ -202,7 +227,7 @@ class EthereumConnection(BaseConnection):
     def _get_token_address(self, ticker: str) -> Optional[str]:
         """Helper function to get token address from DEXScreener"""
         try:
-            response = requests.get(
+            response = http_session().get(
                 f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
             )
             response.raise_for_status()
@@ -252,15 +277,10 @@ class EthereumConnection(BaseConnection):
         """Helper function to get raw balance value"""
         if token_address and token_address.lower() != self.NATIVE_TOKEN.lower():
             # Get ERC20 token balance
-            contract = self._web3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
-                abi=ERC20_ABI
-            )
-            balance = contract.functions.balanceOf(
+            balance = self.tokens.contract(token_address).functions.balanceOf(
                 Web3.to_checksum_address(address)
             ).call()
-            decimals = contract.functions.decimals().call()
-            return balanqce / (10 ** decimals)
+            return self.tokens.from_raw(token_address, balance)
         else:
             # Get native ETH balance
             balance = self._web3.eth.get_balance(Web3.to_checksum_address(address))
@@ -279,36 +299,24 @@ class EthereumConnection(BaseConnection):
         """
         try:
             # Get wallet address from private key
-            private_key = os.getenv('ETH_PRIVATE_KEY')
-            if not private_key:
+            account = credential_store.evm_account('ETH_PRIVATE_KEY')
+            if not account:
                 return "No wallet private key configured in .env"
             
-            account = self._web3.eth.account.from_key(private_key)
-            
             # If no token address provided, use native token (ETH)
             if token_address is None:
                 # Get native token (ETH) balance
                 raw_balance = self._web3.eth.get_balance(account.address)
                 return self._web3.from_wei(raw_balance, 'ether')
             
-            # Get token contract
-            token_contract = self._web3.eth.contract(
-                address=Web3.to_checksum_address(token_address), 
-                abi=ERC20_ABI 
-            )
-            
-            # Get token info
-            symbol = token_contract.functions.symbol().call()
-            decimals = token_contract.functions.decimals().call()
-            
-            # Get balance
-            raw_balance = token_contract.functions.balanceOf(account.address).call()
-            token_balance = raw_balance / (10 ** decimals)
+            # Get balance; decimals come from the token registry
+            raw_balance = self.tokens.contract(token_address).functions.balanceOf(account.address).call()
+            token_balance = self.tokens.from_raw(token_address, raw_balance)
             
             # Try to get ETH value using Kyberswap price API
             try:
                 kyber_url = f"{self.aggregator_api}/tokens/rates"
-                response = requests.get(kyber_url, params={
+                response = http_session().get(kyber_url, params={
                     "tokenIn": token_address, 
                     "tokenOut": self.NATIVE_TOKEN, 
                     "amount": str(raw_balance) 
@@ -328,6 +336,16 @@ class EthereumConnection(BaseConnection):
         except Exception as e:
             return False
 
+    def get_portfolio(self, addresses: Optional[str] = None, tokens: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Native and token balances per address, read through Multicall3 in one or two round trips"""
+        try:
+            owners = parse_addresses(addresses) or [self._get_account().address]
+            token_list = parse_addresses(tokens) if tokens else None
+            return read_portfolio(self._web3, self.tokens, owners, token_list)
+        except Exception as e:
+            logger.error(f"Failed to get portfolio: {e}")
+            raise
+
     def _prepare_transfer_tx(
         self, 
         to_address: str,
@@ -336,35 +354,27 @@ class EthereumConnection(BaseConnection):
     ) -> Dict[str, Any]:
         """Prepare transfer transaction with proper gas estimation"""
         try:
-            private_key = os.getenv('ETH_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             
-            # Get latest nonce and gas price
-            nonce = self._web3.eth.get_transaction_count(account.address)
+            # Get gas price; the nonce is allocated when the transaction is sent
             gas_price = self._web3.eth.gas_price
             
             if token_address and token_address.lower() != self.NATIVE_TOKEN.lower():
                 # Prepare ERC20 transfer
-                contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_address),
-                    abi=ERC20_ABI
-                )
-                decimals = contract.functions.decimals().call()
-                amount_raw = int(amount * (10 ** decimals))
+                contract = self.tokens.contract(token_address)
+                amount_raw = self.tokens.to_raw(token_address, amount)
                 
                 tx = contract.functions.transfer(
                     Web3.to_checksum_address(to_address),
                     amount_raw
                 ).build_transaction({
                     'from': account.address,
-                    'nonce': nonce,
                     'gasPrice': gas_price,
                     'chainId': self.chain_id
                 })
             else:
                 # Prepare native ETH transfer
                 tx = {
-                    'nonce': nonce,
                     'to': Web3.to_checksum_address(to_address),
                     'value': self._web3.to_wei(amount, 'ether'),
                     'gas': 21000,  # Standard ETH transfer gas
@@ -395,11 +405,9 @@ class EthereumConnection(BaseConnection):
 
             # Prepare and send transaction
             tx = self._prepare_transfer_tx(to_address, amount, token_address)
-            private_key = os.getenv('ETH_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             
-            signed = account.sign_transaction(tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed.rawTransaction)
+            tx_hash = self._send_transaction(account, tx)
             
             # Return explorer link
             tx_url = self._get_explorer_link(tx_hash.hex())
@@ -421,15 +429,7 @@ class EthereumConnection(BaseConnection):
             url = f"{self.aggregator_api}/routes"
             
             # Convert amount to raw value with proper decimals
-            if token_in.lower() == self.NATIVE_TOKEN.lower():
-                amount_raw = self._web3.to_wei(amount, 'ether')
-            else:
-                token_contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_in),
-                    abi=ERC20_ABI
-                )
-                decimals = token_contract.functions.decimals().call()
-                amount_raw = int(amount * (10 ** decimals))
+            amount_raw = self.tokens.to_raw(token_in, amount)
             
             # Prepare API request
             headers = {"x-client-id": "zerepy"}
@@ -441,7 +441,7 @@ class EthereumConnection(BaseConnection):
                 "gasInclude": "true"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = http_session().get(url, headers=headers, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -464,8 +464,7 @@ class EthereumConnection(BaseConnection):
     ) -> Dict[str, Any]:
         """Build swap transaction using route data"""
         try:
-            private_key = os.getenv('ETH_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             
             url = f"{self.aggregator_api}/route/build"
             headers = {"x-client-id": "zerepy"}
@@ -479,7 +478,7 @@ class EthereumConnection(BaseConnection):
                 "source": "zerepy"
             }
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = http_session().post(url, headers=headers, json=payload)
             response.raise_for_status()
             
             data = response.json()
@@ -492,7 +491,6 @@ class EthereumConnection(BaseConnection):
                 'to': Web3.to_checksum_address(route_data["routerAddress"]),
                 'data': data["data"]["data"],
                 'value': self._web3.to_wei(amount, 'ether') if token_in.lower() == self.NATIVE_TOKEN.lower() else 0,
-                'nonce': self._web3.eth.get_transaction_count(account.address),
                 'gasPrice': self._web3.eth.gas_price,
                 'chainId': self.chain_id
             }
@@ -511,64 +509,58 @@ class EthereumConnection(BaseConnection):
             logger.error(f"Failed to build swap transaction: {str(e)}")
             raise
 
-        def _handle_token_approval(
-            self,
-            token_address: str,
-            spender_address: str,
-            amount: int
-        ) -> Optional[str]:
-            """Handle token approval for spender, returns tx hash if approval needed"""
-            try:
-                private_key = os.getenv('ETH_PRIVATE_KEY')
-                account = self._web3.eth.account.from_key(private_key)
+    def _handle_token_approval(
+        self,
+        token_address: str,
+        spender_address: str,
+        amount: int
+    ) -> Optional[str]:
+        """Handle token approval for spender, returns tx hash if approval needed"""
+        try:
+            account = self._get_account()
+            
+            token_contract = self.tokens.contract(token_address)
+            
+            # Check current allowance
+            current_allowance = token_contract.functions.allowance(
+                account.address,
+                spender_address
+            ).call()
+            
+            if current_allowance < amount:
+                # Prepare approval transaction
+                approve_tx = token_contract.functions.approve(
+                    spender_address,
+                    amount
+                ).build_transaction({
+                    'from': account.address,
+                    'gasPrice': self._web3.eth.gas_price,
+                    'chainId': self.chain_id
+                })
                 
-                token_contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_address),
-                    abi=ERC20_ABI
-                )
+                # Estimate gas for approval
+                try:
+                    gas_estimate = self._web3.eth.estimate_gas(approve_tx)
+                    approve_tx['gas'] = int(gas_estimate * 1.1)  # Add 10% buffer
+                except Exception as e:
+                    logger.warning(f"Approval gas estimation failed: {e}, using default")
+                    approve_tx['gas'] = 100000  # Default gas for approvals
                 
-                # Check current allowance
-                current_allowance = token_contract.functions.allowance(
-                    account.address,
-                    spender_address
-                ).call()
+                # Sign and send approval transaction
+                tx_hash = self._send_transaction(account, approve_tx)
                 
-                if current_allowance < amount:
-                    # Prepare approval transaction
-                    approve_tx = token_contract.functions.approve(
-                        spender_address,
-                        amount
-                    ).build_transaction({
-                        'from': account.address,
-                        'nonce': self._web3.eth.get_transaction_count(account.address),
-                        'gasPrice': self._web3.eth.gas_price,
-                        'chainId': self.chain_id
-                    })
-                    
-                    # Estimate gas for approval
-                    try:
-                        gas_estimate = self._web3.eth.estimate_gas(approve_tx)
-                        approve_tx['gas'] = int(gas_estimate * 1.1)  # Add 10% buffer
-                    except Exception as e:
-                        logger.warning(f"Approval gas estimation failed: {e}, using default")
-                        approve_tx['gas'] = 100000  # Default gas for approvals
-                    
-                    # Sign and send approval transaction
-                    signed_approve = account.sign_transaction(approve_tx)
-                    tx_hash = self._web3.eth.send_raw_transaction(signed_approve.rawTransaction)
-                    
-                    # Wait for approval to be mined
-                    receipt = self._web3.eth.wait_for_transaction_receipt(tx_hash)
-                    if receipt['status'] != 1:
-                        raise ValueError("Token approval failed")
-                    
-                    return tx_hash.hex()
-                    
-                return None
+                # Wait for approval to be mined
+                receipt = self._web3.eth.wait_for_transaction_receipt(tx_hash)
+                if receipt['status'] != 1:
+                    raise ValueError("Token approval failed")
+                
+                return tx_hash.hex()
+                
+            return None
 
-            except Exception as e:
-                logger.error(f"Token approval failed: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Token approval failed: {str(e)}")
+            raise
 
     def swap(
         self,
@@ -579,8 +571,7 @@ class EthereumConnection(BaseConnection):
     ) -> str:
         """Execute token swap using Kyberswap aggregator"""
         try:
-            private_key = os.getenv('ETH_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
 
             # Validate balance
             current_balance = self.get_balance(
@@ -601,15 +592,7 @@ class EthereumConnection(BaseConnection):
             if token_in.lower() != self.NATIVE_TOKEN.lower():
                 router_address = route_data["routerAddress"]
                 
-                if token_in.lower() == "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2".lower():  # WETH
-                    amount_raw = self._web3.to_wei(amount, 'ether')
-                else:
-                    token_contract = self._web3.eth.contract(
-                        address=Web3.to_checksum_address(token_in),
-                        abi=ERC20_ABI
-                    )
-                    decimals = token_contract.functions.decimals().call()
-                    amount_raw = int(amount * (10 ** decimals))
+                amount_raw = self.tokens.to_raw(token_in, amount)
                     
                 approval_hash = self._handle_token_approval(token_in, router_address, amount_raw)
                 if approval_hash:
@@ -617,8 +600,7 @@ class EthereumConnection(BaseConnection):
             
             # Build and send swap transaction
             swap_tx = self._build_swap_tx(token_in, token_out, amount, slippage, route_data)
-            signed_tx = account.sign_transaction(swap_tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            tx_hash = self._send_transaction(account, swap_tx)
 
             tx_url = self._get_explorer_link(tx_hash.hex())
             
@@ -633,9 +615,8 @@ class EthereumConnection(BaseConnection):
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
 
-        load_dotenv()
         
-        if not self.is_configured(verbose=True):
+        if not self.is_configured_cached(verbose=True):
             raise EthereumConnectionError("Ethereum connection is not properly configured")
 
         action = self.actions[action_name]
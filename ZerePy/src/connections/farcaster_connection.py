@@ -1,10 +1,11 @@
 import os
 import logging
 from typing import Dict, Any, List, Optional
-from dotenv import set_key, load_dotenv
+from dotenv import set_key
 from farcaster import Warpcast
 from farcaster.models import CastContent, CastHash, IterableCastsResult, Parent, ReactionsPutResult
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_store
 
 logger = logging.getLogger("connections.farcaster_connection")
 
@@ -112,7 +113,6 @@ class FarcasterConnection(BaseConnection):
     def _get_credentials(self) -> Dict[str, str]:
         """Get Farcaster credentials from environment with validation"""
         logger.debug("Retrieving Farcaster credentials")
-        load_dotenv()
 
         required_vars = {
             'FARCASTER_MNEMONIC': 'recovery phrase',
@@ -122,7 +122,7 @@ class FarcasterConnection(BaseConnection):
         missing = []
 
         for env_var, description in required_vars.items():
-            value = os.getenv(env_var)
+            value = credential_store.get(env_var)
             if not value:
                 missing.append(description)
             credentials[env_var] = value
@@ -1,11 +1,13 @@
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 
-import requests
-from dotenv import load_dotenv, set_key
-from openai import OpenAI
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.http import http_session
+from dotenv import set_key
+from openai import AsyncOpenAI, OpenAI
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, text_deltas
+from src.helpers.credentials import credential_store
+from src.connections.client_pool import shared_async_client, shared_client
 
 logger = logging.getLogger("connections.galadriel_connection")
 
@@ -58,21 +60,48 @@ class GaladrielConnection(BaseConnection):
                 ],
                 description="Generate text using Galadriel models"
             ),
+            "stream-text": Action(
+                name="stream-text",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream text from Galadriel models as it is generated"
+            ),
         }
 
     def _get_client(self) -> OpenAI:
         """Get or create Galadriel client"""
         if not self._client:
-            api_key = os.getenv("GALADRIEL_API_KEY")
+            api_key = credential_store.get("GALADRIEL_API_KEY")
             if not api_key:
                 raise GaladrielConfigurationError("Galadriel API key not found in environment")
 
             headers = {}
-            if fine_tune_api_key := os.getenv("GALADRIEL_FINE_TUNE_API_KEY"):
+            if fine_tune_api_key := credential_store.get("GALADRIEL_FINE_TUNE_API_KEY"):
                 headers["Fine-Tune-Authorization"] = f"Bearer {fine_tune_api_key}"
-            self._client = OpenAI(api_key=api_key, base_url=API_BASE_URL, default_headers=headers)
+            self._client = shared_client(
+                "openai",
+                (api_key, API_BASE_URL, tuple(sorted(headers.items()))),
+                lambda: OpenAI(api_key=api_key, base_url=API_BASE_URL, default_headers=headers)
+            )
         return self._client
 
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get the async client for the running event loop"""
+        api_key = credential_store.get("GALADRIEL_API_KEY")
+        if not api_key:
+            raise GaladrielConfigurationError("Galadriel API key not found in environment")
+        headers = {}
+        if fine_tune_api_key := credential_store.get("GALADRIEL_FINE_TUNE_API_KEY"):
+            headers["Fine-Tune-Authorization"] = f"Bearer {fine_tune_api_key}"
+        return shared_async_client(
+            "openai",
+            (api_key, API_BASE_URL, tuple(sorted(headers.items()))),
+            lambda: AsyncOpenAI(api_key=api_key, base_url=API_BASE_URL, default_headers=headers)
+        )
+
     def configure(self) -> bool:
         """Sets up Galadriel API authentication"""
         logger.info("\n🤖 GALADRIEL API SETUP")
@@ -115,8 +144,7 @@ class GaladrielConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if Galadriel API key is configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('GALADRIEL_API_KEY')
+            api_key = credential_store.get('GALADRIEL_API_KEY')
             if not api_key:
                 return False
 
@@ -127,7 +155,7 @@ class GaladrielConnection(BaseConnection):
             return False
 
     def _is_api_key_valid(self, api_key):
-        response = requests.get(
+        response = http_session().get(
             f"{API_BASE_URL}/chat/completions",
             headers={
                 "Authorization": f"Bearer {api_key}"
@@ -158,6 +186,37 @@ class GaladrielConnection(BaseConnection):
         except Exception as e:
             raise GaladrielAPIError(f"Text generation failed: {e}")
 
+    async def agenerate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
+        """generate_text for async callers, awaited on their event loop"""
+        try:
+            client = self._get_async_client()
+            completion = await client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+            )
+            return completion.choices[0].message.content
+        except Exception as e:
+            raise GaladrielAPIError(f"Text generation failed: {e}")
+
+    def stream_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from Galadriel models, yielding chunks as they arrive"""
+        try:
+            client = self._get_client()
+            stream = client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            yield from text_deltas(stream)
+        except Exception as e:
+            raise GaladrielAPIError(f"Text streaming failed: {e}")
+
     def perform_action(self, action_name: str, kwargs) -> Any:
         """Execute an action with validation"""
         if action_name not in self.actions:
@@ -6,8 +6,9 @@ from dataclasses import is_dataclass
 from eth_account import Account
 from pydantic import BaseModel
 from web3 import Web3
-from dotenv import set_key, load_dotenv
+from dotenv import set_key
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_store
 from src.helpers import print_h_bar
 from src.action_handler import register_action
 from goat.classes.plugin_base import PluginBase
@@ -278,9 +279,8 @@ class GoatConnection(BaseConnection):
     def _create_wallet(self) -> bool:
         """Create wallet from environment variables"""
         try:
-            load_dotenv()
-            rpc_url = os.getenv("GOAT_RPC_PROVIDER_URL")
-            private_key = os.getenv("GOAT_WALLET_PRIVATE_KEY")
+            rpc_url = credential_store.get("GOAT_RPC_PROVIDER_URL")
+            private_key = credential_store.get("GOAT_WALLET_PRIVATE_KEY")
 
             if not rpc_url or not private_key:
                 return False
@@ -293,7 +293,7 @@ class GoatConnection(BaseConnection):
 
             # Test private key by creating account
             try:
-                account = Account.from_key(private_key)
+                account = credential_store.evm_account("GOAT_WALLET_PRIVATE_KEY")
                 w3.eth.default_account = account.address
                 self._wallet_client = Web3EVMWalletClient(w3)
                 # Register actions now that we have a wallet
@@ -1,9 +1,11 @@
 import logging
 import os
-from typing import Dict, Any
-from dotenv import load_dotenv, set_key
-from openai import OpenAI
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from typing import Dict, Any, Iterator
+from dotenv import set_key
+from openai import AsyncOpenAI, OpenAI
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, text_deltas
+from src.helpers.credentials import credential_store
+from src.connections.client_pool import shared_async_client, shared_client
 
 logger = logging.getLogger("connections.groq_connection")
 
@@ -54,6 +56,15 @@ class GroqConnection(BaseConnection):
                 ],
                 description="Generate text using Groq models"
             ),
+            "stream-text": Action(
+                name="stream-text",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream text from Groq models as it is generated"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -71,15 +82,27 @@ class GroqConnection(BaseConnection):
     def _get_client(self) -> OpenAI:
         """Get or create Groq client"""
         if not self._client:
-            api_key = os.getenv("GROQ_API_KEY")
+            api_key = credential_store.get("GROQ_API_KEY")
             if not api_key:
                 raise GroqConfigurationError("Groq API key not found in environment")
-            self._client = OpenAI(
-                api_key=api_key,
-                base_url="https://api.groq.com/openai/v1"
+            self._client = shared_client(
+                "openai",
+                (api_key, "https://api.groq.com/openai/v1"),
+                lambda: OpenAI(api_key=api_key, base_url="https://api.groq.com/openai/v1")
             )
         return self._client
 
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get the async client for the running event loop"""
+        api_key = credential_store.get("GROQ_API_KEY")
+        if not api_key:
+            raise GroqConfigurationError("Groq API key not found in environment")
+        return shared_async_client(
+            "openai",
+            (api_key, "https://api.groq.com/openai/v1"),
+            lambda: AsyncOpenAI(api_key=api_key, base_url="https://api.groq.com/openai/v1")
+        )
+
     def configure(self) -> bool:
         """Sets up Groq API authentication"""
         logger.info("\n🤖 GROQ API SETUP")
@@ -120,8 +143,7 @@ class GroqConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if Groq API key is configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('GROQ_API_KEY')
+            api_key = credential_store.get('GROQ_API_KEY')
             if not api_key:
                 return False
 
@@ -160,6 +182,37 @@ class GroqConnection(BaseConnection):
         except Exception as e:
             raise GroqAPIError(f"Text generation failed: {e}")
 
+    async def agenerate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
+        """generate_text for async callers, awaited on their event loop"""
+        try:
+            client = self._get_async_client()
+            completion = await client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+            )
+            return completion.choices[0].message.content
+        except Exception as e:
+            raise GroqAPIError(f"Text generation failed: {e}")
+
+    def stream_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from Groq models, yielding chunks as they arrive"""
+        try:
+            client = self._get_client()
+            stream = client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            yield from text_deltas(stream)
+        except Exception as e:
+            raise GroqAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
@@ -196,10 +249,7 @@ class GroqConnection(BaseConnection):
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
 
-        # Explicitly reload environment variables
-        load_dotenv()
-        
-        if not self.is_configured(verbose=True):
+        if not self.is_configured_cached(verbose=True):
             raise GroqConfigurationError("Groq is not properly configured")
 
         action = self.actions[action_name]
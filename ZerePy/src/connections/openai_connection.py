@@ -1,9 +1,11 @@
 import logging
 import os
-from typing import Dict, Any
-from dotenv import load_dotenv, set_key
-from openai import OpenAI
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from typing import Dict, Any, Iterator
+from dotenv import set_key
+from openai import AsyncOpenAI, OpenAI
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, text_deltas
+from src.helpers.credentials import credential_store
+from src.connections.client_pool import shared_async_client, shared_client
 
 logger = logging.getLogger("connections.openai_connection")
 
@@ -54,6 +56,15 @@ class OpenAIConnection(BaseConnection):
                 ],
                 description="Generate text using OpenAI models"
             ),
+            "stream-text": Action(
+                name="stream-text",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream text from OpenAI models as it is generated"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -71,12 +82,19 @@ class OpenAIConnection(BaseConnection):
     def _get_client(self) -> OpenAI:
         """Get or create OpenAI client"""
         if not self._client:
-            api_key = os.getenv("OPENAI_API_KEY")
+            api_key = credential_store.get("OPENAI_API_KEY")
             if not api_key:
                 raise OpenAIConfigurationError("OpenAI API key not found in environment")
-            self._client = OpenAI(api_key=api_key)
+            self._client = shared_client("openai", (api_key, None), lambda: OpenAI(api_key=api_key))
         return self._client
 
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get the async client for the running event loop"""
+        api_key = credential_store.get("OPENAI_API_KEY")
+        if not api_key:
+            raise OpenAIConfigurationError("OpenAI API key not found in environment")
+        return shared_async_client("openai", (api_key, None), lambda: AsyncOpenAI(api_key=api_key))
+
     def configure(self) -> bool:
         """Sets up OpenAI API authentication"""
         logger.info("\n🤖 OPENAI API SETUP")
@@ -116,8 +134,7 @@ class OpenAIConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if OpenAI API key is configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('OPENAI_API_KEY')
+            api_key = credential_store.get('OPENAI_API_KEY')
             if not api_key:
                 return False
 
@@ -152,6 +169,37 @@ class OpenAIConnection(BaseConnection):
         except Exception as e:
             raise OpenAIAPIError(f"Text generation failed: {e}")
 
+    async def agenerate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
+        """generate_text for async callers, awaited on their event loop"""
+        try:
+            client = self._get_async_client()
+            completion = await client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+            )
+            return completion.choices[0].message.content
+        except Exception as e:
+            raise OpenAIAPIError(f"Text generation failed: {e}")
+
+    def stream_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from OpenAI models, yielding chunks as they arrive"""
+        try:
+            client = self._get_client()
+            stream = client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            yield from text_deltas(stream)
+        except Exception as e:
+            raise OpenAIAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model, **kwargs):
         try:
             client = self._get_client()
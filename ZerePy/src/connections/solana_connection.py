@@ -5,6 +5,7 @@ import asyncio
 from typing import Dict, Any, Optional
 
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_store
 from src.types import JupiterTokenData
 from src.constants import LAMPORTS_PER_SOL, SPL_TOKENS
 from src.helpers.solana.pumpfun import PumpfunTokenManager
@@ -18,7 +19,7 @@ from src.helpers.solana.transfer import SolanaTransferHelper
 from src.helpers.solana.read import SolanaReadHelper
 
 
-from dotenv import load_dotenv, set_key
+from dotenv import set_key
 
 from jupiter_python_sdk.jupiter import Jupiter
 
@@ -57,19 +58,18 @@ class SolanaConnection(BaseConnection):
         return conn
 
     def _get_wallet(self):
-        creds = self._get_credentials()
-        return Keypair.from_base58_string(creds["SOLANA_PRIVATE_KEY"])
+        self._get_credentials()
+        return credential_store.solana_keypair("SOLANA_PRIVATE_KEY")
 
     def _get_credentials(self) -> Dict[str, str]:
         """Get Solana credentials from environment with validation"""
         logger.debug("Retrieving Solana Credentials")
-        load_dotenv()
         required_vars = {"SOLANA_PRIVATE_KEY": "solana wallet private key"}
         credentials = {}
         missing = []
 
         for env_var, description in required_vars.items():
-            value = os.getenv(env_var)
+            value = credential_store.get(env_var)
             if not value:
                 missing.append(description)
             credentials[env_var] = value
@@ -78,7 +78,7 @@ class SolanaConnection(BaseConnection):
             error_msg = f"Missing Solana credentials: {', '.join(missing)}"
             raise SolanaConfigurationError(error_msg)
 
-        Keypair.from_base58_string(credentials["SOLANA_PRIVATE_KEY"])
+        credential_store.solana_keypair("SOLANA_PRIVATE_KEY")
         logger.debug("All required credentials found")
         return credentials
 
@@ -244,7 +244,7 @@ class SolanaConnection(BaseConnection):
                     f.write("")
 
             set_key(".env", "SOLANA_PRIVATE_KEY", private_key)
-            load_dotenv(override=True)
+            credential_store.reload()
 
             logger.info("\n✅ Solana configuration successfully saved!")
             logger.info("Your private key has been stored in the .env file.")
@@ -258,15 +258,14 @@ class SolanaConnection(BaseConnection):
         """Check if Solana credentials are configured and valid"""
         try:
             # First check if credentials exist and key is valid
-            load_dotenv(override=True)
-            private_key = os.getenv("SOLANA_PRIVATE_KEY")
+            private_key = credential_store.get("SOLANA_PRIVATE_KEY")
             if not private_key:
                 if verbose:
                     logger.debug("Solana private key not found in environment")
                 return False
 
             # Validate the key format
-            Keypair.from_base58_string(private_key)
+            credential_store.solana_keypair("SOLANA_PRIVATE_KEY")
 
             # We successfully validated the private key exists and is in correct format
             if verbose:
@@ -283,22 +282,26 @@ class SolanaConnection(BaseConnection):
                 logger.debug(f"Solana Configuration validation failed: {error_msg}")
             return False
 
-    def transfer(
+    async def atransfer(
         self, to_address: str, amount: float, token_mint: Optional[str] = None
     ) -> str:
-        res = SolanaTransferHelper.transfer(
+        res = await SolanaTransferHelper.transfer(
             self._get_connection_async(),
             self._get_wallet(),
             to_address,
             amount,
             token_mint,
         )
-        res = asyncio.run(res)
         logger.debug(f"Transferred {amount} to {to_address}\nTransaction ID: {res}")
         return res
 
+    def transfer(
+        self, to_address: str, amount: float, token_mint: Optional[str] = None
+    ) -> str:
+        return asyncio.run(self.atransfer(to_address, amount, token_mint))
+
     # todo: test on mainnet
-    def trade(
+    async def atrade(
         self,
         output_mint: str,
         input_amount: float,
@@ -309,7 +312,7 @@ class SolanaConnection(BaseConnection):
         wallet = self._get_wallet()
         async_client = self._get_connection_async()
         jupiter = self._get_jupiter(wallet, async_client)
-        res = TradeManager.trade(
+        return await TradeManager.trade(
             async_client,
             wallet,
             jupiter,
@@ -318,29 +321,39 @@ class SolanaConnection(BaseConnection):
             input_mint,
             slippage_bps,
         )
-        res = asyncio.run(res)
-        return res
 
-    def get_balance(self, token_address: str = None) -> float:
+    def trade(
+        self,
+        output_mint: str,
+        input_amount: float,
+        input_mint: Optional[str] = SPL_TOKENS["USDC"],
+        slippage_bps: int = 100,
+    ) -> str:
+        return asyncio.run(self.atrade(output_mint, input_amount, input_mint, slippage_bps))
+
+    async def aget_balance(self, token_address: str = None) -> float:
         if not token_address:
             logger.info("Getting SOL balance")
         else:
             logger.info(f"Getting balance for {token_address}")
-        res = SolanaReadHelper.get_balance(
+        return await SolanaReadHelper.get_balance(
             self._get_connection_async(), self._get_wallet(), token_address
         )
-        res = asyncio.run(res)
-        return res
 
-    def stake(self, amount: float) -> str:
+    def get_balance(self, token_address: str = None) -> float:
+        return asyncio.run(self.aget_balance(token_address))
+
+    async def astake(self, amount: float) -> str:
         logger.info(f"Staking {amount} SOL")
-        res = StakeManager.stake_with_jup(
+        res = await StakeManager.stake_with_jup(
             self._get_connection_async(), self._get_wallet(), amount
         )
-        res = asyncio.run(res)
         logger.debug(f"Staked {amount} SOL\nTransaction ID: {res}")
         return res
 
+    def stake(self, amount: float) -> str:
+        return asyncio.run(self.astake(amount))
+
     # todo: test on mainnet
     def lend_assets(self, amount: float) -> str:
         return "Not implemented"
@@ -352,13 +365,15 @@ class SolanaConnection(BaseConnection):
         # logger.debug(f"Lent {amount} USDC\nTransaction ID: {res}")
         # return res
 
-    def request_faucet(self) -> str:
+    async def arequest_faucet(self) -> str:
         logger.info("Requesting faucet funds")
-        res = FaucetManager.request_faucet_funds(self)
-        res = asyncio.run(res)
+        res = await FaucetManager.request_faucet_funds(self)
         logger.debug(f"Requested faucet funds\nTransaction ID: {res}")
         return res
 
+    def request_faucet(self) -> str:
+        return asyncio.run(self.arequest_faucet())
+
     def deploy_token(self, decimals: int = 9) -> str:
         return "Not implemented"
         # logger.info(f"STUB: Deploy token with {decimals} decimals")
@@ -375,10 +390,11 @@ class SolanaConnection(BaseConnection):
         return SolanaReadHelper.fetch_price(token_id)
 
     # todo: test on mainnet
+    async def aget_tps(self) -> int:
+        return await SolanaPerformanceTracker.fetch_current_tps(self._get_connection_async())
+
     def get_tps(self) -> int:
-        res = SolanaPerformanceTracker.fetch_current_tps(self._get_connection_async())
-        res = asyncio.run(res)
-        return res
+        return asyncio.run(self.aget_tps())
 
     def get_token_by_ticker(self, ticker: str) -> str:
         ticker = ticker.upper()
@@ -1,14 +1,18 @@
 import logging
 import os
-import requests
+from src.helpers.http import http_session
 import time
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv, set_key
+from dotenv import set_key
 from web3 import Web3
-from web3.middleware import geth_poa_middleware
 from src.constants.abi import ERC20_ABI
+from src.helpers.multicall import parse_addresses, read_portfolio
+from src.helpers.nonce import nonce_manager
+from src.helpers.token_registry import TokenRegistry, token_registry
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
-from src.constants.networks import SONIC_NETWORKS
+from src.helpers.credentials import credential_store
+from src.connections.client_pool import shared_web3
+from src.constants.networks import NATIVE_TOKEN, SONIC_NETWORKS
 
 logger = logging.getLogger("connections.sonic_connection")
 
@@ -30,11 +34,12 @@ class SonicConnection(BaseConnection):
         network_config = SONIC_NETWORKS[network]
         self.explorer = network_config["scanner_url"]
         self.rpc_url = network_config["rpc_url"]
+        self.chain_id = network_config.get("chain_id")
         
         super().__init__(config)
         self._initialize_web3()
         self.ERC20_ABI = ERC20_ABI
-        self.NATIVE_TOKEN = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+        self.NATIVE_TOKEN = NATIVE_TOKEN
         self.aggregator_api = "https://aggregator-api.kyberswap.com/sonic/api/v1"
 
         # Register actions
@@ -68,17 +73,21 @@ class SonicConnection(BaseConnection):
     def _initialize_web3(self):
         """Initialize Web3 connection"""
         if not self._web3:
-            self._web3 = Web3(Web3.HTTPProvider(self.rpc_url))
-            self._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+            self._web3 = shared_web3(self.rpc_url, poa=True)
             if not self._web3.is_connected():
                 raise SonicConnectionError("Failed to connect to Sonic network")
             
             try:
-                chain_id = self._web3.eth.chain_id
-                logger.info(f"Connected to network with chain ID: {chain_id}")
+                self.chain_id = self._web3.eth.chain_id
+                logger.info(f"Connected to network with chain ID: {self.chain_id}")
             except Exception as e:
                 logger.warning(f"Could not get chain ID: {e}")
 
+    @property
+    def tokens(self) -> TokenRegistry:
+        """Token metadata and contracts for this chain (see src/helpers/token_registry.py)"""
+        return token_registry(self._web3, self.chain_id)
+
     @property
     def is_llm_provider(self) -> bool:
         return False
@@ -101,7 +110,7 @@ class SonicConnection(BaseConnection):
             if ticker.lower() in ["s", "S"]:
                 return "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
                 
-            response = requests.get(
+            response = http_session().get(
                 f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
             )
             response.raise_for_status()
@@ -146,6 +155,14 @@ class SonicConnection(BaseConnection):
                 ],
                 description="Get $S or token balance"
             ),
+            "get-portfolio": Action(
+                name="get-portfolio",
+                parameters=[
+                    ActionParameter("addresses", False, str, "Comma-separated addresses (optional, own wallet if not provided)"),
+                    ActionParameter("tokens", False, str, "Comma-separated token addresses (optional, all known tokens if not provided)")
+                ],
+                description="Get $S and token balances for one or more addresses in a single batched read"
+            ),
             "transfer": Action(
                 name="transfer",
                 parameters=[
@@ -198,8 +215,7 @@ class SonicConnection(BaseConnection):
 
     def is_configured(self, verbose: bool = False) -> bool:
         try:
-            load_dotenv()
-            if not os.getenv('SONIC_PRIVATE_KEY'):
+            if not credential_store.get('SONIC_PRIVATE_KEY'):
                 if verbose:
                     logger.error("Missing SONIC_PRIVATE_KEY in .env")
                 return False
@@ -215,24 +231,27 @@ class SonicConnection(BaseConnection):
                 logger.error(f"Configuration check failed: {e}")
             return False
 
+    def _get_account(self):
+        """Get the configured wallet account"""
+        account = credential_store.evm_account('SONIC_PRIVATE_KEY')
+        if not account:
+            raise SonicConnectionError("No wallet configured")
+        return account
+
+    def _send_transaction(self, account, tx: Dict[str, Any]):
+        """Sign and broadcast a transaction with a locally allocated nonce (see src/helpers/nonce.py)"""
+        nonces = nonce_manager(self._web3, self.chain_id, account.address)
+        return nonces.send(lambda nonce: account.sign_transaction({**tx, 'nonce': nonce}))
+
     def get_balance(self, address: Optional[str] = None, token_address: Optional[str] = None) -> float:
         """Get balance for an address or the configured wallet"""
         try:
             if not address:
-                private_key = os.getenv('SONIC_PRIVATE_KEY')
-                if not private_key:
-                    raise SonicConnectionError("No wallet configured")
-                account = self._web3.eth.account.from_key(private_key)
-                address = account.address
+                address = self._get_account().address
 
             if token_address:
-                contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_address),
-                    abi=self.ERC20_ABI
-                )
-                balance = contract.functions.balanceOf(address).call()
-                decimals = contract.functions.decimals().call()
-                return balance / (10 ** decimals)
+                balance = self.tokens.contract(token_address).functions.balanceOf(address).call()
+                return self.tokens.from_raw(token_address, balance)
             else:
                 balance = self._web3.eth.get_balance(address)
                 return self._web3.from_wei(balance, 'ether')
@@ -241,33 +260,36 @@ class SonicConnection(BaseConnection):
             logger.error(f"Failed to get balance: {e}")
             raise
 
+    def get_portfolio(self, addresses: Optional[str] = None, tokens: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Native and token balances per address, read through Multicall3 in one or two round trips"""
+        try:
+            owners = parse_addresses(addresses) or [self._get_account().address]
+            token_list = parse_addresses(tokens) if tokens else None
+            return read_portfolio(self._web3, self.tokens, owners, token_list)
+        except Exception as e:
+            logger.error(f"Failed to get portfolio: {e}")
+            raise
+
     def transfer(self, to_address: str, amount: float, token_address: Optional[str] = None) -> str:
         """Transfer $S or tokens to an address"""
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             chain_id = self._web3.eth.chain_id
             
             if token_address:
-                contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_address),
-                    abi=self.ERC20_ABI
-                )
-                decimals = contract.functions.decimals().call()
-                amount_raw = int(amount * (10 ** decimals))
+                contract = self.tokens.contract(token_address)
+                amount_raw = self.tokens.to_raw(token_address, amount)
                 
                 tx = contract.functions.transfer(
                     Web3.to_checksum_address(to_address),
                     amount_raw
                 ).build_transaction({
                     'from': account.address,
-                    'nonce': self._web3.eth.get_transaction_count(account.address),
                     'gasPrice': self._web3.eth.gas_price,
                     'chainId': chain_id
                 })
             else:
                 tx = {
-                    'nonce': self._web3.eth.get_transaction_count(account.address),
                     'to': Web3.to_checksum_address(to_address),
                     'value': self._web3.to_wei(amount, 'ether'),
                     'gas': 21000,
@@ -275,8 +297,7 @@ class SonicConnection(BaseConnection):
                     'chainId': chain_id
                 }
 
-            signed = account.sign_transaction(tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed.rawTransaction)
+            tx_hash = self._send_transaction(account, tx)
 
             # Log and return explorer link immediately
             tx_link = self._get_explorer_link(tx_hash.hex())
@@ -292,15 +313,7 @@ class SonicConnection(BaseConnection):
             # Handle native token address
             
             # Convert amount to raw value
-            if token_in.lower() == self.NATIVE_TOKEN.lower():
-                amount_raw = self._web3.to_wei(amount_in, 'ether')
-            else:
-                token_contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_in),
-                    abi=self.ERC20_ABI
-                )
-                decimals = token_contract.functions.decimals().call()
-                amount_raw = int(amount_in * (10 ** decimals))
+            amount_raw = self.tokens.to_raw(token_in, amount_in)
             
             # Set up API request
             url = f"{self.aggregator_api}/routes"
@@ -312,7 +325,7 @@ class SonicConnection(BaseConnection):
                 "gasInclude": "true"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = http_session().get(url, headers=headers, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -328,8 +341,7 @@ class SonicConnection(BaseConnection):
     def _get_encoded_swap_data(self, route_summary: Dict, slippage: float = 0.5) -> str:
         """Get encoded swap data from Kyberswap API"""
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             
             url = f"{self.aggregator_api}/route/build"
             headers = {"x-client-id": "zerepy"}
@@ -343,7 +355,7 @@ class SonicConnection(BaseConnection):
                 "source": "ZerePyBot"
             }
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = http_session().post(url, headers=headers, json=payload)
             response.raise_for_status()
             
             data = response.json()
@@ -359,13 +371,9 @@ class SonicConnection(BaseConnection):
     def _handle_token_approval(self, token_address: str, spender_address: str, amount: int) -> None:
         """Handle token approval for spender"""
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             
-            token_contract = self._web3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
-                abi=self.ERC20_ABI
-            )
+            token_contract = self.tokens.contract(token_address)
             
             # Check current allowance
             current_allowance = token_contract.functions.allowance(
@@ -379,13 +387,11 @@ class SonicConnection(BaseConnection):
                     amount
                 ).build_transaction({
                     'from': account.address,
-                    'nonce': self._web3.eth.get_transaction_count(account.address),
                     'gasPrice': self._web3.eth.gas_price,
                     'chainId': self._web3.eth.chain_id
                 })
                 
-                signed_approve = account.sign_transaction(approve_tx)
-                tx_hash = self._web3.eth.send_raw_transaction(signed_approve.rawTransaction)
+                tx_hash = self._send_transaction(account, approve_tx)
                 logger.info(f"Approval transaction sent: {self._get_explorer_link(tx_hash.hex())}")
                 
                 # Wait for approval to be mined
@@ -398,8 +404,7 @@ class SonicConnection(BaseConnection):
     def swap(self, token_in: str, token_out: str, amount: float, slippage: float = 0.5) -> str:
         """Execute a token swap using the KyberSwap router"""
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
 
             # Check token balance before proceeding
             current_balance = self.get_balance(
@@ -421,15 +426,7 @@ class SonicConnection(BaseConnection):
             
             # Handle token approval if not using native token
             if token_in.lower() != self.NATIVE_TOKEN.lower():
-                if token_in.lower() == "0x039e2fb66102314ce7b64ce5ce3e5183bc94ad38".lower():  # $S token
-                    amount_raw = self._web3.to_wei(amount, 'ether')
-                else:
-                    token_contract = self._web3.eth.contract(
-                        address=Web3.to_checksum_address(token_in),
-                        abi=self.ERC20_ABI
-                    )
-                    decimals = token_contract.functions.decimals().call()
-                    amount_raw = int(amount * (10 ** decimals))
+                amount_raw = self.tokens.to_raw(token_in, amount)
                 self._handle_token_approval(token_in, router_address, amount_raw)
             
             # Prepare transaction
@@ -437,7 +434,6 @@ class SonicConnection(BaseConnection):
                 'from': account.address,
                 'to': Web3.to_checksum_address(router_address),
                 'data': encoded_data,
-                'nonce': self._web3.eth.get_transaction_count(account.address),
                 'gasPrice': self._web3.eth.gas_price,
                 'chainId': self._web3.eth.chain_id,
                 'value': self._web3.to_wei(amount, 'ether') if token_in.lower() == self.NATIVE_TOKEN.lower() else 0
@@ -451,8 +447,7 @@ class SonicConnection(BaseConnection):
                 tx['gas'] = 500000  # Default gas limit
             
             # Sign and send transaction
-            signed_tx = account.sign_transaction(tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            tx_hash = self._send_transaction(account, tx)
             
             # Log and return explorer link immediately
             tx_link = self._get_explorer_link(tx_hash.hex())
@@ -469,9 +464,8 @@ class SonicConnection(BaseConnection):
         if normalized_action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
 
-        load_dotenv()
         
-        if not self.is_configured(verbose=True):
+        if not self.is_configured_cached(verbose=True):
             raise SonicConnectionError("Sonic is not properly configured")
 
         action = self.actions[normalized_action_name]
@@ -1,11 +1,13 @@
 import logging
 import os
-from typing import Dict, Any
-from dotenv import load_dotenv, set_key
+from typing import Dict, Any, Iterator
+from dotenv import set_key
 from together import Together
 from together.types.models import ModelObject, ModelType
 
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, text_deltas
+from src.helpers.credentials import credential_store
+from src.connections.client_pool import shared_client
 
 logger = logging.getLogger("connections.together_ai_connection")
 
@@ -55,6 +57,15 @@ class TogetherAIConnection(BaseConnection):
                 ],
                 description="Generate text using Together AI models"
             ),
+            "stream-text": Action(
+                name="stream-text",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream text from Together AI models as it is generated"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -72,10 +83,10 @@ class TogetherAIConnection(BaseConnection):
     def _get_client(self) -> Together:
         """Get or create Together AI client"""
         if not self._client:
-            api_key = os.getenv("TOGETHER_API_KEY")
+            api_key = credential_store.get("TOGETHER_API_KEY")
             if not api_key:
                 raise TogetherAIConfigurationError("Together API key not found in environment")
-            self._client = Together(api_key=api_key)
+            self._client = shared_client("together", api_key, lambda: Together(api_key=api_key))
         return self._client
 
     def configure(self) -> bool:
@@ -116,8 +127,7 @@ class TogetherAIConnection(BaseConnection):
     def is_configured(self, verbose=False) -> bool:
         """Check if Together AI API key is configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('TOGETHER_API_KEY')
+            api_key = credential_store.get('TOGETHER_API_KEY')
             if not api_key:
                 return False
 
@@ -151,6 +161,22 @@ class TogetherAIConnection(BaseConnection):
         except Exception as e:
             raise TogetherAIAPIError(f"Text generation failed: {e}")
 
+    def stream_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from Together AI models, yielding chunks as they arrive"""
+        try:
+            client = self._get_client()
+            stream = client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "user", "content": prompt},
+                    {"role": "system", "content": system_prompt},
+                ],
+                stream=True,
+            )
+            yield from text_deltas(stream)
+        except Exception as e:
+            raise TogetherAIAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         try:
             client = self._get_client()
@@ -2,8 +2,9 @@ import os
 import logging
 from typing import Dict, Any, List, Tuple
 from requests_oauthlib import OAuth1Session
-from dotenv import set_key, load_dotenv
+from dotenv import set_key
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_store
 from src.helpers import print_h_bar
 
 logger = logging.getLogger("connections.twitter_connection")
@@ -160,7 +161,6 @@ class TwitterConnection(BaseConnection):
     def _get_credentials(self) -> Dict[str, str]:
         """Get Twitter credentials from environment with validation"""
         logger.debug("Retrieving Twitter credentials")
-        load_dotenv()
 
         required_vars = {
             'TWITTER_CONSUMER_KEY': 'consumer key',
@@ -174,7 +174,7 @@ class TwitterConnection(BaseConnection):
         missing = []
 
         for env_var, description in required_vars.items():
-            value = os.getenv(env_var)
+            value = credential_store.get(env_var)
             if not value:
                 missing.append(description)
             credentials[env_var] = value
@@ -1,9 +1,11 @@
 import logging
 import os
-from typing import Dict, Any
-from openai import OpenAI
-from dotenv import set_key, load_dotenv
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from typing import Dict, Any, Iterator
+from openai import AsyncOpenAI, OpenAI
+from dotenv import set_key
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, text_deltas
+from src.helpers.credentials import credential_store
+from src.connections.client_pool import shared_async_client, shared_client
 
 logger = logging.getLogger("connections.XAI_connection")
 
@@ -53,6 +55,15 @@ class XAIConnection(BaseConnection):
                 ],
                 description="Generate text using XAI models"
             ),
+            "stream-text": Action(
+                name="stream-text",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream text from XAI models as it is generated"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -70,15 +81,27 @@ class XAIConnection(BaseConnection):
     def _get_client(self) -> OpenAI:
         """Get or create XAI client using OpenAI's client with custom base URL"""
         if not self._client:
-            api_key = os.getenv("XAI_API_KEY")
+            api_key = credential_store.get("XAI_API_KEY")
             if not api_key:
                 raise XAIConfigurationError("XAI API key not found in environment")
-            self._client = OpenAI(
-                api_key=api_key,
-                base_url="https://api.x.ai/v1",
+            self._client = shared_client(
+                "openai",
+                (api_key, "https://api.x.ai/v1"),
+                lambda: OpenAI(api_key=api_key, base_url="https://api.x.ai/v1")
             )
         return self._client
 
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get the async client for the running event loop"""
+        api_key = credential_store.get("XAI_API_KEY")
+        if not api_key:
+            raise XAIConfigurationError("XAI API key not found in environment")
+        return shared_async_client(
+            "openai",
+            (api_key, "https://api.x.ai/v1"),
+            lambda: AsyncOpenAI(api_key=api_key, base_url="https://api.x.ai/v1")
+        )
+
     def configure(self) -> bool:
         """Sets up XAI API authentication"""
         logger.info("\n🤖 XAI API SETUP")
@@ -117,8 +140,7 @@ class XAIConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if XAI API key is configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('XAI_API_KEY')
+            api_key = credential_store.get('XAI_API_KEY')
             if not api_key:
                 return False
 
@@ -152,6 +174,37 @@ class XAIConnection(BaseConnection):
         except Exception as e:
             raise XAIAPIError(f"Text generation failed: {e}")
 
+    async def agenerate_text(self, prompt: str, system_prompt: str = None, model: str = None, **kwargs) -> str:
+        """generate_text for async callers, awaited on their event loop"""
+        try:
+            client = self._get_async_client()
+            completion = await client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": system_prompt or ""},
+                    {"role": "user", "content": prompt},
+                ],
+            )
+            return completion.choices[0].message.content
+        except Exception as e:
+            raise XAIAPIError(f"Text generation failed: {e}")
+
+    def stream_text(self, prompt: str, system_prompt: str = None, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from XAI models, yielding chunks as they arrive"""
+        try:
+            client = self._get_client()
+            stream = client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": system_prompt or ""},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            yield from text_deltas(stream)
+        except Exception as e:
+            raise XAIAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
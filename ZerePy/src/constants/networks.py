@@ -1,11 +1,13 @@
 SONIC_NETWORKS = {
     "mainnet": {
         "rpc_url": "https://rpc.soniclabs.com",
-        "scanner_url": "https://sonicscan.org"
+        "scanner_url": "https://sonicscan.org",
+        "chain_id": 146
     },
     "testnet": {
         "rpc_url": "https://rpc.blaze.soniclabs.com",
-        "scanner_url": "https://testnet.sonicscan.org"
+        "scanner_url": "https://testnet.sonicscan.org",
+        "chain_id": 57054
     },
     "custom": {
         "rpc_url": "placeholder",
@@ -29,4 +31,29 @@ EVM_NETWORKS = {
         "scanner_url": "api.polygonscan.com",
         "chain_id": 137
     }
-}
\ No newline at end of file
+}
+
+# Pseudo-address aggregators use for a chain's native coin
+NATIVE_TOKEN = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+
+# Token metadata known up front, per chain ID: address -> (symbol, decimals)
+EVM_TOKENS = {
+    1: {
+        NATIVE_TOKEN: ("ETH", 18),
+        "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2": ("WETH", 18),
+        "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48": ("USDC", 6),
+        "0xdAC17F958D2ee523a2206206994597C13D831ec7": ("USDT", 6),
+        "0x6B175474E89094C44Da98b954EedeAC495271d0F": ("DAI", 18),
+        "0x2260FAC5E5542a773Aa44fBCfeDf7C193bc2C599": ("WBTC", 8),
+        "0x514910771AF9Ca656af840dff83E8264EcF986CA": ("LINK", 18),
+        "0x1f9840a85d5aF5bf1D1762F925BDADdC4201F984": ("UNI", 18),
+    },
+    146: {
+        NATIVE_TOKEN: ("S", 18),
+        "0x039e2fB66102314Ce7b64Ce5Ce3E5183bc94aD38": ("wS", 18),
+        "0x29219dd400f2Bf60E5a23d13Be72B486D4038894": ("USDC.e", 6),
+    },
+    57054: {
+        NATIVE_TOKEN: ("S", 18),
+    },
+}
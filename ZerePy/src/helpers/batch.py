@@ -0,0 +1,60 @@
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+logger = logging.getLogger("helpers.batch")
+
+DEFAULT_BATCH_SIZE = 1  # one reply per run, i.e. batching off
+DEFAULT_CONCURRENCY = 4
+DEFAULT_POST_INTERVAL = 2  # seconds between posts to the same platform
+
+
+class RateLimiter:
+    """Spaces calls at least `min_interval` seconds apart, across threads and batches"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.min_interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def generate_replies(
+    generate: Callable[[str], Optional[str]],
+    prompts: Sequence[str],
+    concurrency: int = DEFAULT_CONCURRENCY
+) -> List[Optional[str]]:
+    """
+    Run `generate` over every prompt, at most `concurrency` at a time
+
+    Returns:
+        Replies in prompt order; None where generation failed
+    """
+    if len(prompts) <= 1 or concurrency <= 1:
+        return [_safe_generate(generate, prompt) for prompt in prompts]
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(prompts)), thread_name_prefix="reply-batch") as pool:
+        # Each worker runs in a copy of the caller's context so the current action is still known
+        futures = [
+            pool.submit(contextvars.copy_context().run, _safe_generate, generate, prompt)
+            for prompt in prompts
+        ]
+        return [future.result() for future in futures]
+
+
+def _safe_generate(generate: Callable[[str], Optional[str]], prompt: str) -> Optional[str]:
+    try:
+        return generate(prompt)
+    except Exception as e:
+        logger.error(f"Reply generation failed: {e}")
+        return None
@@ -0,0 +1,176 @@
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+logger = logging.getLogger("helpers.context")
+
+DEFAULT_MAX_INPUT_TOKENS = 6000  # per call, system prompt plus prompt; above it a warning is logged
+DEFAULT_SYSTEM_PROMPT_TOKENS = 3000  # budget for bio, traits and style examples
+DEFAULT_HISTORY_TOKENS = 1000  # budget for history pasted into a prompt (e.g. previous room messages)
+
+# Rough characters per token by model family, used when no tokenizer is installed
+_CHARS_PER_TOKEN = (
+    ("gpt-", 4.0),
+    ("o1", 4.0),
+    ("claude", 3.5),
+    ("llama", 3.8),
+    ("meta-llama", 3.8),
+    ("mistral", 3.6),
+    ("grok", 4.0),
+    ("hermes", 3.8),
+    ("nousresearch", 3.8),
+)
+_DEFAULT_CHARS_PER_TOKEN = 4.0
+
+try:
+    import tiktoken
+except ImportError:  # optional; the character heuristic is close enough for budgeting
+    tiktoken = None
+
+
+@lru_cache(maxsize=32)
+def _encoding(model: str):
+    if tiktoken is None or not model.startswith(("gpt-", "o1", "text-embedding")):
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return None
+
+
+def _chars_per_token(model: Optional[str]) -> float:
+    name = (model or "").lower()
+    for prefix, ratio in _CHARS_PER_TOKEN:
+        if name.startswith(prefix) or f"/{prefix}" in name:
+            return ratio
+    return _DEFAULT_CHARS_PER_TOKEN
+
+
+@lru_cache(maxsize=1024)
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """Token count of `text` for `model`: exact with tiktoken for OpenAI models, estimated otherwise"""
+    if not text:
+        return 0
+    encoding = _encoding(model) if model else None
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return max(1, round(len(text) / _chars_per_token(model)))
+
+
+class ContextBuilder:
+    """
+    Keeps prompts inside a token budget.
+
+    Static parts (anything that only changes with the agent file) are rendered
+    once through `static()`. Variable parts such as examples and history are
+    trimmed to their budgets with `fit()`, and every outgoing call is measured
+    with `record()` so per-call input size shows up in the logs and stats.
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        max_input_tokens: int = DEFAULT_MAX_INPUT_TOKENS,
+        system_prompt_tokens: int = DEFAULT_SYSTEM_PROMPT_TOKENS,
+        history_tokens: int = DEFAULT_HISTORY_TOKENS
+    ):
+        self.model = model
+        self.max_input_tokens = max_input_tokens
+        self.system_prompt_tokens = system_prompt_tokens
+        self.history_tokens = history_tokens
+        self._static: Dict[Hashable, str] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.total_tokens = 0
+        self.max_tokens_seen = 0
+        self.over_budget = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], model: Optional[str] = None) -> "ContextBuilder":
+        """Build from the agent's "context" section"""
+        config = config or {}
+        return cls(
+            model=config.get("model", model),
+            max_input_tokens=config.get("max_input_tokens", DEFAULT_MAX_INPUT_TOKENS),
+            system_prompt_tokens=config.get("system_prompt_tokens", DEFAULT_SYSTEM_PROMPT_TOKENS),
+            history_tokens=config.get("history_tokens", DEFAULT_HISTORY_TOKENS),
+        )
+
+    def count(self, text: str) -> int:
+        return estimate_tokens(text, self.model)
+
+    def static(self, key: Hashable, render: Callable[[], str]) -> str:
+        """Render a part that never changes for `key` once, then reuse it"""
+        with self._lock:
+            if key in self._static:
+                return self._static[key]
+        rendered = render()
+        with self._lock:
+            return self._static.setdefault(key, rendered)
+
+    def fit(self, lines: Sequence[str], budget: int, keep_newest: bool = False) -> List[str]:
+        """
+        Longest run of `lines` that fits in `budget` tokens
+
+        Keeps the first lines, or the last ones with `keep_newest`; when lines
+        are dropped, a one-line note saying how many replaces them.
+        """
+        costs = [self.count(line) + 1 for line in lines]  # +1 for the joining newline
+        if sum(costs) <= budget:
+            return list(lines)
+
+        def omitted(count: int) -> str:
+            return f"- ({count} {'earlier' if keep_newest else 'more'} entries omitted)"
+
+        # Some lines will go, so room for the note (sized for the most it could say) comes first
+        available = budget - (self.count(omitted(len(lines))) + 1)
+        if available < 0:
+            logger.debug(f"Budget of {budget} tokens is too small for any of {len(lines)} lines")
+            return []
+        ordered = list(reversed(range(len(lines)))) if keep_newest else list(range(len(lines)))
+        kept, used = [], 0
+        for index in ordered:
+            if used + costs[index] > available:
+                break
+            kept.append(lines[index])
+            used += costs[index]
+
+        dropped = len(lines) - len(kept)
+        note = omitted(dropped)
+        logger.debug(f"Trimmed {dropped} of {len(lines)} lines to fit {budget} tokens")
+        return [note] + kept[::-1] if keep_newest else kept + [note]
+
+    def history(self, lines: Sequence[str], budget: Optional[int] = None) -> str:
+        """Most recent history lines that fit the history budget, oldest first"""
+        return "\n".join(self.fit(lines, budget or self.history_tokens, keep_newest=True))
+
+    def record(self, system_prompt: Optional[str], prompt: str, label: str = "llm") -> int:
+        """Measure one outgoing call, log its size and return the total input tokens"""
+        system_tokens = self.count(system_prompt or "")
+        prompt_tokens = self.count(prompt)
+        total = system_tokens + prompt_tokens
+        with self._lock:
+            self.calls += 1
+            self.total_tokens += total
+            self.max_tokens_seen = max(self.max_tokens_seen, total)
+            if total > self.max_input_tokens:
+                self.over_budget += 1
+        if total > self.max_input_tokens:
+            logger.warning(
+                f"{label} input is {total} tokens (system={system_tokens}, prompt={prompt_tokens}), "
+                f"over the {self.max_input_tokens} token cap"
+            )
+        else:
+            logger.info(f"{label} input: {total} tokens (system={system_tokens}, prompt={prompt_tokens})")
+        return total
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "calls": self.calls,
+            "avg_input_tokens": self.total_tokens / self.calls if self.calls else 0.0,
+            "max_input_tokens_seen": self.max_tokens_seen,
+            "over_budget": self.over_budget,
+            "max_input_tokens": self.max_input_tokens,
+        }
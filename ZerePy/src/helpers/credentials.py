@@ -0,0 +1,105 @@
+import logging
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional, Set, Tuple
+
+from dotenv import dotenv_values
+
+logger = logging.getLogger("helpers.credentials")
+
+# The project's .env, independent of the directory the agent is started from
+DEFAULT_ENV_PATH = Path(__file__).resolve().parents[2] / ".env"
+
+
+class CredentialStore:
+    """
+    Process-wide view of the .env file.
+
+    The file is parsed once and only re-read when its mtime/size changes or when
+    reload() is called (e.g. after /save-env writes it). Values are published to
+    os.environ so SDKs that read the environment directly keep working. Variables
+    that were already set in the real environment take precedence over the file,
+    matching load_dotenv(); keys that came from the file follow later edits to it.
+    """
+
+    def __init__(self, env_path: Path = DEFAULT_ENV_PATH):
+        self.env_path = Path(env_path)
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._loaded = False
+        self._file_keys: Set[str] = set()
+
+    def _current_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.env_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self, force: bool = False) -> None:
+        """Re-read the .env file if it changed since the last load"""
+        signature = self._current_signature()
+        if self._loaded and not force and signature == self._signature:
+            return
+
+        with self._lock:
+            if self._loaded and not force and signature == self._signature:
+                return
+
+            values = dotenv_values(self.env_path) if signature else {}
+            file_keys = set()
+            for key, value in values.items():
+                if value is None:
+                    continue
+                if key in self._file_keys or key not in os.environ:
+                    os.environ[key] = value
+                    file_keys.add(key)
+
+            # Keys that disappeared from the file should not linger in the process
+            for key in self._file_keys - file_keys:
+                os.environ.pop(key, None)
+
+            self._file_keys = file_keys
+            self._signature = signature
+            self._loaded = True
+            logger.debug(f"Loaded {len(file_keys)} credentials from {self.env_path}")
+
+    def reload(self) -> None:
+        """Force a re-read, e.g. right after the .env file was written"""
+        self.refresh(force=True)
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Get a credential, reloading the .env file first if it changed"""
+        self.refresh()
+        return os.environ.get(key, default)
+
+    def evm_account(self, key: str) -> Optional[Any]:
+        """Get the (cached) eth_account LocalAccount for the private key stored under `key`"""
+        private_key = self.get(key)
+        if not private_key:
+            return None
+        return _evm_account(private_key)
+
+    def solana_keypair(self, key: str) -> Optional[Any]:
+        """Get the (cached) solders Keypair for the base58 private key stored under `key`"""
+        private_key = self.get(key)
+        if not private_key:
+            return None
+        return _solana_keypair(private_key)
+
+
+@lru_cache(maxsize=32)
+def _evm_account(private_key: str):
+    from eth_account import Account
+    return Account.from_key(private_key)
+
+
+@lru_cache(maxsize=32)
+def _solana_keypair(private_key: str):
+    from solders.keypair import Keypair  # type: ignore
+    return Keypair.from_base58_string(private_key)
+
+
+credential_store = CredentialStore()
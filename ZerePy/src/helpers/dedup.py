@@ -0,0 +1,207 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+DEFAULT_FRONT_SIZE = 1024
+DEFAULT_CAPACITY = 100_000  # members per generation before it fills up
+DEFAULT_ERROR_RATE = 0.001
+DEFAULT_GENERATIONS = 2
+
+
+class BloomFilter:
+    """Plain Bloom filter sized for `capacity` members at `error_rate`"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    @staticmethod
+    def bits_for(capacity: int, error_rate: float) -> int:
+        return max(8, math.ceil(-max(1, capacity) * math.log(error_rate) / (math.log(2) ** 2)))
+
+    def _positions(self, key: str) -> List[int]:
+        # Kirsch-Mitzenmacher double hashing from one 128-bit digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+    def estimated_error_rate(self) -> float:
+        """False positive rate expected at the current fill level"""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+
+class RotatingBloomFilter:
+    """
+    Time-windowed Bloom filter made of `generations` filters.
+
+    New members go into the newest generation. When it has been active for
+    `window` seconds, or holds `capacity` members, the oldest generation is dropped
+    and a fresh one started, so a member is remembered for at least
+    window * (generations - 1) seconds and memory never grows.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        window: Optional[float] = None,
+        generations: int = DEFAULT_GENERATIONS,
+        max_bytes: Optional[int] = None
+    ):
+        self.generations = max(2, generations)
+        self.error_rate = error_rate
+        self.window = window
+        if max_bytes:
+            # Shrink per-generation capacity until the whole filter fits the memory cap
+            budget_bits = max_bytes * 8 // self.generations
+            while capacity > 1 and BloomFilter.bits_for(capacity, error_rate) > budget_bits:
+                capacity = capacity * 9 // 10
+        self.capacity = capacity
+        self._filters: List[BloomFilter] = [BloomFilter(capacity, error_rate)]
+        self._started = time.monotonic()
+        self.rotations = 0
+        self.capacity_rotations = 0
+        self._last_capacity_rotation: Optional[float] = None
+
+    def _maybe_rotate(self) -> None:
+        current = self._filters[-1]
+        expired = self.window is not None and time.monotonic() - self._started >= self.window
+        full = current.count >= self.capacity
+        if not (expired or full):
+            return
+        if full and not expired:
+            self.capacity_rotations += 1
+            self._last_capacity_rotation = time.monotonic()
+        self._filters.append(BloomFilter(self.capacity, self.error_rate))
+        if len(self._filters) > self.generations:
+            self._filters.pop(0)
+        self._started = time.monotonic()
+        self.rotations += 1
+
+    def add(self, key: str) -> None:
+        self._maybe_rotate()
+        self._filters[-1].add(key)
+
+    def __contains__(self, key: str) -> bool:
+        self._maybe_rotate()
+        return any(key in bloom for bloom in self._filters)
+
+    @property
+    def lossless(self) -> bool:
+        """
+        False while members may have been dropped before their window was up
+        (because a generation filled early); a "not present" answer is only
+        authoritative when this is True.
+        """
+        if self._last_capacity_rotation is None:
+            return True
+        horizon = (self.window or 0) * self.generations
+        return horizon > 0 and time.monotonic() - self._last_capacity_rotation > horizon
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(bloom.memory_bytes for bloom in self._filters)
+
+    def estimated_error_rate(self) -> float:
+        """Chance that an unseen member matches any live generation"""
+        miss = 1.0
+        for bloom in self._filters:
+            miss *= 1 - bloom.estimated_error_rate()
+        return 1 - miss
+
+
+class DedupFilter:
+    """
+    Memory-capped "have we seen this id?" structure.
+
+    The most recent `front_size` members are kept in an exact LRU. Older members
+    are answered by a rotating Bloom filter, so lookups can give false positives
+    at roughly `error_rate` but never false negatives within the window. Memory
+    stays flat no matter how long the process runs.
+    """
+
+    def __init__(
+        self,
+        front_size: int = DEFAULT_FRONT_SIZE,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        window: Optional[float] = None,
+        generations: int = DEFAULT_GENERATIONS,
+        max_bytes: Optional[int] = None
+    ):
+        self.front_size = front_size
+        self._front: "OrderedDict[str, None]" = OrderedDict()
+        self._bloom = RotatingBloomFilter(capacity, error_rate, window, generations, max_bytes)
+        self._lock = threading.Lock()
+        self._adds = 0
+        self._lookups = 0
+        self._front_hits = 0
+        self._filter_hits = 0
+
+    def add(self, member: Any) -> None:
+        key = str(member)
+        with self._lock:
+            self._front[key] = None
+            self._front.move_to_end(key)
+            while len(self._front) > self.front_size:
+                self._front.popitem(last=False)
+            self._bloom.add(key)
+            self._adds += 1
+
+    def __contains__(self, member: Any) -> bool:
+        key = str(member)
+        with self._lock:
+            self._lookups += 1
+            if key in self._front:
+                self._front.move_to_end(key)
+                self._front_hits += 1
+                return True
+            if key in self._bloom:
+                self._filter_hits += 1
+                return True
+            return False
+
+    def might_contain(self, member: Any) -> bool:
+        """Same as `in`; reads better when a False answer is used to skip a slower exact check"""
+        return member in self
+
+    @property
+    def lossless(self) -> bool:
+        return self._bloom.lossless
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rates and memory use"""
+        with self._lock:
+            lookups = self._lookups or 1
+            return {
+                "adds": self._adds,
+                "lookups": self._lookups,
+                "front_hit_rate": self._front_hits / lookups,
+                "filter_hit_rate": self._filter_hits / lookups,
+                "hit_rate": (self._front_hits + self._filter_hits) / lookups,
+                "front_size": len(self._front),
+                "rotations": self._bloom.rotations,
+                "capacity_rotations": self._bloom.capacity_rotations,
+                "filter_bytes": self._bloom.memory_bytes,
+                "estimated_error_rate": self._bloom.estimated_error_rate(),
+            }
@@ -0,0 +1,90 @@
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger("helpers.http")
+
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds for calls that don't pass their own
+DEFAULT_POOL_CONNECTIONS = 32  # hosts kept in the pool
+DEFAULT_POOL_MAXSIZE = 16  # keep-alive connections per host
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+RETRY_STATUSES = (502, 503, 504)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout when the caller gives none"""
+
+    def __init__(self, *args, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def build_session(
+    timeout=DEFAULT_TIMEOUT,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE
+) -> requests.Session:
+    """
+    Build a Session with keep-alive pools, a default timeout and retries
+
+    Only idempotent methods are retried, on connection errors and on
+    RETRY_STATUSES; 429s are left to callers, which know the API's rate limits.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = TimeoutHTTPAdapter(
+        timeout=timeout,
+        max_retries=retry,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def http_session() -> requests.Session:
+    """
+    Get the process-wide HTTP session
+
+    Every REST call goes through it, so requests to a host reuse pooled
+    TCP/TLS connections instead of paying a fresh handshake each time.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+                logger.debug("Created shared HTTP session")
+    return _session
+
+
+def http_stats() -> Dict[str, Any]:
+    """Open connection pools in the shared session"""
+    pools = len(_session.get_adapter("https://").poolmanager.pools) if _session is not None else 0
+    return {"pools": pools}
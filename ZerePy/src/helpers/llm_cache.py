@@ -0,0 +1,196 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger("helpers.llm_cache")
+
+DEFAULT_TTL = 3600  # seconds a cached completion is served
+DEFAULT_MAX_ENTRIES = 512  # completions kept in memory
+DEFAULT_MAX_DISK_ENTRIES = 10_000
+DEFAULT_DISK_PATH = Path.home() / ".zerepy" / "cache" / "llm.db"
+# Creative tasks should produce a new text every run, so they never read the cache
+DEFAULT_BYPASS_ACTIONS = ("post-tweet", "reply-to-tweet", "post-echochambers", "reply-echochambers")
+
+
+def cache_key(provider: str, model: Optional[str], system_prompt: Optional[str], prompt: str) -> str:
+    """Key for one completion: provider, model, system prompt hash and prompt"""
+    system_hash = hashlib.sha256((system_prompt or "").encode()).hexdigest()
+    prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()
+    return f"{provider}:{model or ''}:{system_hash}:{prompt_hash}"
+
+
+class _DiskTier:
+    """SQLite table of completions shared across restarts and processes"""
+
+    def __init__(self, path: Path, max_entries: int):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS completions_used ON completions (used)")
+
+    def get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM completions WHERE key = ? AND expires > ?", (key, now)
+            ).fetchone()
+            if row:
+                self._conn.execute("UPDATE completions SET used = ? WHERE key = ?", (now, key))
+            return row
+
+    def put(self, key: str, value: str, expires: float, now: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, value, expires, used) VALUES (?, ?, ?, ?)",
+                (key, value, expires, now),
+            )
+            self._writes += 1
+            # Trim now and then rather than on every write
+            if self._writes % 100 == 0:
+                self._conn.execute("DELETE FROM completions WHERE expires <= ?", (now,))
+                self._conn.execute(
+                    "DELETE FROM completions WHERE key IN "
+                    "(SELECT key FROM completions ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LLMResponseCache:
+    """
+    Cache of generate-text completions.
+
+    An LRU of `max_entries` completions sits in memory, each served for `ttl`
+    seconds. With `disk` enabled, misses fall through to a SQLite tier so
+    repeated prompts stay cached across restarts. Actions listed in
+    `bypass_actions` neither read nor write the cache.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        disk: bool = False,
+        disk_path: Path = DEFAULT_DISK_PATH,
+        max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES,
+        bypass_actions: Iterable[str] = DEFAULT_BYPASS_ACTIONS
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass_actions = set(bypass_actions)
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[_DiskTier] = None
+        if disk:
+            try:
+                self._disk = _DiskTier(disk_path, max_disk_entries)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"LLM cache disk tier unavailable, using memory only: {e}")
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional["LLMResponseCache"]:
+        """Build from the agent's "llm_cache" section; None unless "enabled" is set"""
+        config = config or {}
+        if not config.get("enabled", False):
+            return None
+        return cls(
+            ttl=config.get("ttl", DEFAULT_TTL),
+            max_entries=config.get("max_entries", DEFAULT_MAX_ENTRIES),
+            disk=config.get("disk", False),
+            disk_path=Path(config.get("disk_path", DEFAULT_DISK_PATH)),
+            max_disk_entries=config.get("max_disk_entries", DEFAULT_MAX_DISK_ENTRIES),
+            bypass_actions=config.get("bypass_actions", DEFAULT_BYPASS_ACTIONS),
+        )
+
+    def bypasses(self, action_name: Optional[str]) -> bool:
+        """True if completions made on behalf of this action skip the cache"""
+        if action_name in self.bypass_actions:
+            self.bypassed += 1
+            return True
+        return False
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[key]
+
+        if self._disk:
+            try:
+                row = self._disk.get(key, now)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache disk read failed: {e}")
+                row = None
+            if row:
+                with self._lock:
+                    self._remember(key, row[0], row[1])
+                    self.disk_hits += 1
+                return row[0]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: str) -> None:
+        now = time.time()
+        expires = now + self.ttl
+        with self._lock:
+            self._remember(key, value, expires)
+        if self._disk:
+            try:
+                self._disk.put(key, value, expires, now)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache disk write failed: {e}")
+
+    def _remember(self, key: str, value: str, expires: float) -> None:
+        """Insert into the memory LRU (lock held)"""
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self._disk:
+            self._disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
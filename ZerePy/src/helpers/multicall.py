@@ -0,0 +1,133 @@
+import logging
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from web3 import Web3
+
+from src.constants.abi import MULTICALL3_ABI, MULTICALL3_ADDRESS
+from src.constants.networks import NATIVE_TOKEN
+from src.helpers.token_registry import TokenRegistry
+
+logger = logging.getLogger("helpers.multicall")
+
+DEFAULT_BATCH_SIZE = 500  # calls per aggregate3, keeps each eth_call well under node limits
+_ADDRESS = re.compile(r"0x[0-9a-fA-F]{40}")
+
+
+def parse_addresses(value: Union[str, Sequence[str], None]) -> List[str]:
+    """Addresses from a list or any comma/space separated string, duplicates dropped"""
+    if not value:
+        return []
+    text = value if isinstance(value, str) else " ".join(str(item) for item in value)
+    return list(dict.fromkeys(_ADDRESS.findall(text)))
+
+
+def _encode(contract, fn_name: str, args: Optional[List[Any]] = None) -> bytes:
+    return Web3.to_bytes(hexstr=contract.encodeABI(fn_name=fn_name, args=args or []))
+
+
+def multicall(web3: Web3, calls: Sequence[Tuple[str, bytes]], batch_size: int = DEFAULT_BATCH_SIZE) -> List[Optional[bytes]]:
+    """
+    Run read-only calls through Multicall3.aggregate3, `batch_size` per eth_call
+
+    Falls back to one eth_call per call when Multicall3 is not deployed on the chain.
+
+    Returns:
+        Return data per call, in order; None where that call reverted
+    """
+    multicall3 = web3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+    results: List[Optional[bytes]] = []
+    for start in range(0, len(calls), batch_size):
+        chunk = [(Web3.to_checksum_address(target), True, data) for target, data in calls[start:start + batch_size]]
+        try:
+            responses = multicall3.functions.aggregate3(chunk).call()
+        except Exception as e:
+            logger.warning(f"Multicall3 unavailable, reading {len(chunk)} calls one by one: {e}")
+            responses = [_single_call(web3, target, data) for target, _, data in chunk]
+        results.extend(data if success else None for success, data in responses)
+    return results
+
+
+def _single_call(web3: Web3, target: str, data: bytes) -> Tuple[bool, bytes]:
+    try:
+        return True, bytes(web3.eth.call({"to": target, "data": data}))
+    except Exception:
+        return False, b""
+
+
+def _decode(web3: Web3, type_name: str, data: Optional[bytes]) -> Any:
+    if not data:
+        return None
+    try:
+        return web3.codec.decode([type_name], data)[0]
+    except Exception:
+        return None
+
+
+def read_portfolio(
+    web3: Web3,
+    registry: TokenRegistry,
+    owners: Sequence[str],
+    tokens: Optional[Sequence[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, Dict[str, float]]:
+    """
+    Native and ERC-20 balances for every owner in as few round trips as possible
+
+    Every balanceOf, the native getEthBalance and the decimals/symbol reads for
+    tokens the registry has not seen yet go into the same aggregate3 batch.
+
+    Args:
+        owners: Wallet addresses
+        tokens: Token addresses; defaults to every token in the registry, and then
+            only non-zero balances are reported
+
+    Returns:
+        {owner: {symbol (or address): balance}}
+    """
+    explicit = tokens is not None
+    if explicit:
+        tokens = [token for token in tokens if token.lower() != NATIVE_TOKEN.lower()]
+    else:
+        tokens = [token.address for token in registry.known_tokens()]
+    unknown = [token for token in tokens if registry.known(token) is None]
+    multicall3 = web3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+
+    calls: List[Tuple[str, bytes]] = []
+    for token in unknown:
+        contract = registry.contract(token)
+        calls.append((token, _encode(contract, "decimals")))
+        calls.append((token, _encode(contract, "symbol")))
+    for owner in owners:
+        owner = Web3.to_checksum_address(owner)
+        calls.append((MULTICALL3_ADDRESS, _encode(multicall3, "getEthBalance", [owner])))
+        calls.extend((token, _encode(registry.contract(token), "balanceOf", [owner])) for token in tokens)
+
+    results = iter(multicall(web3, calls, batch_size))
+    for token in unknown:
+        decimals = _decode(web3, "uint8", next(results))
+        symbol = _decode(web3, "string", next(results))
+        if decimals is None:
+            logger.warning(f"{token} does not look like an ERC-20 (no decimals), skipping")
+            continue
+        registry.register(token, decimals, symbol)
+
+    native = registry.known(NATIVE_TOKEN)
+    native_label = native.symbol if native and native.symbol else "native"
+    portfolio: Dict[str, Dict[str, float]] = {}
+    for owner in owners:
+        balances: Dict[str, float] = {}
+        raw_native = _decode(web3, "uint256", next(results))
+        if raw_native is None:
+            raw_native = web3.eth.get_balance(Web3.to_checksum_address(owner))
+        balances[native_label] = raw_native / 10 ** 18
+
+        for token in tokens:
+            raw = _decode(web3, "uint256", next(results))
+            info = registry.known(token)
+            if raw is None or info is None or (not raw and not explicit):
+                continue
+            label = info.symbol if info.symbol and info.symbol not in balances else info.address
+            balances[label] = raw / 10 ** info.decimals
+        portfolio[owner] = balances
+    return portfolio
@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional, Set
+
+from src.connections.client_pool import shared_client
+
+logger = logging.getLogger("helpers.nonce")
+
+DEFAULT_NONCE_RETRIES = 2  # resyncs attempted after a nonce error before giving up
+DEFAULT_IDLE_RESYNC = 60  # seconds without a transaction after which the count is re-read from the node
+_NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "nonce has already been used",
+    "replacement transaction underpriced",
+)
+
+
+def is_nonce_error(error: BaseException) -> bool:
+    message = str(error).lower()
+    return any(pattern in message for pattern in _NONCE_ERRORS)
+
+
+class NonceManager:
+    """
+    Hands out nonces for one wallet on one chain without an RPC per transaction.
+
+    The first allocation reads the pending transaction count; after that nonces
+    are counted locally, so back-to-back and concurrent transactions from the
+    same wallet need no extra RPC. The count is read from the node again after a
+    nonce error, an ambiguous send failure (e.g. a timeout), or `idle_resync`
+    seconds without a transaction, which picks up dropped transactions and
+    other processes using the wallet.
+    """
+
+    def __init__(self, web3, address: str, idle_resync: float = DEFAULT_IDLE_RESYNC):
+        self.web3 = web3
+        self.address = address
+        self.idle_resync = idle_resync
+        self._next: Optional[int] = None
+        self._pending: Set[int] = set()  # allocated but not yet accepted by the node
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    def allocate(self) -> int:
+        with self._lock:
+            now = time.monotonic()
+            if self._next is None or (not self._pending and now - self._last_used >= self.idle_resync):
+                count = self.web3.eth.get_transaction_count(self.address, "pending")
+                # Nonces other threads still hold may not have reached the node yet
+                self._next = max([count] + [nonce + 1 for nonce in self._pending])
+            nonce = self._next
+            self._next += 1
+            self._pending.add(nonce)
+            self._last_used = now
+            return nonce
+
+    def confirm(self, nonce: int) -> None:
+        """The transaction with this nonce was accepted by the node"""
+        with self._lock:
+            self._pending.discard(nonce)
+
+    def release(self, nonce: int) -> None:
+        """The transaction with this nonce was never broadcast"""
+        with self._lock:
+            self._pending.discard(nonce)
+            if self._next is not None and nonce == self._next - 1:
+                self._next = nonce
+            else:
+                # Later nonces are already out, so the gap has to be refilled from the node's count
+                self._next = None
+
+    def resync(self, nonce: Optional[int] = None) -> None:
+        """Re-read the count on the next allocation; `nonce` is the caller's own, now given up"""
+        with self._lock:
+            logger.info(f"Resyncing nonce for {self.address} (local next was {self._next})")
+            if nonce is not None:
+                self._pending.discard(nonce)
+            self._next = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def send(self, sign: Callable[[int], Any], retries: int = DEFAULT_NONCE_RETRIES):
+        """
+        Sign a transaction with the next nonce and broadcast it
+
+        Args:
+            sign: Builds and signs the transaction for a given nonce
+            retries: Times to resync and re-sign after a nonce error
+
+        Returns:
+            The transaction hash
+        """
+        for attempt in range(retries + 1):
+            nonce = self.allocate()
+            try:
+                signed = sign(nonce)
+            except Exception:
+                self.release(nonce)
+                raise
+            try:
+                tx_hash = self.web3.eth.send_raw_transaction(signed.rawTransaction)
+            except Exception as e:
+                if "already known" in str(e).lower():
+                    # An identical transaction is already in the pool
+                    self.confirm(nonce)
+                    return signed.hash
+                if is_nonce_error(e) and attempt < retries:
+                    logger.warning(f"Nonce {nonce} rejected for {self.address}: {e}; retrying")
+                    self.resync(nonce)
+                    continue
+                # Even without a nonce error the node may have taken the transaction (e.g. a timeout)
+                self.resync(nonce)
+                raise
+            self.confirm(nonce)
+            return tx_hash
+
+
+def nonce_manager(web3, chain_id: Optional[int], address: str) -> NonceManager:
+    """Get the shared nonce manager for a wallet on a chain"""
+    return shared_client("nonce", (chain_id, address.lower()), lambda: NonceManager(web3, address))
@@ -0,0 +1,68 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("helpers.prompt_cache")
+
+DEFAULT_CACHE_DIR = Path.home() / ".zerepy" / "cache" / "prompts"
+DEFAULT_PROMPT_TTL = 24 * 3600  # seconds before example tweets are fetched again
+
+
+def file_hash(path: Path) -> str:
+    """sha256 of a file's bytes; any edit to the agent file gets a fresh cache entry"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+class PromptCache:
+    """
+    On-disk cache of built system prompts and the example tweets they include.
+
+    Entries are JSON files keyed by agent name and agent file hash, so they survive
+    restarts and are shared by every process (CLI, server, supervisor workers)
+    loading the same agent file.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_PROMPT_TTL):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.ttl = ttl
+
+    def _path(self, agent_name: str, agent_hash: str) -> Path:
+        return self.cache_dir / f"{agent_name}-{agent_hash[:16]}.json"
+
+    def load(self, agent_name: str, agent_hash: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for this exact agent file, fresh or stale, or None"""
+        path = self._path(agent_name, agent_hash)
+        try:
+            entry = json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable prompt cache {path}: {e}")
+            return None
+        return entry if entry.get("agent_hash") == agent_hash else None
+
+    def is_fresh(self, entry: Optional[Dict[str, Any]]) -> bool:
+        return bool(entry) and time.time() - entry.get("created", 0) < self.ttl
+
+    def save(self, agent_name: str, agent_hash: str, system_prompt: str, example_tweets: Dict[str, Any]) -> None:
+        """Write an entry atomically so concurrent readers never see a partial file"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "agent_hash": agent_hash,
+            "created": time.time(),
+            "system_prompt": system_prompt,
+            "example_tweets": example_tweets,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as tmp:
+                json.dump(entry, tmp)
+            os.replace(tmp_path, self._path(agent_name, agent_hash))
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
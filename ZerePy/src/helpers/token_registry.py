@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from web3 import Web3
+
+from src.constants.abi import ERC20_ABI
+from src.constants.networks import EVM_TOKENS, NATIVE_TOKEN
+from src.connections.client_pool import shared_client
+
+logger = logging.getLogger("helpers.token_registry")
+
+DEFAULT_CACHE_DIR = Path.home() / ".zerepy" / "cache" / "tokens"
+
+
+@dataclass(frozen=True)
+class TokenInfo:
+    address: str  # checksummed
+    decimals: int
+    symbol: Optional[str]
+
+
+class TokenRegistry:
+    """
+    Per-chain cache of ERC-20 metadata and contract objects.
+
+    Decimals and symbols never change for a deployed token, so each is read
+    over RPC at most once per chain and then kept in memory and in a JSON file
+    under `cache_dir`. Tokens in EVM_TOKENS are known without any RPC at all.
+    """
+
+    def __init__(self, web3: Web3, chain_id: int, cache_dir: Path = DEFAULT_CACHE_DIR):
+        self.web3 = web3
+        self.chain_id = chain_id
+        self.path = Path(cache_dir).expanduser() / f"{chain_id}.json"
+        self._tokens: Dict[str, TokenInfo] = {}
+        self._contracts: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+        for address, (symbol, decimals) in EVM_TOKENS.get(chain_id, {}).items():
+            self._tokens[address.lower()] = TokenInfo(Web3.to_checksum_address(address), decimals, symbol)
+        # Aggregators' pseudo-address for the native coin, which has 18 decimals on every EVM chain
+        self._tokens.setdefault(NATIVE_TOKEN.lower(), TokenInfo(Web3.to_checksum_address(NATIVE_TOKEN), 18, None))
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            entries = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable token cache {self.path}: {e}")
+            return
+        for entry in entries:
+            self._tokens.setdefault(
+                entry["address"].lower(), TokenInfo(entry["address"], entry["decimals"], entry.get("symbol"))
+            )
+
+    def _save(self) -> None:
+        """Write the registry atomically; a failed write only costs a lookup after restart"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                entries = [token.__dict__ for token in self._tokens.values()]
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as tmp:
+                    json.dump(entries, tmp)
+                os.replace(tmp_path, self.path)
+            except Exception:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not write token cache {self.path}: {e}")
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def checksum(address: str) -> str:
+        """Checksummed form of an address (keccak, so memoized)"""
+        return Web3.to_checksum_address(address)
+
+    def contract(self, address: str):
+        """ERC-20 contract object for a token, built once"""
+        key = address.lower()
+        contract = self._contracts.get(key)
+        if contract is None:
+            contract = self.web3.eth.contract(address=self.checksum(address), abi=ERC20_ABI)
+            with self._lock:
+                contract = self._contracts.setdefault(key, contract)
+        return contract
+
+    def info(self, address: str) -> TokenInfo:
+        """Metadata for a token, read from the chain the first time it is seen"""
+        key = address.lower()
+        token = self._tokens.get(key)
+        if token is not None:
+            return token
+
+        functions = self.contract(address).functions
+        decimals = functions.decimals().call()
+        try:
+            symbol = functions.symbol().call()
+        except Exception as e:
+            # Some old tokens return bytes32 instead of a string
+            logger.debug(f"No string symbol for {address}: {e}")
+            symbol = None
+        return self.register(address, decimals, symbol)
+
+    def register(self, address: str, decimals: int, symbol: Optional[str]) -> TokenInfo:
+        """Record metadata read elsewhere (e.g. in a multicall batch)"""
+        token = TokenInfo(self.checksum(address), decimals, symbol)
+        with self._lock:
+            token = self._tokens.setdefault(address.lower(), token)
+        self._save()
+        return token
+
+    def known(self, address: str) -> Optional[TokenInfo]:
+        """Metadata if already known, without touching the chain"""
+        return self._tokens.get(address.lower())
+
+    def known_tokens(self) -> List[TokenInfo]:
+        """Every ERC-20 the registry holds, excluding the native pseudo-address"""
+        with self._lock:
+            return [token for key, token in self._tokens.items() if key != NATIVE_TOKEN.lower()]
+
+    def decimals(self, address: str) -> int:
+        return self.info(address).decimals
+
+    def to_raw(self, address: str, amount: Union[float, str, Decimal]) -> int:
+        """Convert a human amount of a token to its integer base units"""
+        return int(Decimal(str(amount)) * (10 ** self.decimals(address)))
+
+    def from_raw(self, address: str, amount: int) -> float:
+        """Convert integer base units of a token to a human amount"""
+        return amount / (10 ** self.decimals(address))
+
+
+def token_registry(web3: Web3, chain_id: int) -> TokenRegistry:
+    """Get the shared token registry for a chain"""
+    return shared_client("token-registry", chain_id, lambda: TokenRegistry(web3, chain_id))
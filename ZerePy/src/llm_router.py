@@ -0,0 +1,329 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger("llm_router")
+
+DEFAULT_EWMA_ALPHA = 0.2
+DEFAULT_WINDOW = 100  # latency samples kept per provider for p95
+DEFAULT_COOLDOWN = 30  # seconds a provider is skipped after consecutive failures
+FAILURES_BEFORE_COOLDOWN = 3
+ERROR_PENALTY = 4  # score cost of a 100% error rate (multiplier on latency, plus seconds)
+HEDGE_WORKERS = 8
+
+
+class ProviderStats:
+    """Latency and error tracking for one LLM provider"""
+
+    def __init__(self, name: str, alpha: float = DEFAULT_EWMA_ALPHA, window: int = DEFAULT_WINDOW):
+        self.name = name
+        self.alpha = alpha
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, success: bool, cooldown: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.error_rate += self.alpha * ((0.0 if success else 1.0) - self.error_rate)
+            if success:
+                self.consecutive_failures = 0
+                self._samples.append(latency)
+                if self.ewma_latency is None:
+                    self.ewma_latency = latency
+                else:
+                    self.ewma_latency += self.alpha * (latency - self.ewma_latency)
+            else:
+                self.failures += 1
+                self.consecutive_failures += 1
+                if self.consecutive_failures >= FAILURES_BEFORE_COOLDOWN:
+                    self.cooldown_until = time.monotonic() + cooldown
+
+    @property
+    def p95(self) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    @property
+    def cooling_down(self) -> bool:
+        return time.monotonic() < self.cooldown_until
+
+    def score(self) -> float:
+        """Lower is better; untried providers score 0 so they get a chance"""
+        # The additive term keeps a provider that has only ever failed (no latency yet) out of first place
+        penalty = ERROR_PENALTY * self.error_rate
+        return (self.ewma_latency or 0.0) * (1 + penalty) + penalty
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ewma_latency": self.ewma_latency,
+            "p95_latency": self.p95,
+            "error_rate": self.error_rate,
+            "requests": self.requests,
+            "failures": self.failures,
+            "cooling_down": self.cooling_down,
+        }
+
+
+class ProviderRouter:
+    """
+    Routes generate-text calls across every configured LLM provider.
+
+    Each call goes to the provider with the best latency/error score and fails
+    over down the ranking when a provider errors. Providers that fail
+    FAILURES_BEFORE_COOLDOWN times in a row are skipped for `cooldown` seconds.
+    With `hedge_after` set (seconds, or "p95" for the primary's own p95), a
+    second request goes to the next provider once the first runs past the
+    threshold, and whichever answers first wins.
+    """
+
+    def __init__(
+        self,
+        connection_manager,
+        providers: List[str],
+        hedge_after: Union[float, str, None] = None,
+        cooldown: float = DEFAULT_COOLDOWN,
+        alpha: float = DEFAULT_EWMA_ALPHA,
+        window: int = DEFAULT_WINDOW
+    ):
+        if not providers:
+            raise ValueError("No configured LLM provider found")
+        self.connection_manager = connection_manager
+        self.providers = list(providers)
+        self.hedge_after = hedge_after
+        self.cooldown = cooldown
+        self.stats_by_provider = {name: ProviderStats(name, alpha, window) for name in self.providers}
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, connection_manager, providers: List[str], config: Optional[Dict[str, Any]]) -> "ProviderRouter":
+        """Build from the agent's "llm_routing" section; "providers" there sets preference order"""
+        config = config or {}
+        preferred = [name for name in config.get("providers", []) if name in providers]
+        ordered = preferred + [name for name in providers if name not in preferred]
+        return cls(
+            connection_manager,
+            ordered,
+            hedge_after=config.get("hedge_after"),
+            cooldown=config.get("cooldown", DEFAULT_COOLDOWN),
+            alpha=config.get("ewma_alpha", DEFAULT_EWMA_ALPHA),
+            window=config.get("window", DEFAULT_WINDOW),
+        )
+
+    def ranked(self) -> List[str]:
+        """Providers best first; cooling-down ones go last but stay as a final fallback"""
+        # sorted() is stable, so ties keep the configured preference order
+        return sorted(
+            self.providers,
+            key=lambda name: (self.stats_by_provider[name].cooling_down, self.stats_by_provider[name].score()),
+        )
+
+    def _call(self, provider: str, action_name: str, params: List[Any]) -> Any:
+        started = time.monotonic()
+        result = self.connection_manager.perform_action(
+            connection_name=provider,
+            action_name=action_name,
+            params=params
+        )
+        # ConnectionManager logs failures and returns None
+        success = result is not None
+        self.stats_by_provider[provider].record(time.monotonic() - started, success, self.cooldown)
+        if not success:
+            raise RuntimeError(f"{action_name} failed on {provider}")
+        return result
+
+    def _hedge_delay(self, provider: str) -> Optional[float]:
+        if self.hedge_after == "p95":
+            return self.stats_by_provider[provider].p95
+        return self.hedge_after
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="llm-hedge")
+            return self._executor
+
+    def _submit(self, pool: ThreadPoolExecutor, provider: str, prompt: str, system_prompt: str) -> Future:
+        # Carry the caller's context (current action) into the worker so cache bypass still applies
+        context = contextvars.copy_context()
+        return pool.submit(context.run, self._call, provider, "generate-text", [prompt, system_prompt])
+
+    def generate(self, prompt: str, system_prompt: str) -> Optional[str]:
+        """Generate text on the best provider, failing over (and hedging) as configured"""
+        ranking = self.ranked()
+        index = 0
+        while index < len(ranking):
+            primary = ranking[index]
+            delay = self._hedge_delay(primary)
+            if delay is None or index + 1 >= len(ranking):
+                try:
+                    return self._call(primary, "generate-text", [prompt, system_prompt])
+                except Exception as e:
+                    logger.warning(f"{e}; failing over")
+                    index += 1
+                    continue
+
+            result, index = self._hedged(ranking, index, delay, prompt, system_prompt)
+            if result is not None:
+                return result
+
+        logger.error("All LLM providers failed")
+        return None
+
+    def _hedged(self, ranking: List[str], index: int, delay: float, prompt: str, system_prompt: str):
+        """Race ranking[index] against ranking[index + 1] once `delay` passes; returns (result, next index)"""
+        pool = self._pool()
+        primary = ranking[index]
+        futures: Dict[Future, str] = {
+            self._submit(pool, primary, prompt, system_prompt): primary
+        }
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            backup = ranking[index + 1]
+            self.hedges += 1
+            logger.info(f"{primary} slower than {delay:.2f}s, hedging on {backup}")
+            futures[self._submit(pool, backup, prompt, system_prompt)] = backup
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"{e}; failing over")
+                    continue
+                if futures[future] != primary:
+                    self.hedge_wins += 1
+                # The losing request finishes in the background and still updates its stats
+                return result, index
+        return None, index + len(futures)
+
+    async def _acall(self, provider: str, params: List[Any]) -> Any:
+        started = time.monotonic()
+        result = await self.connection_manager.aperform_action(
+            connection_name=provider,
+            action_name="generate-text",
+            params=params
+        )
+        success = result is not None
+        self.stats_by_provider[provider].record(time.monotonic() - started, success, self.cooldown)
+        if not success:
+            raise RuntimeError(f"generate-text failed on {provider}")
+        return result
+
+    async def agenerate(self, prompt: str, system_prompt: str) -> Optional[str]:
+        """generate() for async callers: same ranking, failover and hedging, without threads"""
+        ranking = self.ranked()
+        index = 0
+        while index < len(ranking):
+            primary = ranking[index]
+            tasks: Dict[asyncio.Task, str] = {
+                asyncio.ensure_future(self._acall(primary, [prompt, system_prompt])): primary
+            }
+            delay = self._hedge_delay(primary)
+            if delay is not None and index + 1 < len(ranking):
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    backup = ranking[index + 1]
+                    self.hedges += 1
+                    logger.info(f"{primary} slower than {delay:.2f}s, hedging on {backup}")
+                    tasks[asyncio.ensure_future(self._acall(backup, [prompt, system_prompt]))] = backup
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        logger.warning(f"{task.exception()}; failing over")
+                        continue
+                    if tasks[task] != primary:
+                        self.hedge_wins += 1
+                    # The losing request keeps running and still updates its stats
+                    for loser in pending:
+                        loser.add_done_callback(lambda t: t.cancelled() or t.exception())
+                    return task.result()
+            index += len(tasks)
+
+        logger.error("All LLM providers failed")
+        return None
+
+    def stream(self, prompt: str, system_prompt: str) -> Iterator[str]:
+        """
+        Stream from the best provider that starts answering
+
+        Latency is measured to the first chunk. Failover only happens before
+        that chunk; an error after it is raised to the caller. Completed streams
+        go into the LLM response cache under the provider that produced them.
+        """
+        for provider in self.ranked():
+            connection = self.connection_manager.connections[provider]
+            if "stream-text" not in connection.actions:
+                # generate-text is cached per provider by the connection manager
+                try:
+                    yield self._call(provider, "generate-text", [prompt, system_prompt])
+                    return
+                except Exception as e:
+                    logger.warning(f"{e}; failing over")
+                    continue
+
+            cache = self.connection_manager.llm_cache
+            key = self.connection_manager.llm_cache_key(provider, {"prompt": prompt, "system_prompt": system_prompt})
+            if key is not None:
+                cached = cache.get(key)
+                if cached is not None:
+                    yield cached
+                    return
+
+            stats = self.stats_by_provider[provider]
+            started = time.monotonic()
+            try:
+                chunks = self.connection_manager.perform_action(
+                    connection_name=provider,
+                    action_name="stream-text",
+                    params=[prompt, system_prompt]
+                )
+                if chunks is None:
+                    raise RuntimeError(f"stream-text failed on {provider}")
+                chunks = iter(chunks)
+                first = next(chunks, None)
+            except Exception as e:
+                stats.record(time.monotonic() - started, False, self.cooldown)
+                logger.warning(f"Streaming from {provider} failed: {e}; failing over")
+                continue
+            stats.record(time.monotonic() - started, True, self.cooldown)
+            parts = []
+            if first is not None:
+                parts.append(first)
+                yield first
+            for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+            if key is not None and parts:
+                cache.put(key, "".join(parts))
+            return
+        raise RuntimeError("All LLM providers failed")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "providers": {name: stats.snapshot() for name, stats in self.stats_by_provider.items()},
+            "ranking": self.ranked(),
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
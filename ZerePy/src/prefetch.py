@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+logger = logging.getLogger("prefetch")
+
+DEFAULT_BUFFER_SIZE = 50
+DEFAULT_LOW_WATER = 3
+DEFAULT_REFRESH_INTERVAL = 300  # seconds between refreshes even when nothing was consumed
+DEFAULT_MIN_INTERVAL = 60  # seconds between low-water refills of the same input
+DEFAULT_SEEN_SIZE = 1000
+FETCH_RETRY_DELAY = 30
+
+
+class InputBuffer:
+    """
+    Bounded, thread-safe FIFO of prefetched agent inputs.
+
+    Items are deduplicated by `key` against a bounded memory of everything
+    queued this session and, through `seen`, of everything already handled, so
+    re-reading a timeline or room history only adds new items. Handlers report
+    finished items with done(); queued but unhandled items are fetched again
+    after a restart. Once the buffer is full, further items are left for a
+    later refill. When a
+    take() leaves the buffer at or below `low_water`, registered listeners are
+    notified so a producer can top it up before it runs dry.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxlen: int = DEFAULT_BUFFER_SIZE,
+        low_water: int = DEFAULT_LOW_WATER,
+        key: Optional[Callable[[Any], Any]] = None,
+        seen_size: int = DEFAULT_SEEN_SIZE,
+        seen: Optional[Any] = None
+    ):
+        self.name = name
+        self.low_water = low_water
+        self.maxlen = maxlen
+        self._items: deque = deque()
+        self._key = key
+        # Handled items: any object with `in` / add(), e.g. a persistent TTLSet so dedup survives restarts
+        self._seen = seen
+        self._recent: "OrderedDict[Any, None]" = OrderedDict()
+        self._seen_size = seen_size
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add_low_water_listener(self, listener: Callable[[], None]) -> None:
+        self._listeners.append(listener)
+
+    def remove_low_water_listener(self, listener: Callable[[], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def needs_refill(self) -> bool:
+        return len(self._items) <= self.low_water
+
+    def extend(self, items: Optional[Iterable[Any]]) -> int:
+        """Queue new items, skipping ones already seen; returns how many were added"""
+        added = 0
+        with self._lock:
+            for item in items or []:
+                if len(self._items) >= self.maxlen:
+                    # Not remembered, so the next fetch queues it once there is room
+                    break
+                key = self._key(item) if self._key else None
+                if key is not None:
+                    if self._was_seen(key):
+                        continue
+                    self._mark_seen(key)
+                self._items.append(item)
+                added += 1
+        return added
+
+    def _was_seen(self, key: Any) -> bool:
+        return key in self._recent or (self._seen is not None and key in self._seen)
+
+    def _mark_seen(self, key: Any) -> None:
+        self._recent[key] = None
+        if len(self._recent) > self._seen_size:
+            self._recent.popitem(last=False)
+
+    def take(self) -> Optional[Any]:
+        """Pop the oldest item without blocking; None when the buffer is empty"""
+        with self._lock:
+            item = self._items.popleft() if self._items else None
+            low = len(self._items) <= self.low_water
+        if low:
+            for listener in self._listeners:
+                listener()
+        return item
+
+    def requeue(self, items: Iterable[Any]) -> None:
+        """Put taken but unhandled items back at the front, in their original order"""
+        with self._lock:
+            self._items.extendleft(reversed(list(items)))
+
+    def done(self, item: Any) -> None:
+        """Record a taken item as handled so it is skipped even after a restart"""
+        key = self._key(item) if self._key else None
+        if key is not None and self._seen is not None:
+            self._seen.add(key)
+
+
+class InputProducer:
+    """
+    Keeps one agent input fresh in the background.
+
+    With a `buffer`, fetched items are queued into it (deduplicated); otherwise the
+    fetched value replaces `state[name]` outright (e.g. room info).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Any],
+        state: dict,
+        buffer: Optional[InputBuffer] = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        min_interval: float = DEFAULT_MIN_INTERVAL
+    ):
+        self.name = name
+        self.fetch = fetch
+        self.state = state
+        self.buffer = buffer
+        self.refresh_interval = refresh_interval
+        self.min_interval = min(min_interval, refresh_interval)
+        self.last_refresh: Optional[float] = None
+
+    def needs_refresh(self) -> bool:
+        if self.buffer is not None:
+            return self.buffer.needs_refill()
+        return self.state.get(self.name) is None
+
+    def refresh(self) -> None:
+        """Fetch once (blocking) and publish the result"""
+        logger.info(f"\n👀 PREFETCHING {self.name.upper()}")
+        result = self.fetch()
+        self.last_refresh = time.monotonic()
+        if self.buffer is not None:
+            added = self.buffer.extend(result)
+            logger.debug(f"Queued {added} new items into {self.name} ({len(self.buffer)} ready)")
+        elif result is not None:
+            self.state[self.name] = result
+
+    async def run(self, run_blocking: Callable[..., Awaitable[Any]], stop_event: asyncio.Event) -> None:
+        """Refresh when the input runs low or goes stale, until stop_event is set"""
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        listener = lambda: loop.call_soon_threadsafe(wakeup.set)
+        if self.buffer is not None:
+            self.buffer.add_low_water_listener(listener)
+        try:
+            await self._run(run_blocking, stop_event, wakeup)
+        finally:
+            if self.buffer is not None:
+                self.buffer.remove_low_water_listener(listener)
+
+    async def _run(self, run_blocking, stop_event: asyncio.Event, wakeup: asyncio.Event) -> None:
+        while not stop_event.is_set():
+            since = None if self.last_refresh is None else time.monotonic() - self.last_refresh
+            if since is None or since >= self.refresh_interval or (self.needs_refresh() and since >= self.min_interval):
+                delay = self.refresh_interval
+                try:
+                    await run_blocking(self.refresh)
+                except Exception as e:
+                    logger.error(f"Failed to prefetch {self.name}: {e}")
+                    delay = min(self.refresh_interval, FETCH_RETRY_DELAY)
+            elif self.needs_refresh():
+                # Running low, but don't hammer the API when a refill brought nothing new
+                delay = self.min_interval - since
+            else:
+                delay = self.refresh_interval - since
+
+            wakeup.clear()
+            waiters = [asyncio.ensure_future(wakeup.wait()), asyncio.ensure_future(stop_event.wait())]
+            try:
+                await asyncio.wait(waiters, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for waiter in waiters:
+                    waiter.cancel()
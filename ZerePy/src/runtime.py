@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from src.action_handler import aexecute_action, execute_action, is_async_action
+from src.helpers import print_h_bar
+from src.scheduler import TaskScheduler
+
+logger = logging.getLogger("runtime")
+
+DEFAULT_MAX_CONCURRENCY = 2
+DEFAULT_RETRY_DELAY = 60  # seconds before retrying a task whose action failed
+CADENCE_JITTER = 0.25  # +/- fraction applied to each task's interval
+
+
+class AgentRuntime:
+    """
+    Asyncio runtime that drives an agent's tasks.
+
+    A TaskScheduler decides which task is due next; the runtime sleeps until that
+    deadline (or until a finished task reschedules something earlier) and then
+    dispatches it. Actions are blocking, so they run on a bounded thread pool with
+    at most `max_concurrency` in flight; a task is never queued while it is running.
+    Agent inputs are kept ready by the agent's InputProducers running alongside.
+    """
+
+    def __init__(self, agent, max_concurrency: Optional[int] = None, retry_delay: Optional[float] = None):
+        config = getattr(agent, "runtime_config", {}) or {}
+        self.agent = agent
+        self.max_concurrency = max(1, max_concurrency or config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY))
+        self.retry_delay = retry_delay if retry_delay is not None else config.get("retry_delay", DEFAULT_RETRY_DELAY)
+        self.scheduler = TaskScheduler(agent)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stop_requested = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Task name -> {"runs", "failures", "last_run", "next_run"} for status reporting
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None and not self._stop_requested.is_set()
+
+    def stop(self) -> None:
+        """Ask the runtime to stop; safe to call from any thread"""
+        self._stop_requested.set()
+        loop, stop_event = self._loop, self._stop_event
+        if loop is None or stop_event is None or loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            stop_event.set()
+        else:
+            loop.call_soon_threadsafe(stop_event.set)
+
+    async def run(self) -> None:
+        """Run all agent tasks until stop() is called"""
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        if self._stop_requested.is_set():
+            self._stop_event.set()
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        # One extra thread per input producer so prefetching never waits behind actions
+        input_producers = getattr(self.agent, "input_producers", [])
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency + len(input_producers),
+            thread_name_prefix="agent-task"
+        )
+        in_flight = set()
+        producers = []
+
+        try:
+            if not self.agent.is_llm_set:
+                await self._run_blocking(self.agent._setup_llm_provider)
+
+            # Fill inputs once up front, then let producers keep them topped up
+            await asyncio.gather(
+                *(self._run_blocking(producer.refresh) for producer in input_producers),
+                return_exceptions=True
+            )
+            producers = [
+                asyncio.create_task(producer.run(self._run_blocking, self._stop_event), name=f"prefetch:{producer.name}")
+                for producer in input_producers
+            ]
+
+            self.scheduler.start()
+            if not len(self.scheduler):
+                logger.warning("No runnable tasks configured for this agent")
+                return
+            logger.info(f"\n🚀 Running {len(self.scheduler)} tasks (max {self.max_concurrency} concurrent)")
+
+            while not self._stop_event.is_set():
+                await self._semaphore.acquire()
+                task_name = self.scheduler.pop_due()
+                if task_name is None:
+                    self._semaphore.release()
+                    deadline = self.scheduler.next_deadline()
+                    await self._wait(None if deadline is None else max(0.0, deadline - time.time()))
+                    continue
+
+                job = asyncio.create_task(self._run_task(task_name), name=f"task:{task_name}")
+                in_flight.add(job)
+                job.add_done_callback(in_flight.discard)
+
+            for job in list(in_flight):
+                job.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        finally:
+            for producer in producers:
+                producer.cancel()
+            await asyncio.gather(*producers, return_exceptions=True)
+            # Actions already running in threads are left to finish on their own
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._loop = None
+            self._stop_event = None
+            logger.info("\n🛑 Agent runtime stopped.")
+
+    async def _run_blocking(self, func, *args):
+        return await self._loop.run_in_executor(self._executor, func, *args)
+
+    async def _wait(self, timeout: Optional[float]) -> None:
+        """Sleep until the timeout, a reschedule, or stop() - whichever comes first"""
+        self._wakeup.clear()
+        waiters = [asyncio.ensure_future(self._wakeup.wait()), asyncio.ensure_future(self._stop_event.wait())]
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def _run_task(self, action_name: str) -> None:
+        stats = self.stats.setdefault(action_name, {"runs": 0, "failures": 0, "last_run": None, "next_run": None})
+        success = False
+        try:
+            logger.info(f"\n▶️ Running task {action_name}")
+            if is_async_action(action_name):
+                success = await aexecute_action(self.agent, action_name)
+            else:
+                success = await self._run_blocking(execute_action, self.agent, action_name)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"\n❌ Error running task {action_name}: {e}")
+        finally:
+            self._semaphore.release()
+
+        stats["runs"] += 1
+        stats["last_run"] = datetime.now().isoformat()
+        if not success:
+            stats["failures"] += 1
+
+        try:
+            due = self.scheduler.reschedule(action_name, bool(success), self.retry_delay, CADENCE_JITTER)
+            stats["next_run"] = datetime.fromtimestamp(due).isoformat() if math.isfinite(due) else None
+            logger.info(f"\n⏳ Next {action_name} in {max(0.0, due - time.time()):.0f} seconds")
+            print_h_bar()
+        finally:
+            self._wakeup.set()
@@ -0,0 +1,123 @@
+import heapq
+import itertools
+import random
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.action_handler import eligible_at
+
+# A task whose time based weight is currently 0 is looked at again after this many seconds
+ZERO_WEIGHT_RECHECK = 600
+
+
+class TaskScheduler:
+    """
+    Deadline-driven task selection for an agent.
+
+    Every task sits in a min-heap keyed by the time it is next due: the later of
+    its cadence deadline and the moment its action becomes eligible (e.g. the
+    tweet_interval has elapsed). Only due tasks are ever picked; when several are
+    due at once the JSON `weight` (with time_based_multipliers applied) decides,
+    just like the old random.choices draw. A task's cadence is
+    loop_delay * total_weight / weight, its average rate under the old loop.
+    """
+
+    def __init__(self, agent, clock: Callable[[], float] = time.time):
+        self.agent = agent
+        self.clock = clock
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._tasks: Dict[str, Dict[str, Any]] = {task["name"]: task for task in agent.tasks}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def current_weights(self) -> Dict[str, float]:
+        """Task name -> weight, adjusted for the hour when time based weights are on"""
+        weights = list(self.agent.task_weights)
+        if self.agent.use_time_based_weights:
+            weights = self.agent._adjust_weights_for_time(datetime.now().hour, weights)
+        return {task["name"]: weight for task, weight in zip(self.agent.tasks, weights)}
+
+    def interval(self, task_name: str) -> float:
+        """Average seconds between runs of a task"""
+        task = self._tasks[task_name]
+        if task.get("interval"):
+            return float(task["interval"])
+
+        weights = self.current_weights()
+        weight, total = weights[task_name], sum(weights.values())
+        if weight <= 0 or total <= 0:
+            # Switched off for now (e.g. a 0 night multiplier); check back once the weights may have changed
+            return float(ZERO_WEIGHT_RECHECK)
+        return self.agent.loop_delay * total / weight
+
+    def _switched_off(self, task_name: str, weights: Dict[str, float]) -> bool:
+        """True for a weighted task whose current time based weight is 0"""
+        return not self._tasks[task_name].get("interval") and weights.get(task_name, 0) <= 0
+
+    def runnable_tasks(self) -> List[str]:
+        return [
+            name for name, task in self._tasks.items()
+            if task.get("weight", 0) > 0 or task.get("interval")
+        ]
+
+    def schedule(self, task_name: str, at: float) -> None:
+        """Queue a task for `at`, or later if its action isn't eligible by then"""
+        due = max(at, eligible_at(self.agent, task_name))
+        heapq.heappush(self._heap, (due, next(self._counter), task_name))
+
+    def start(self, stagger: bool = True) -> None:
+        """Queue every runnable task, spreading first runs over one loop_delay"""
+        now = self.clock()
+        for name in self.runnable_tasks():
+            offset = random.uniform(0, min(self.interval(name), self.agent.loop_delay)) if stagger else 0
+            self.schedule(name, now + offset)
+
+    def next_deadline(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self) -> Optional[str]:
+        """
+        Remove and return one task that is due and eligible now, or None.
+
+        Eligibility is re-checked at pop time since other actions may have moved it;
+        tasks that turn out not to be eligible are pushed back to their new time.
+        """
+        now = self.clock()
+        weights = self.current_weights()
+        due: List[Tuple[float, int, str]] = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            ready_at = eligible_at(self.agent, entry[2])
+            if self._switched_off(entry[2], weights):
+                ready_at = max(ready_at, now + ZERO_WEIGHT_RECHECK)
+            if ready_at > now:
+                heapq.heappush(self._heap, (ready_at, next(self._counter), entry[2]))
+            else:
+                due.append(entry)
+
+        if not due:
+            return None
+
+        # Tasks driven purely by an explicit interval have no weight; treat them as 1
+        choice_weights = [weights.get(name) or 1 for _, _, name in due]
+        chosen = random.choices(due, weights=choice_weights, k=1)[0]
+        for entry in due:
+            if entry is not chosen:
+                heapq.heappush(self._heap, entry)
+        return chosen[2]
+
+    def reschedule(self, task_name: str, success: bool, retry_delay: float, jitter: float = 0.0) -> float:
+        """Queue a task again after it ran; returns its new due time"""
+        now = self.clock()
+        if success:
+            delay = self.interval(task_name) * random.uniform(1 - jitter, 1 + jitter)
+        else:
+            delay = min(retry_delay, self.interval(task_name))
+        self.schedule(task_name, now + delay)
+        return self._due_time(task_name)
+
+    def _due_time(self, task_name: str) -> float:
+        return min(due for due, _, name in self._heap if name == task_name)
@@ -1,7 +1,7 @@
 import uvicorn
 from .app import create_app
 
-def start_server(host: str = "0.0.0.0", port: int = 8000):
-    """Start the ZerePy server"""
-    app = create_app()
+def start_server(host: str = "0.0.0.0", port: int = 8000, supervisor=None):
+    """Start the ZerePy server, optionally exposing a running agent supervisor"""
+    app = create_app(supervisor=supervisor)
     uvicorn.run(app, host=host, port=port)
\ No newline at end of file
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.agent import ZerePyAgent
+from src.runtime import AgentRuntime
+
+logger = logging.getLogger("server/agent_pool")
+
+DEFAULT_MAX_AGENTS = 16
+DEFAULT_SESSION_TTL = 3600  # seconds a call session stays bound to its agent after last use
+
+
+class HostedAgent:
+    """A loaded agent plus the runtime driving it, if started"""
+
+    def __init__(self, name: str, agent: ZerePyAgent):
+        self.name = name
+        self.agent = agent
+        self.runtime: Optional[AgentRuntime] = None
+        self.task: Optional[asyncio.Task] = None
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def close(self) -> None:
+        """Flush and close the agent's state store once it leaves the pool"""
+        try:
+            self.agent.state.close()
+        except Exception as e:
+            logger.error(f"Failed to close state for agent {self.name}: {e}")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "agent": self.agent.name,
+            "running": self.running,
+            "loaded_at": self.loaded_at,
+            "last_used": self.last_used,
+            "connections": list(self.agent.connection_manager.connections),
+            "tasks": self.runtime.stats if self.runtime else {},
+            "llm_providers": self.agent.llm_router.stats() if self.agent.llm_router else {},
+            "context": self.agent.context.stats(),
+        }
+
+
+class AgentPool:
+    """
+    LRU pool of agents hosted by one server process.
+
+    Agents are addressed by their file name or by a call session bound to one.
+    Loading an agent that is already pooled is a cache hit, so repeat calls skip
+    rebuilding its connections; connections share SDK/web3 clients through
+    src.connections.client_pool. When the pool is full the least recently used
+    idle agent is dropped; running agents are never evicted.
+    """
+
+    def __init__(
+        self,
+        max_agents: int = DEFAULT_MAX_AGENTS,
+        session_ttl: float = DEFAULT_SESSION_TTL,
+        loader: Callable[[str], ZerePyAgent] = ZerePyAgent
+    ):
+        self.max_agents = max_agents
+        self.session_ttl = session_ttl
+        self._loader = loader
+        self._agents: "OrderedDict[str, HostedAgent]" = OrderedDict()
+        self._sessions: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._agents
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def get(self, name: str) -> Optional[HostedAgent]:
+        """Get a pooled agent and mark it as recently used"""
+        with self._lock:
+            hosted = self._agents.get(name)
+            if hosted:
+                self._agents.move_to_end(name)
+                hosted.last_used = time.time()
+            return hosted
+
+    def load(self, name: str, reload: bool = False) -> HostedAgent:
+        """
+        Get an agent from the pool, building it on a miss (blocking)
+
+        Raises:
+            Whatever ZerePyAgent raises for a missing or invalid agent file
+        """
+        if not reload:
+            hosted = self.get(name)
+            if hosted:
+                self.hits += 1
+                return hosted
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # Concurrent loads of the same agent build it once
+        with load_lock:
+            if not reload:
+                hosted = self.get(name)
+                if hosted:
+                    self.hits += 1
+                    return hosted
+
+            previous = self._agents.get(name)
+            if previous and previous.running:
+                raise ValueError(f"Agent {name} is running; stop it before reloading")
+
+            if previous:
+                # The rebuilt agent opens the same state file, so it must see every pending write
+                previous.agent.state.flush()
+
+            self.misses += 1
+            logger.info(f"Building agent {name}")
+            return self.adopt(name, self._loader(name))
+
+    def adopt(self, name: str, agent: ZerePyAgent) -> HostedAgent:
+        """Put an already built agent into the pool under `name`"""
+        hosted = HostedAgent(name, agent)
+        with self._lock:
+            replaced = self._agents.get(name)
+            self._agents[name] = hosted
+            self._agents.move_to_end(name)
+            dropped = self._evict_overflow()
+        if replaced and replaced.agent is not agent:
+            dropped.append(replaced)
+        # Closing flushes to disk, so it happens outside the pool lock
+        for old in dropped:
+            old.close()
+        return hosted
+
+    def _evict_overflow(self) -> List[HostedAgent]:
+        """Drop least recently used idle agents until the pool fits (lock held); returns them"""
+        evicted = []
+        for name in list(self._agents):
+            if len(self._agents) <= self.max_agents:
+                break
+            if not self._agents[name].running:
+                logger.info(f"Evicting idle agent {name} from pool")
+                evicted.append(self._agents.pop(name))
+                self._sessions = {
+                    session: entry for session, entry in self._sessions.items() if entry[0] != name
+                }
+        return evicted
+
+    def bind_session(self, session_id: str, name: str) -> None:
+        """Route later requests from a call session to the given agent"""
+        with self._lock:
+            self._sessions[session_id] = (name, time.time())
+
+    def resolve(self, name: Optional[str] = None, session_id: Optional[str] = None) -> Optional[HostedAgent]:
+        """Find a pooled agent by explicit name first, then by call session"""
+        if name:
+            return self.get(name)
+        if session_id:
+            with self._lock:
+                entry = self._sessions.get(session_id)
+                if entry and time.time() - entry[1] > self.session_ttl:
+                    del self._sessions[session_id]
+                    entry = None
+                if entry:
+                    self._sessions[session_id] = (entry[0], time.time())
+            if entry:
+                return self.get(entry[0])
+        return None
+
+    def agents(self) -> List[HostedAgent]:
+        with self._lock:
+            return list(self._agents.values())
+
+    async def start(self, name: str) -> HostedAgent:
+        """Start an agent's runtime as a task on the running event loop"""
+        hosted = self.get(name)
+        if not hosted:
+            raise ValueError(f"Agent {name} is not loaded")
+        if hosted.running:
+            raise ValueError(f"Agent {name} already running")
+
+        hosted.runtime = AgentRuntime(hosted.agent)
+        hosted.task = asyncio.create_task(self._run(hosted), name=f"agent:{name}")
+        return hosted
+
+    async def _run(self, hosted: HostedAgent) -> None:
+        try:
+            await hosted.runtime.run()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error in agent loop for {hosted.name}: {e}")
+        finally:
+            logger.info(f"Agent loop stopped for {hosted.name}")
+
+    async def stop(self, name: str, timeout: float = 5) -> None:
+        """Stop an agent's runtime, cancelling it if it doesn't finish in time"""
+        hosted = self.get(name)
+        if not hosted or not hosted.running:
+            return
+        hosted.runtime.stop()
+        try:
+            await asyncio.wait_for(asyncio.shield(hosted.task), timeout=timeout)
+        except asyncio.TimeoutError:
+            hosted.task.cancel()
+
+    async def stop_all(self) -> None:
+        await asyncio.gather(*(self.stop(hosted.name) for hosted in self.agents()))
+
+    def invalidate_configuration_status(self) -> None:
+        """Force every pooled agent's connections to re-check their configuration"""
+        for hosted in self.agents():
+            hosted.agent.connection_manager.invalidate_configuration_status()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": len(self._agents),
+            "running": sum(1 for hosted in self.agents() if hosted.running),
+            "max_agents": self.max_agents,
+            "sessions": len(self._sessions),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -1,20 +1,67 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
 import logging
 import asyncio
+import json
 import signal
-import threading
 from pathlib import Path
 from src.cli import ZerePyCLI
+from src.connections.base_connection import is_auth_error
+from src.helpers.credentials import credential_store
+from src.server.agent_pool import AgentPool, HostedAgent
+from src.connections.client_pool import client_pool_stats
 from fastapi.middleware.cors import CORSMiddleware
-from src.connections.goat_connection import GoatConnection
+from fastapi.responses import StreamingResponse
 import requests 
 
+if TYPE_CHECKING:
+    from src.agent import ZerePyAgent
+    from src.supervisor import AgentSupervisor
+    from src.connections.goat_connection import GoatConnection
+
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("server/app")
 
+
+async def _requested_agent(request: Request) -> Optional[str]:
+    """Agent name from an optional JSON body ({"agent": ...} or Retell {"args": {"name": ...}})"""
+    try:
+        body = await request.json()
+    except Exception:
+        return None
+    if not isinstance(body, dict):
+        return None
+    args = body.get("args") or {}
+    return body.get("agent") or args.get("agent") or args.get("name")
+
+
+def _sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format one server-sent event"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+def _stream_chat(agent, message: str):
+    """SSE frames for a streamed chat reply: one per chunk, then done (or error)"""
+    parts = []
+    try:
+        for chunk in agent.stream_llm(message):
+            parts.append(chunk)
+            yield _sse({"delta": chunk})
+    except Exception as e:
+        logger.error(f"Chat stream failed: {str(e)}")
+        yield _sse({"detail": str(e)}, event="error")
+        return
+    yield _sse({"response": "".join(parts)}, event="done")
+
+
+def _call_session(post_data: Dict[str, Any]) -> Optional[str]:
+    """Call id of a Retell function-call payload, used to route the call to its agent"""
+    call = post_data.get("call") or {}
+    return call.get("call_id") if isinstance(call, dict) else None
+
 class ActionRequest(BaseModel):
     connection: str
     action: str
@@ -36,56 +83,50 @@ class ConfigureRequest(BaseModel):
     params: Optional[Dict[str, Any]] = {}
 
 class ServerState:
-    """Simple state management for the server"""
+    """Server state: a pool of hosted agents plus the CLI whose agent is the default target"""
     def __init__(self):
         self.cli = ZerePyCLI()
-        self.agent_running = False
-        self.agent_task = None
-        self._stop_event = threading.Event()
-
-    def _run_agent_loop(self):
-        """Run agent loop in a separate thread"""
-        try:
-            log_once = False
-            while not self._stop_event.is_set():
-                if self.cli.agent:
-                    try:
-                        if not log_once:
-                            logger.info("Loop logic not implemented")
-                            log_once = True
-
-                    except Exception as e:
-                        logger.error(f"Error in agent action: {e}")
-                        if self._stop_event.wait(timeout=30):
-                            break
-        except Exception as e:
-            logger.error(f"Error in agent loop thread: {e}")
-        finally:
-            self.agent_running = False
-            logger.info("Agent loop stopped")
-
-    async def start_agent_loop(self):
-        """Start the agent loop in background thread"""
-        if not self.cli.agent:
+        self.agents = AgentPool()
+        # Pool key of the agent that cli.agent points at (the last one loaded)
+        self.default_agent: Optional[str] = None
+
+    @property
+    def agent_running(self) -> bool:
+        hosted = self.agents.get(self.default_agent) if self.default_agent else None
+        return bool(hosted and hosted.running)
+
+    def resolve_agent(self, name: Optional[str] = None, session_id: Optional[str] = None) -> Optional["ZerePyAgent"]:
+        """Find the agent a request is addressed to, falling back to the default agent"""
+        hosted = self.agents.resolve(name, session_id)
+        if hosted:
+            return hosted.agent
+        if name:
+            return None
+        return self.cli.agent
+
+    async def load_agent(self, name: str, session_id: Optional[str] = None) -> HostedAgent:
+        """Load (or reuse) a pooled agent and make it the default"""
+        hosted = await asyncio.to_thread(self.agents.load, name)
+        if session_id:
+            self.agents.bind_session(session_id, name)
+        self.cli.agent = hosted.agent
+        self.default_agent = name
+        return hosted
+
+    async def start_agent_loop(self, name: Optional[str] = None):
+        """Start an agent's runtime as a background task on the server's event loop"""
+        name = name or self.default_agent
+        if not name or name not in self.agents:
             raise ValueError("No agent loaded")
-        
-        if self.agent_running:
-            raise ValueError("Agent already running")
-
-        self.agent_running = True
-        self._stop_event.clear()
-        self.agent_task = threading.Thread(target=self._run_agent_loop)
-        self.agent_task.start()
-
-    async def stop_agent_loop(self):
-        """Stop the agent loop"""
-        if self.agent_running:
-            self._stop_event.set()
-            if self.agent_task:
-                self.agent_task.join(timeout=5)
-            self.agent_running = False
-
-    def get_goat_connection(self) -> Optional[GoatConnection]:
+        await self.agents.start(name)
+
+    async def stop_agent_loop(self, name: Optional[str] = None):
+        """Stop an agent's runtime"""
+        name = name or self.default_agent
+        if name:
+            await self.agents.stop(name)
+
+    def get_goat_connection(self) -> Optional["GoatConnection"]:
         """Helper method to get GOAT connection from current agent"""
         if not self.cli.agent:
             return None
@@ -93,8 +134,9 @@ class ServerState:
 
 
 class ZerePyServer:
-    def __init__(self):
+    def __init__(self, supervisor: Optional["AgentSupervisor"] = None):
         self.app = FastAPI(title="ZerePy Server")
+        self.supervisor = supervisor
 
         # Add CORS middleware properly within the class initialization
         self.app.add_middleware(
@@ -116,6 +158,12 @@ class ZerePyServer:
         self.state = ServerState()
         self.setup_routes()
 
+        @self.app.on_event("shutdown")
+        async def stop_hosted_agents():
+            await self.state.agents.stop_all()
+            if self.supervisor:
+                await asyncio.to_thread(self.supervisor.stop)
+
     def format_env_data(self, form_data: EnvFormData) -> str:
         """Convert form data into .env file format"""
         return f"""# Sonic Configuration
@@ -146,7 +194,8 @@ TOGETHER_KEY={form_data.ai.get("togetherKey", "")}""".strip()
             return {
                 "status": "running",
                 "agent": self.state.cli.agent.name if self.state.cli.agent else None,
-                "agent_running": self.state.agent_running
+                "agent_running": self.state.agent_running,
+                "hosted_agents": len(self.state.agents)
             }
 
         @self.app.get("/agents")
@@ -163,6 +212,29 @@ TOGETHER_KEY={form_data.ai.get("togetherKey", "")}""".strip()
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @self.app.get("/supervisor/status")
+        async def supervisor_status():
+            """Worker processes and the agents each one runs (supervisor mode only)"""
+            if not self.supervisor:
+                raise HTTPException(status_code=404, detail="Supervisor mode is not enabled")
+            return self.supervisor.status()
+
+        @self.app.get("/supervisor/stats")
+        async def supervisor_stats():
+            """Totals across all worker processes (supervisor mode only)"""
+            if not self.supervisor:
+                raise HTTPException(status_code=404, detail="Supervisor mode is not enabled")
+            return self.supervisor.stats()
+
+        @self.app.get("/agents/loaded")
+        async def list_loaded_agents():
+            """List agents hosted in this process, most recently used last"""
+            return {
+                "agents": [hosted.status() for hosted in self.state.agents.agents()],
+                "pool": self.state.agents.stats(),
+                "shared_clients": client_pool_stats()
+            }
+
 
         @self.app.post("/retell/load-agent")
         async def load_agent(request: Request):
@@ -180,13 +252,14 @@ TOGETHER_KEY={form_data.ai.get("togetherKey", "")}""".strip()
                 # Log the incoming request
                 logger.info(f"Loading agent with name: {agent_name}")
                 
-                # Load the agent
-                self.state.cli._load_agent_from_file(agent_name)
+                # Reuse the pooled agent or build it off the event loop; connection handshakes block
+                hosted = await self.state.load_agent(agent_name, session_id=_call_session(post_data))
                 
-                # Return success response
+                # Return success response with per-connection startup timings
                 return {
                     "message": "success",
-                    "agent": agent_name
+                    "agent": agent_name,
+                    "startup": hosted.agent.connection_manager.startup_report
                 }
                     
             except Exception as e:
@@ -205,7 +278,7 @@ TOGETHER_KEY={form_data.ai.get("togetherKey", "")}""".strip()
                 connections = {}
                 for name, conn in self.state.cli.agent.connection_manager.connections.items():
                     connections[name] = {
-                        "configured": conn.is_configured(),
+                        "configured": conn.is_configured_cached(),
                         "is_llm_provider": conn.is_llm_provider
                     }
                 return {"connections": connections}
@@ -235,23 +308,25 @@ TOGETHER_KEY={form_data.ai.get("togetherKey", "")}""".strip()
                 # Log the extracted parameters
                 logger.info(f"Processing action request: connection={connection_name}, action={action_name}, params={action_params}")
                 
-                # Validate agent is loaded
-                if not self.state.cli.agent:
+                # Resolve the target agent: explicit name, then the call's session, then the default
+                agent = self.state.resolve_agent(args.get("agent"), _call_session(post_data))
+                if not agent:
                     logger.error("No agent loaded")
                     return {"message": "error", "detail": "No agent loaded"}
                 
                 # Get the connection
-                connection = self.state.cli.agent.connection_manager.connections.get(connection_name)
+                connection = agent.connection_manager.connections.get(connection_name)
                 if not connection:
                     logger.error(f"Connection {connection_name} not found")
                     return {"message": "error", "detail": f"Connection {connection_name} not found"}
                 
-                # Run the action in a thread pool
-                result = await asyncio.to_thread(
-                    connection.perform_action,
-                    action_name,
-                    **action_params
-                )
+                # Async-native actions are awaited here; sync ones run in a worker thread
+                try:
+                    result = await connection.aperform_action(action_name, action_params)
+                except Exception as e:
+                    if is_auth_error(e):
+                        connection.invalidate_configuration_status()
+                    raise
                 
                 # Validate result
                 if result is None:
@@ -273,23 +348,31 @@ TOGETHER_KEY={form_data.ai.get("togetherKey", "")}""".strip()
 
 
         @self.app.post("/agent/chat")
-        async def agent_chat(chat_request: Dict[str, Any]):
-            """Handle chat requests"""
+        async def agent_chat(chat_request: Dict[str, Any], request: Request):
+            """Handle chat requests; streams SSE when asked via "stream": true or Accept: text/event-stream"""
             try:
-                if not self.state.cli.agent:
+                agent = self.state.resolve_agent(chat_request.get("agent"), chat_request.get("session_id"))
+                if not agent:
                     raise HTTPException(status_code=400, detail="No agent loaded")
 
                 # Ensure the LLM provider is set up
-                if not self.state.cli.agent.is_llm_set:
-                    self.state.cli.agent._setup_llm_provider()
+                if not agent.is_llm_set:
+                    agent._setup_llm_provider()
 
                 # Get the user's message
                 user_message = chat_request.get("message")
                 if not user_message:
                     raise HTTPException(status_code=400, detail="Message is required")
 
+                if chat_request.get("stream") or "text/event-stream" in request.headers.get("accept", ""):
+                    return StreamingResponse(
+                        _stream_chat(agent, user_message),
+                        media_type="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+                    )
+
                 # Get the agent's response
-                response = self.state.cli.agent.prompt_llm(user_message)
+                response = await agent.aprompt_llm(user_message)
                 return {"status": "success", "response": response}
             except Exception as e:
                 logger.error(f"Chat failed: {str(e)}")
@@ -315,12 +398,12 @@ TOGETHER_KEY={form_data.ai.get("togetherKey", "")}""".strip()
                 logger.info("Incoming request to /agent/start")
                 
                 # Validate agent is loaded
-                if not self.state.cli.agent:
+                if not self.state.cli.agent and not self.state.agents.agents():
                     logger.error("No agent loaded")
                     return {"message": "error", "detail": "No agent loaded"}
                 
-                # Start the agent loop
-                await self.state.start_agent_loop()
+                # Start the named agent's loop, or the default agent's
+                await self.state.start_agent_loop(await _requested_agent(request))
                 
                 # Log successful start
                 logger.info("Agent loop started successfully")
@@ -342,8 +425,8 @@ TOGETHER_KEY={form_data.ai.get("togetherKey", "")}""".strip()
                 # Log the incoming request
                 logger.info("Incoming request to /agent/stop")
                 
-                # Stop the agent loop
-                await self.state.stop_agent_loop()
+                # Stop the named agent's loop, or the default agent's
+                await self.state.stop_agent_loop(await _requested_agent(request))
                 
                 # Log successful stop
                 logger.info("Agent loop stopped successfully")
@@ -369,6 +452,7 @@ TOGETHER_KEY={form_data.ai.get("togetherKey", "")}""".strip()
                     raise HTTPException(status_code=404, detail=f"Connection {name} not found")
                 
                 success = connection.configure(**config.params)
+                connection.invalidate_configuration_status()
                 if success:
                     return {"status": "success", "message": f"Connection {name} configured successfully"}
                 else:
@@ -397,7 +481,7 @@ TOGETHER_KEY={form_data.ai.get("togetherKey", "")}""".strip()
 
                 # For GOAT connection, ensure it's configured before listing actions
                 if name == 'goat':
-                    if not connection.is_configured(verbose=True):
+                    if not connection.is_configured_cached(verbose=True):
                         logger.error("GOAT connection not configured")
                         raise HTTPException(
                             status_code=400, 
@@ -455,7 +539,7 @@ TOGETHER_KEY={form_data.ai.get("togetherKey", "")}""".strip()
 
                 # For GOAT connection, ensure it's configured before listing actions
                 if connection_name == 'goat':
-                    if not connection.is_configured(verbose=True):
+                    if not connection.is_configured_cached(verbose=True):
                         logger.error("GOAT connection not configured")
                         return {
                             "message": "error",
@@ -491,7 +575,7 @@ TOGETHER_KEY={form_data.ai.get("togetherKey", "")}""".strip()
                     
                 return {
                     "name": name,
-                    "configured": connection.is_configured(verbose=True),
+                    "configured": connection.is_configured_cached(verbose=True),
                     "is_llm_provider": connection.is_llm_provider
                 }
                 
@@ -505,19 +589,25 @@ TOGETHER_KEY={form_data.ai.get("togetherKey", "")}""".strip()
                 # Format the form data into .env file content
                 env_content = self.format_env_data(form_data)
 
-                # Define the path to the .env file
-                env_path = Path(".env")
+                # Write to the same .env the credential store reads
+                env_path = credential_store.env_path
 
                 # Write the content to the .env file
                 with env_path.open("w") as env_file:
                     env_file.write(env_content)
 
+                # Credentials changed, so the store and cached configuration status are stale
+                credential_store.reload()
+                self.state.agents.invalidate_configuration_status()
+                if self.state.cli.agent:
+                    self.state.cli.agent.connection_manager.invalidate_configuration_status()
+
                 return {"status": "success", "message": ".env file saved successfully"}
             except Exception as e:
                 logger.error(f"Failed to save .env file: {str(e)}")
                 raise HTTPException(status_code=500, detail=str(e))
                 
 
-def create_app():
-    server = ZerePyServer()
+def create_app(supervisor: Optional["AgentSupervisor"] = None):
+    server = ZerePyServer(supervisor=supervisor)
     return server.app
\ No newline at end of file
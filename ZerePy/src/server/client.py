@@ -1,4 +1,5 @@
 import requests
+from src.helpers.http import http_session
 from typing import Optional, List, Dict, Any
 
 class ZerePyClient:
@@ -9,7 +10,7 @@ class ZerePyClient:
         """Make HTTP request with error handling"""
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         try:
-            response = requests.request(method, url, **kwargs)
+            response = http_session().request(method, url, **kwargs)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
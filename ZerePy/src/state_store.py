@@ -0,0 +1,491 @@
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.helpers.dedup import RotatingBloomFilter
+
+logger = logging.getLogger("state_store")
+
+DEFAULT_STATE_DIR = Path.home() / ".zerepy" / "state"
+DEFAULT_HOT_SIZE = 1024  # values (or dedup members per set) kept in memory
+DEFAULT_DEDUP_TTL = 7 * 24 * 3600  # seconds a dedup member is remembered
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds between batched writes
+DEFAULT_BATCH_SIZE = 200  # pending writes that trigger an early flush
+PURGE_INTERVAL = 300  # seconds between sweeps of expired dedup members
+
+_MISSING = object()
+
+
+class StateBackend(ABC):
+    """Storage interface behind AgentState; values are JSON-serializable"""
+
+    @abstractmethod
+    def load(self, key: str) -> Any:
+        """Return the stored value or _MISSING"""
+        pass
+
+    @abstractmethod
+    def save(self, key: str, value: Any) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def keys(self) -> List[str]:
+        pass
+
+    @abstractmethod
+    def dedup_add(self, set_name: str, member: str, expires_at: float) -> None:
+        pass
+
+    @abstractmethod
+    def dedup_expiry(self, set_name: str, member: str) -> Optional[float]:
+        """Expiry timestamp of a member, or None if it was never added"""
+        pass
+
+    @abstractmethod
+    def dedup_len(self, set_name: str) -> int:
+        pass
+
+    @abstractmethod
+    def dedup_members(self, set_name: str) -> Iterator[str]:
+        """Members that have not expired yet"""
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryStateBackend(StateBackend):
+    """Non-persistent backend; expired dedup members are swept periodically"""
+
+    def __init__(self):
+        self._values: Dict[str, Any] = {}
+        self._dedup: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._last_purge = time.time()
+
+    def load(self, key: str) -> Any:
+        return self._values.get(key, _MISSING)
+
+    def save(self, key: str, value: Any) -> None:
+        self._values[key] = value
+
+    def delete(self, key: str) -> None:
+        self._values.pop(key, None)
+
+    def keys(self) -> List[str]:
+        return list(self._values)
+
+    def dedup_add(self, set_name: str, member: str, expires_at: float) -> None:
+        with self._lock:
+            self._dedup.setdefault(set_name, {})[member] = expires_at
+            now = time.time()
+            if now - self._last_purge >= PURGE_INTERVAL:
+                for members in self._dedup.values():
+                    for expired in [m for m, exp in members.items() if exp <= now]:
+                        del members[expired]
+                self._last_purge = now
+
+    def dedup_expiry(self, set_name: str, member: str) -> Optional[float]:
+        return self._dedup.get(set_name, {}).get(member)
+
+    def dedup_len(self, set_name: str) -> int:
+        return len(self._dedup.get(set_name, {}))
+
+    def dedup_members(self, set_name: str) -> Iterator[str]:
+        now = time.time()
+        return iter([member for member, exp in self._dedup.get(set_name, {}).items() if exp > now])
+
+
+class SQLiteStateBackend(StateBackend):
+    """
+    Embedded SQLite backend in WAL mode.
+
+    Writes are coalesced in memory and committed by a background thread in one
+    transaction per batch, so callers never wait on disk. Reads see pending writes
+    first. Expired dedup members are deleted periodically, keeping the file bounded.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, updated REAL NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS dedup ("
+            "set_name TEXT NOT NULL, member TEXT NOT NULL, expires REAL NOT NULL, "
+            "PRIMARY KEY (set_name, member)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS dedup_expires ON dedup (expires)")
+        self._db_lock = threading.Lock()
+
+        # Coalesced pending writes: ("kv", key) -> json or None (delete); ("dedup", set, member) -> expiry
+        self._pending: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._pending_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = threading.Event()
+        self._last_purge = 0.0
+        self._writer = threading.Thread(target=self._writer_loop, name=f"state-writer:{self.path.stem}", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _queue(self, op: Tuple, value: Any) -> None:
+        with self._pending_lock:
+            self._pending[op] = value
+            self._pending.move_to_end(op)
+            if len(self._pending) >= self.batch_size:
+                self._wakeup.set()
+
+    def _pending_value(self, op: Tuple) -> Any:
+        with self._pending_lock:
+            return self._pending.get(op, _MISSING)
+
+    def load(self, key: str) -> Any:
+        pending = self._pending_value(("kv", key))
+        if pending is not _MISSING:
+            return _MISSING if pending is None else json.loads(pending)
+        with self._db_lock:
+            row = self._conn.execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else _MISSING
+
+    def save(self, key: str, value: Any) -> None:
+        self._queue(("kv", key), json.dumps(value))
+
+    def delete(self, key: str) -> None:
+        self._queue(("kv", key), None)
+
+    def keys(self) -> List[str]:
+        with self._db_lock:
+            stored = {row[0] for row in self._conn.execute("SELECT key FROM kv")}
+        with self._pending_lock:
+            for op, value in self._pending.items():
+                if op[0] == "kv":
+                    if value is None:
+                        stored.discard(op[1])
+                    else:
+                        stored.add(op[1])
+        return sorted(stored)
+
+    def dedup_add(self, set_name: str, member: str, expires_at: float) -> None:
+        self._queue(("dedup", set_name, member), expires_at)
+
+    def dedup_expiry(self, set_name: str, member: str) -> Optional[float]:
+        pending = self._pending_value(("dedup", set_name, member))
+        if pending is not _MISSING:
+            return pending
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT expires FROM dedup WHERE set_name = ? AND member = ?", (set_name, member)
+            ).fetchone()
+        return row[0] if row else None
+
+    def dedup_len(self, set_name: str) -> int:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM dedup WHERE set_name = ? AND expires > ?", (set_name, time.time())
+            ).fetchone()
+        return row[0]
+
+    def dedup_members(self, set_name: str) -> Iterator[str]:
+        now = time.time()
+        with self._db_lock:
+            members = [
+                row[0] for row in self._conn.execute(
+                    "SELECT member FROM dedup WHERE set_name = ? AND expires > ?", (set_name, now)
+                )
+            ]
+        with self._pending_lock:
+            members.extend(op[2] for op, exp in self._pending.items() if op[0] == "dedup" and op[1] == set_name and exp > now)
+        return iter(members)
+
+    def _writer_loop(self) -> None:
+        while not self._closed.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Failed to write state to {self.path}: {e}")
+
+    def flush(self) -> None:
+        """Commit all pending writes (and sweep expired dedup members when due)"""
+        with self._pending_lock:
+            batch, self._pending = self._pending, OrderedDict()
+
+        now = time.time()
+        purge = now - self._last_purge >= PURGE_INTERVAL
+        if not batch and not purge:
+            return
+
+        upserts = [(op[1], value, now) for op, value in batch.items() if op[0] == "kv" and value is not None]
+        deletes = [(op[1],) for op, value in batch.items() if op[0] == "kv" and value is None]
+        members = [(op[1], op[2], value) for op, value in batch.items() if op[0] == "dedup"]
+
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                if upserts:
+                    self._conn.executemany(
+                        "INSERT INTO kv (key, value, updated) VALUES (?, ?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated = excluded.updated",
+                        upserts
+                    )
+                if deletes:
+                    self._conn.executemany("DELETE FROM kv WHERE key = ?", deletes)
+                if members:
+                    self._conn.executemany(
+                        "INSERT INTO dedup (set_name, member, expires) VALUES (?, ?, ?) "
+                        "ON CONFLICT(set_name, member) DO UPDATE SET expires = excluded.expires",
+                        members
+                    )
+                if purge:
+                    self._conn.execute("DELETE FROM dedup WHERE expires <= ?", (now,))
+                    self._last_purge = now
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                # Put the batch back so the next flush retries it
+                with self._pending_lock:
+                    for op, value in batch.items():
+                        self._pending.setdefault(op, value)
+                raise
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._wakeup.set()
+        self._writer.join(timeout=5)
+        try:
+            self.flush()
+        finally:
+            with self._db_lock:
+                self._conn.close()
+
+
+class TTLSet:
+    """
+    Persistent set of recently seen members that expire after `ttl` seconds.
+
+    The most recent `hot_size` members are answered exactly from memory. A
+    rotating Bloom filter covering the TTL window (warmed from the backend on
+    creation) answers "never seen" without touching the backend; only possible
+    hits fall through to the exact backend lookup. Supports the `add` / `in`
+    subset of the set API.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backend: StateBackend,
+        ttl: float = DEFAULT_DEDUP_TTL,
+        hot_size: int = DEFAULT_HOT_SIZE,
+        filter_options: Optional[Dict[str, Any]] = None
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.hot_size = hot_size
+        self._backend = backend
+        self._hot: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._filter = RotatingBloomFilter(window=ttl, **(filter_options or {}))
+        for member in backend.dedup_members(name):
+            self._filter.add(member)
+        self.backend_lookups = 0
+        self.filter_skips = 0
+
+    def add(self, member: Any) -> None:
+        key = str(member)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at)
+            self._filter.add(key)
+        self._backend.dedup_add(self.name, key, expires_at)
+
+    def _remember(self, key: str, expires_at: float) -> None:
+        self._hot[key] = expires_at
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_size:
+            self._hot.popitem(last=False)
+
+    def __contains__(self, member: Any) -> bool:
+        key = str(member)
+        now = time.time()
+        with self._lock:
+            expires_at = self._hot.get(key)
+            if expires_at is None and self._filter.lossless and key not in self._filter:
+                self.filter_skips += 1
+                return False
+        if expires_at is None:
+            self.backend_lookups += 1
+            expires_at = self._backend.dedup_expiry(self.name, key)
+            if expires_at is not None and expires_at > now:
+                with self._lock:
+                    self._remember(key, expires_at)
+        return expires_at is not None and expires_at > now
+
+    def __len__(self) -> int:
+        return self._backend.dedup_len(self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hot": len(self._hot),
+            "backend_lookups": self.backend_lookups,
+            "filter_skips": self.filter_skips,
+            "filter_bytes": self._filter.memory_bytes,
+            "estimated_error_rate": self._filter.estimated_error_rate(),
+        }
+
+
+class AgentState(MutableMapping):
+    """
+    Dict-like agent state backed by a StateBackend.
+
+    JSON-serializable values are written through to the backend (batched) and kept
+    in a bounded LRU hot tier; anything else (buffers, dedup sets) stays pinned in
+    memory only. Mutating a stored list/dict in place is not persisted - assign it
+    again to save it.
+    """
+
+    def __init__(
+        self,
+        backend: StateBackend,
+        hot_size: int = DEFAULT_HOT_SIZE,
+        dedup_ttl: float = DEFAULT_DEDUP_TTL,
+        dedup_filter: Optional[Dict[str, Any]] = None
+    ):
+        self.backend = backend
+        self.hot_size = hot_size
+        self.dedup_ttl = dedup_ttl
+        # RotatingBloomFilter options for dedup sets: capacity, error_rate, generations, max_bytes
+        self.dedup_filter = dedup_filter or {}
+        self._hot: "OrderedDict[str, Any]" = OrderedDict()
+        self._pinned: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            if key in self._pinned:
+                return self._pinned[key]
+            if key in self._hot:
+                self._hot.move_to_end(key)
+                return self._hot[key]
+        value = self.backend.load(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        with self._lock:
+            self._cache(key, value)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        try:
+            json.dumps(value)
+            persistable = True
+        except (TypeError, ValueError):
+            persistable = False
+
+        with self._lock:
+            if persistable:
+                self._pinned.pop(key, None)
+                self._cache(key, value)
+            else:
+                self._hot.pop(key, None)
+                self._pinned[key] = value
+        if persistable:
+            self.backend.save(key, value)
+        else:
+            self.backend.delete(key)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            found = self._pinned.pop(key, _MISSING) is not _MISSING
+            found = self._hot.pop(key, _MISSING) is not _MISSING or found
+        if not found and self.backend.load(key) is _MISSING:
+            raise KeyError(key)
+        self.backend.delete(key)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            keys = list(self._pinned) + list(self._hot)
+        seen = set(keys)
+        keys.extend(key for key in self.backend.keys() if key not in seen)
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def _cache(self, key: str, value: Any) -> None:
+        self._hot[key] = value
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_size:
+            self._hot.popitem(last=False)
+
+    def dedup_set(self, name: str, ttl: Optional[float] = None) -> TTLSet:
+        """Get (creating on first use) a persistent TTL dedup set stored under `name`"""
+        with self._lock:
+            existing = self._pinned.get(name)
+            if isinstance(existing, TTLSet):
+                return existing
+            dedup = TTLSet(name, self.backend, ttl or self.dedup_ttl, self.hot_size, self.dedup_filter)
+            self._pinned[name] = dedup
+            return dedup
+
+    def flush(self) -> None:
+        self.backend.flush()
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+def create_agent_state(agent_name: str, config: Optional[Dict[str, Any]] = None) -> AgentState:
+    """
+    Build an agent's state store from the "state" section of its JSON
+
+    Args:
+        agent_name: Agent file name, used for the default database path
+        config: {"backend": "sqlite" | "memory", "path", "hot_size", "dedup_ttl", "dedup_filter",
+                 "flush_interval", "batch_size"}
+    """
+    config = config or {}
+    backend_name = config.get("backend", "sqlite")
+    if backend_name == "memory":
+        backend: StateBackend = MemoryStateBackend()
+    elif backend_name == "sqlite":
+        backend = SQLiteStateBackend(
+            config.get("path", DEFAULT_STATE_DIR / f"{agent_name}.db"),
+            flush_interval=config.get("flush_interval", DEFAULT_FLUSH_INTERVAL),
+            batch_size=config.get("batch_size", DEFAULT_BATCH_SIZE)
+        )
+    else:
+        raise ValueError(f"Unknown state backend '{backend_name}'")
+
+    return AgentState(
+        backend,
+        hot_size=config.get("hot_size", DEFAULT_HOT_SIZE),
+        dedup_ttl=config.get("dedup_ttl", DEFAULT_DEDUP_TTL),
+        dedup_filter=config.get("dedup_filter")
+    )
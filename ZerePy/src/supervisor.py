@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("supervisor")
+
+DEFAULT_STATUS_INTERVAL = 10  # seconds between worker status reports
+INITIAL_BACKOFF = 1
+MAX_BACKOFF = 60
+STABLE_UPTIME = 60  # a worker that lived this long gets its backoff reset
+STOP_TIMEOUT = 10
+
+
+def discover_agents(agents_dir: str = "agents") -> List[str]:
+    """Names of all agent files in the agents directory (general.json excluded)"""
+    return sorted(path.stem for path in Path(agents_dir).glob("*.json") if path.stem != "general")
+
+
+def shard_agents(agent_names: List[str], workers: int) -> List[List[str]]:
+    """Deal agents round-robin (in name order) so shard sizes differ by at most one"""
+    shards: List[List[str]] = [[] for _ in range(workers)]
+    for index, name in enumerate(sorted(agent_names)):
+        shards[index % workers].append(name)
+    return shards
+
+
+def _worker_main(worker_id: int, agent_names: List[str], status_queue, status_interval: float) -> None:
+    """Entry point of a worker process: run every agent of the shard on one event loop"""
+    logging.basicConfig(level=logging.INFO, format=f"[worker {worker_id}] %(name)s: %(message)s")
+    loaded = asyncio.run(_serve_shard(worker_id, agent_names, status_queue, status_interval))
+    # Nothing could be loaded: exit non-zero so the supervisor backs off before retrying
+    raise SystemExit(0 if loaded else 1)
+
+
+async def _serve_shard(worker_id: int, agent_names: List[str], status_queue, status_interval: float) -> bool:
+    # Imported here so the parent process never pays for connection SDKs
+    from src.agent import ZerePyAgent
+    from src.runtime import AgentRuntime
+
+    runtimes: Dict[str, AgentRuntime] = {}
+    errors: Dict[str, str] = {}
+    for name in agent_names:
+        try:
+            agent = await asyncio.to_thread(ZerePyAgent, name)
+            runtimes[name] = AgentRuntime(agent)
+        except Exception as e:
+            logger.error(f"Failed to load agent {name}: {e}")
+            errors[name] = str(e)
+
+    def publish(tasks: Dict[str, asyncio.Task]) -> None:
+        status = {
+            "worker": worker_id,
+            "pid": os.getpid(),
+            "time": time.time(),
+            "agents": {
+                name: {"running": not tasks[name].done(), "tasks": runtime.stats}
+                for name, runtime in runtimes.items()
+            },
+            "errors": errors,
+        }
+        try:
+            status_queue.put_nowait(status)
+        except Exception:
+            pass
+
+    tasks = {name: asyncio.create_task(runtime.run(), name=f"agent:{name}") for name, runtime in runtimes.items()}
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, lambda: [runtime.stop() for runtime in runtimes.values()])
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    pending = set(tasks.values())
+    publish(tasks)
+    while pending:
+        done, pending = await asyncio.wait(pending, timeout=status_interval)
+        for task in done:
+            if not task.cancelled() and task.exception():
+                logger.error(f"{task.get_name()} crashed: {task.exception()}")
+        publish(tasks)
+    return bool(runtimes)
+
+
+class WorkerHandle:
+    """Bookkeeping for one worker process and its shard"""
+
+    def __init__(self, worker_id: int, agent_names: List[str]):
+        self.worker_id = worker_id
+        self.agent_names = agent_names
+        self.process: Optional[multiprocessing.Process] = None
+        self.started_at: Optional[float] = None
+        self.restarts = 0
+        self.backoff = INITIAL_BACKOFF
+        self.next_start: Optional[float] = None
+        self.last_exit_code: Optional[int] = None
+        self.last_status: Dict[str, Any] = {}
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "worker": self.worker_id,
+            "pid": self.process.pid if self.process else None,
+            "alive": self.alive,
+            "agents": self.agent_names,
+            "restarts": self.restarts,
+            "uptime": time.time() - self.started_at if self.alive and self.started_at else 0,
+            "last_exit_code": self.last_exit_code,
+            "next_restart": self.next_start if not self.alive else None,
+            "last_report": self.last_status.get("time"),
+        }
+
+
+class AgentSupervisor:
+    """
+    Runs agents sharded across worker processes.
+
+    Each worker hosts its shard of agents on one asyncio event loop, so throughput
+    scales with cores and a crash only takes down one shard. Dead workers are
+    restarted with exponential backoff (reset once a worker has been up for
+    STABLE_UPTIME). Workers report their agents' runtime stats over a queue, which
+    status() and stats() aggregate.
+    """
+
+    def __init__(
+        self,
+        agent_names: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+        status_interval: float = DEFAULT_STATUS_INTERVAL
+    ):
+        agent_names = agent_names if agent_names is not None else discover_agents()
+        if not agent_names:
+            raise ValueError("No agents to supervise")
+
+        workers = max(1, min(workers or os.cpu_count() or 1, len(agent_names)))
+        self.status_interval = status_interval
+        self._context = multiprocessing.get_context("spawn")
+        self._status_queue = self._context.Queue()
+        shards = [shard for shard in shard_agents(agent_names, workers) if shard]
+        self._handles = [WorkerHandle(worker_id, shard) for worker_id, shard in enumerate(shards)]
+        self._stopping = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Spawn every worker and start monitoring them"""
+        for handle in self._handles:
+            self._spawn(handle)
+        self._monitor = threading.Thread(target=self._monitor_loop, name="supervisor-monitor", daemon=True)
+        self._monitor.start()
+        logger.info(f"Supervising {sum(len(h.agent_names) for h in self._handles)} agents on {len(self._handles)} workers")
+
+    def _spawn(self, handle: WorkerHandle) -> None:
+        handle.process = self._context.Process(
+            target=_worker_main,
+            args=(handle.worker_id, handle.agent_names, self._status_queue, self.status_interval),
+            name=f"zerepy-worker-{handle.worker_id}",
+        )
+        handle.process.start()
+        handle.started_at = time.time()
+        handle.next_start = None
+
+    def _monitor_loop(self) -> None:
+        while not self._stopping.is_set():
+            self._drain_status()
+            now = time.time()
+            with self._lock:
+                for handle in self._handles:
+                    if self._stopping.is_set():
+                        break
+                    if handle.alive:
+                        continue
+                    if handle.next_start is None:
+                        handle.last_exit_code = handle.process.exitcode if handle.process else None
+                        if handle.started_at and now - handle.started_at >= STABLE_UPTIME:
+                            handle.backoff = INITIAL_BACKOFF
+                        handle.next_start = now + handle.backoff
+                        logger.warning(
+                            f"Worker {handle.worker_id} exited with code {handle.last_exit_code}; "
+                            f"restarting in {handle.backoff}s"
+                        )
+                        handle.backoff = min(handle.backoff * 2, MAX_BACKOFF)
+                    elif now >= handle.next_start:
+                        handle.restarts += 1
+                        self._spawn(handle)
+            self._stopping.wait(0.5)
+
+    def _drain_status(self) -> None:
+        while True:
+            try:
+                status = self._status_queue.get_nowait()
+            except queue.Empty:
+                return
+            except Exception:
+                return
+            worker_id = status.get("worker")
+            if worker_id is not None and 0 <= worker_id < len(self._handles):
+                self._handles[worker_id].last_status = status
+
+    def stop(self, timeout: float = STOP_TIMEOUT) -> None:
+        """Ask workers to stop, killing any that don't exit in time"""
+        self._stopping.set()
+        if self._monitor:
+            self._monitor.join(timeout=2)
+        with self._lock:
+            for handle in self._handles:
+                if handle.alive:
+                    handle.process.terminate()
+            deadline = time.time() + timeout
+            for handle in self._handles:
+                if handle.process:
+                    handle.process.join(timeout=max(0.0, deadline - time.time()))
+                    if handle.process.is_alive():
+                        handle.process.kill()
+                        handle.process.join()
+        logger.info("Supervisor stopped")
+
+    def run_forever(self) -> None:
+        """Start the workers and block until interrupted"""
+        self.start()
+        try:
+            while not self._stopping.wait(1):
+                pass
+        except KeyboardInterrupt:
+            logger.info("\n🛑 Stopping supervisor...")
+        finally:
+            self.stop()
+
+    def status(self) -> Dict[str, Any]:
+        """Per-worker process status plus the latest report for every agent"""
+        self._drain_status()
+        agents: Dict[str, Any] = {}
+        for handle in self._handles:
+            reported = handle.last_status.get("agents", {})
+            errors = handle.last_status.get("errors", {})
+            for name in handle.agent_names:
+                agents[name] = {
+                    "worker": handle.worker_id,
+                    "running": handle.alive and reported.get(name, {}).get("running", False),
+                    "tasks": reported.get(name, {}).get("tasks", {}),
+                    "error": errors.get(name),
+                }
+        return {"workers": [handle.status() for handle in self._handles], "agents": agents}
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals across all workers"""
+        status = self.status()
+        runs = failures = 0
+        for agent in status["agents"].values():
+            for task in agent["tasks"].values():
+                runs += task.get("runs", 0)
+                failures += task.get("failures", 0)
+        return {
+            "workers": len(self._handles),
+            "workers_alive": sum(1 for worker in status["workers"] if worker["alive"]),
+            "restarts": sum(worker["restarts"] for worker in status["workers"]),
+            "agents": len(status["agents"]),
+            "agents_running": sum(1 for agent in status["agents"].values() if agent["running"]),
+            "agents_failed": sum(1 for agent in status["agents"].values() if agent["error"]),
+            "task_runs": runs,
+            "task_failures": failures,
+        }